@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import pygame
+
+# Add the directory containing assets.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assets import AssetManager, get_asset_manager, PLACE_SOUND, SOUND_EFFECTS
+from grid import Grid
+
+
+class TestAssetManager(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.assets = AssetManager()
+
+    def test_sound_decoded_once(self):
+        with patch('pygame.mixer.Sound', wraps=pygame.mixer.Sound) as mock_sound:
+            first = self.assets.sound(PLACE_SOUND)
+            second = self.assets.sound(PLACE_SOUND)
+        self.assertIs(first, second)
+        mock_sound.assert_called_once()
+        self.assertIn(PLACE_SOUND, self.assets.load_times)
+        self.assertTrue(self.assets.report()[0].startswith(PLACE_SOUND))
+
+    def test_missing_file_is_silent(self):
+        self.assertIsNone(self.assets.sound('does_not_exist.mp3'))
+        self.assets.sound_asset('does_not_exist.mp3').play()  # Must not raise
+        self.assertFalse(self.assets.play_music('does_not_exist.mp3'))
+
+    def test_missing_audio_device_is_silent(self):
+        with patch('pygame.mixer.get_init', return_value=None), \
+                patch('pygame.mixer.init', side_effect=pygame.error('No available audio device')):
+            self.assertIsNone(self.assets.sound(PLACE_SOUND))
+            self.assertFalse(self.assets.play_music(PLACE_SOUND))
+        self.assertFalse(self.assets.audio_available)
+
+    def test_background_preload(self):
+        thread = self.assets.preload(SOUND_EFFECTS)
+        self.assets.wait()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(set(self.assets.load_times), set(SOUND_EFFECTS))
+
+    def test_grids_share_the_process_manager(self):
+        first = Grid()
+        second = Grid()
+        self.assertIs(first.tetromino_place_sound.manager, get_asset_manager())
+        self.assertIs(second.row_clear_sound.manager, get_asset_manager())
+
+
+if __name__ == "__main__":
+    unittest.main()
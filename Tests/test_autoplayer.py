@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the directory containing autoplayer.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autoplayer import AutoPlayer, SearchBoard, TranspositionTable, DISTINCT_ROTATIONS, DEFAULT_WEIGHTS, DEFAULT_TABLE_SIZE
+from engine import TetrisEngine, LEFT, RIGHT, ROTATE, HARD_DROP
+from grid import GRID_BACKENDS, create_grid
+
+
+def board_features(board):
+    """(heights, holes) of a SearchBoard, counted cell by cell."""
+    heights = [0] * board.width
+    holes = 0
+    for x in range(board.width):
+        column = [(row >> x) & 1 for row in board.rows]
+        if 1 in column:
+            top = column.index(1)
+            heights[x] = board.height - top
+            holes += column[top:].count(0)
+    return heights, holes
+
+
+class TestAutoPlayer(unittest.TestCase):
+    def test_distinct_rotations(self):
+        self.assertEqual(DISTINCT_ROTATIONS['O'], (0,))
+        self.assertEqual(DISTINCT_ROTATIONS['I'], (0, 1))
+        self.assertEqual(DISTINCT_ROTATIONS['T'], (0, 1, 2, 3))
+
+    def test_board_from_every_backend(self):
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                grid = create_grid(4, 4, backend=backend, load_sounds=False)
+                grid.grid = [[0, 0, 0, 0], [0, 0, 0, 0], [1, 0, 0, 0], [1, 1, 0, 1]]
+                board = SearchBoard.from_grid(grid)
+                self.assertEqual(board.rows, [0, 0, 0b0001, 0b1011])
+                self.assertEqual(board.heights, [2, 1, 0, 1])
+                self.assertEqual(board.filled, 4)
+
+    def test_scores_match_board_features(self):
+        player = AutoPlayer()
+        engine = TetrisEngine(8, 12, seed=3)
+        rng = random.Random(3)
+        while engine.pieces_placed < 40 and not engine.game_over:
+            board = SearchBoard.from_grid(engine.grid)
+            shape = engine.current_tetromino.shape
+            for placement in player.placements(board, shape):
+                after = board.place(shape, placement.rotation, placement.column, placement.landing)
+                heights, holes = board_features(after)
+                bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+                expected = (DEFAULT_WEIGHTS.lines * placement.cleared + DEFAULT_WEIGHTS.height * sum(heights)
+                            + DEFAULT_WEIGHTS.holes * holes + DEFAULT_WEIGHTS.bumpiness * bumpiness)
+                self.assertEqual(after.heights, heights)
+                self.assertAlmostEqual(placement.score, expected)
+            for _ in range(rng.randrange(3)):
+                engine.apply(ROTATE)
+            engine.apply(rng.choice((LEFT, RIGHT)))
+            engine.apply(HARD_DROP)  # Random placements leave holes for the next boards
+
+    def test_board_hash_matches_grid(self):
+        player = AutoPlayer(lookahead=False)
+        engine = TetrisEngine(6, 12, seed=2, policy='bag')
+        while engine.pieces_placed < 150 and not engine.game_over:
+            board = SearchBoard.from_grid(engine.grid)
+            shape = engine.current_tetromino.shape
+            placement = player.best_placement(board, shape)
+            after = board.place(shape, placement.rotation, placement.column, placement.landing)
+            player.play_piece(engine)
+            self.assertEqual(after.hash, after.rows_hash())
+            self.assertEqual(after.hash, engine.grid.board_hash)
+        self.assertGreater(engine.lines_cleared, 0)
+
+    def test_transposition_table_is_lru(self):
+        table = TranspositionTable(2)
+        table.put('a', (1,))
+        table.put('b', (2,))
+        self.assertEqual(table.get('a'), (1,))
+        table.put('c', (3,))  # Evicts b, the least recently used
+        self.assertIsNone(table.get('b'))
+        self.assertEqual(table.get('c'), (3,))
+        self.assertEqual((table.hits, table.misses), (2, 1))
+        self.assertAlmostEqual(table.hit_rate(), 2 / 3)
+        table.clear()
+        self.assertEqual((len(table.entries), table.hits, table.misses), (0, 0, 0))
+
+    def test_table_saves_evaluations_without_changing_play(self):
+        results = []
+        for table_size in (None, DEFAULT_TABLE_SIZE):
+            player = AutoPlayer() if table_size is None else AutoPlayer(table_size=table_size)
+            engine = TetrisEngine(seed=4, policy='bag')
+            player.play_game(engine, max_pieces=60)
+            results.append((engine.score, engine.grid.snapshot(), player.evaluations, player.table))
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertIsNone(results[0][3])  # Off by default
+        self.assertGreater(results[1][3].hits, 0)
+        self.assertLess(results[1][2], results[0][2])
+
+    def test_prefers_clearing_a_line(self):
+        grid = create_grid(5, 4, load_sounds=False)
+        grid.grid = [[0] * 5, [0] * 5, [0] * 5, [1, 1, 1, 1, 0]]
+        placement = AutoPlayer().best_placement(SearchBoard.from_grid(grid), 'I')
+        self.assertEqual((placement.rotation, placement.column, placement.cleared), (1, 4, 1))
+
+    def test_plan_reaches_the_chosen_placement(self):
+        player = AutoPlayer(lookahead=False)
+        engine = TetrisEngine(seed=5, policy='bag')
+        for _ in range(60):
+            board = SearchBoard.from_grid(engine.grid)
+            shape = engine.current_tetromino.shape
+            placement = player.best_placement(board, shape)
+            expected = board.place(shape, placement.rotation, placement.column, placement.landing)
+            player.play_piece(engine)
+            self.assertEqual(SearchBoard.from_grid(engine.grid).rows, expected.rows)
+            self.assertEqual(engine.grid.heights, expected.heights)
+
+    def test_non_table_pieces_are_hard_dropped(self):
+        class Block:
+            def get_shape(self):
+                return [[1]]
+        self.assertEqual(AutoPlayer().plan(create_grid(4, 4, load_sounds=False), Block(), [0, 1]), [HARD_DROP])
+
+    def test_games_are_deterministic_and_clear_lines(self):
+        results = []
+        for _ in range(2):
+            engine = TetrisEngine(seed=11, policy='bag')
+            AutoPlayer().play_game(engine, max_pieces=200)
+            results.append((engine.score, engine.pieces_placed, engine.grid.snapshot()))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][1], 200)  # Still alive
+        self.assertGreater(results[0][0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
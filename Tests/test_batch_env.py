@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import contextlib
+import io
+import numpy as np
+
+# Add the directory containing batch_env.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_env import BatchTetrisEnv, SHAPES
+from grid import Grid
+from tetromino import Tetromino
+
+
+def reference_step(grid, shape, rotation, column):
+    """Drop a tetromino from above the board with Grid and lock it; return (fits, rows cleared)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tetromino = Tetromino(shape, rotation)
+    state = tetromino.get_rotation_state()
+    column = min(max(column, 0), grid.width - state.width)
+    row = -state.height
+    while grid.is_valid_position(tetromino, [row + 1, column]):
+        row += 1
+    if row < 0:
+        return False, 0
+    return True, grid.place_tetromino(tetromino, [row, column], False)
+
+
+class TestBatchTetrisEnv(unittest.TestCase):
+    def test_boards_are_one_contiguous_array(self):
+        env = BatchTetrisEnv(8, seed=0)
+        boards, pieces, scores, done = env.observe()
+        self.assertEqual(boards.shape, (8, 20, 10))
+        self.assertTrue(boards.flags['C_CONTIGUOUS'])
+        returned, _, _ = env.step(np.zeros((8, 2), dtype=np.int64))
+        self.assertIs(returned, env.boards)
+        self.assertTrue(np.shares_memory(boards, env.boards))
+
+    def test_single_placement(self):
+        env = BatchTetrisEnv(1, seed=0)
+        env.pieces[0] = SHAPES.index('O')
+        env.step([[0, 0]])
+        self.assertEqual(env.boards[0, 18:, :2].tolist(), [[2, 2], [2, 2]])
+        self.assertEqual(env.boards[0].astype(bool).sum(), 4)
+
+    def test_line_clear_scores_100_per_row(self):
+        env = BatchTetrisEnv(2, seed=0)
+        env.boards[:, 18:, 2:] = 1
+        env.pieces[:] = SHAPES.index('O')
+        _, rewards, done = env.step([[0, 0], [0, 5]])
+        self.assertEqual(rewards.tolist(), [200, 0])
+        self.assertEqual(env.scores.tolist(), [200, 0])
+        self.assertEqual(env.lines.tolist(), [2, 0])
+        self.assertFalse(env.boards[0].any())
+        self.assertFalse(done.any())
+
+    def test_partial_clear_keeps_rows_below(self):
+        env = BatchTetrisEnv(1, seed=0)
+        env.boards[0, 19, :] = 3
+        env.boards[0, 19, 0] = 0
+        env.boards[0, 18, 5] = 4
+        env.pieces[0] = SHAPES.index('I')
+        env.step([[1, 0]])  # Vertical I into the gap at column 0
+        self.assertEqual(env.lines[0], 1)
+        self.assertEqual(env.boards[0, 19, 5], 4)
+        self.assertEqual(env.boards[0, 19, 0], 1)
+        self.assertEqual(env.boards[0, 17:19, 0].tolist(), [1, 1])
+
+    def test_top_out_marks_done_and_ignores_actions(self):
+        env = BatchTetrisEnv(1, seed=0)
+        env.boards[0, 1:, :] = 5
+        env.boards[0, 1:, 9] = 0  # Keep rows from clearing
+        env.pieces[0] = SHAPES.index('O')
+        _, _, done = env.step([[0, 0]])
+        self.assertTrue(done[0])
+        snapshot = env.boards.copy()
+        env.step([[0, 0]])
+        self.assertTrue(np.array_equal(snapshot, env.boards))
+
+    def test_autoreset(self):
+        env = BatchTetrisEnv(1, seed=0, autoreset=True)
+        env.boards[0, 1:, :9] = 5
+        _, _, finished = env.step([[0, 0]])
+        self.assertTrue(finished[0])
+        self.assertFalse(env.done[0])
+        self.assertFalse(env.boards[0].any())
+
+    def test_matches_grid_rules(self):
+        rng = np.random.default_rng(4)
+        env = BatchTetrisEnv(16, width=6, height=12, seed=4)
+        grids = [Grid(6, 12, load_sounds=False) for _ in range(16)]
+        scores = [0] * 16
+        for _ in range(40):
+            actions = np.stack([rng.integers(0, 4, 16), rng.integers(-1, 7, 16)], axis=1)
+            pieces = env.pieces.copy()
+            live = ~env.done.copy()
+            env.step(actions)
+            for index, grid in enumerate(grids):
+                if not live[index]:
+                    continue
+                fits, cleared = reference_step(grid, SHAPES[pieces[index]], actions[index, 0], actions[index, 1])
+                scores[index] += cleared * 100
+                self.assertEqual((env.boards[index] != 0).astype(int).tolist(), grid.grid)
+                if not fits:
+                    self.assertTrue(env.done[index])
+        self.assertEqual(env.scores.tolist(), scores)
+
+    def test_seed_is_reproducible(self):
+        actions = np.tile([[1, 3]], (32, 1))
+        first, second = BatchTetrisEnv(32, seed=7), BatchTetrisEnv(32, seed=7)
+        for _ in range(20):
+            first.step(actions)
+            second.step(actions)
+        self.assertTrue(np.array_equal(first.boards, second.boards))
+
+
+if __name__ == "__main__":
+    unittest.main()
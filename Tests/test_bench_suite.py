@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+# Add the benchmarks directory (and the repository root it imports from) to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import bench_suite
+
+
+class TestBenchSuite(unittest.TestCase):
+    def test_compare_flags_only_slowdowns_over_threshold(self):
+        baseline = {'fast': 10.0, 'slow': 10.0, 'faster': 10.0}
+        results = {'fast': 12.0, 'slow': 13.0, 'faster': 5.0, 'new': 99.0}
+        self.assertEqual([name for name, *_ in bench_suite.compare(results, baseline, 0.25)], ['slow'])
+
+    def test_compare_ignores_small_absolute_slowdowns(self):
+        baseline = {'tiny': 4.0, 'large': 40.0}
+        results = {'tiny': 5.5, 'large': 55.0}  # Both 37.5% slower
+        self.assertEqual([name for name, *_ in bench_suite.compare(results, baseline, 0.25, 2.0)], ['large'])
+
+    def test_run_suite_keeps_the_best_round(self):
+        timings = iter([5.0, 3.0, 4.0])
+        self.assertEqual(bench_suite.run_suite({'case': lambda: next(timings)}, 3), {'case': 3.0})
+
+    def test_regression_fails_the_run(self):
+        cases = {'grid.draw[1x1@1px]': lambda: 50.0, 'panel.score_tables': lambda: 10.0}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            with open(path, 'w') as file:
+                json.dump({'metrics': {'grid.draw[1x1@1px]': 10.0, 'panel.score_tables': 10.0}}, file)
+            with patch.object(bench_suite, 'suite_cases', return_value=cases), patch('builtins.print'):
+                self.assertEqual(bench_suite.main(['--baseline', path, '--repeats', '1']), 1)
+                cases['grid.draw[1x1@1px]'] = lambda: 11.0
+                self.assertEqual(bench_suite.main(['--baseline', path, '--repeats', '1']), 0)
+                self.assertEqual(bench_suite.main(['--baseline', path, '--save']), 0)
+            with open(path) as file:
+                self.assertEqual(json.load(file)['metrics']['grid.draw[1x1@1px]'], 11.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
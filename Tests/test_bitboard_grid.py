@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grid import Grid, create_grid
+from bitboard_grid import BitboardGrid, shape_masks
+from tetromino import Tetromino
+
+
+class TetrominoMock:
+    def __init__(self, shape, color):
+        self.shape = shape
+        self.color = color
+
+    def get_shape(self):
+        return self.shape
+
+    def get_color(self):
+        return self.color
+
+
+class TestBitboardGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = BitboardGrid(load_sounds=False)
+
+    def test_create_grid_selects_backend(self):
+        self.assertIsInstance(create_grid(backend='bitboard', load_sounds=False), BitboardGrid)
+        self.assertIs(type(create_grid(load_sounds=False)), Grid)
+        with self.assertRaises(ValueError):
+            create_grid(backend='unknown', load_sounds=False)
+
+    def test_shape_masks(self):
+        row_masks, left, right = shape_masks([[0, 1, 0], [1, 1, 1]])
+        self.assertEqual(row_masks, ((0, 0b010), (1, 0b111)))
+        self.assertEqual((left, right), (0, 2))
+        row_masks, left, right = shape_masks([[0, 1], [0, 1]])
+        self.assertEqual((left, right), (1, 1))
+
+    def test_grid_view(self):
+        self.grid.grid = [[1 if x == y else 0 for x in range(10)] for y in range(20)]
+        self.assertEqual(self.grid.rows[3], 1 << 3)
+        self.assertEqual(self.grid.grid[3][3], 1)
+        self.assertEqual(self.grid.get_state()[3][4], 0)
+
+    def test_is_full(self):
+        self.assertFalse(self.grid.is_full())
+        self.grid.rows[0] = 1
+        self.assertTrue(self.grid.is_full())
+
+    def test_is_valid_position(self):
+        tetromino = TetrominoMock([[1, 1], [1, 1]], (255, 0, 0))
+        self.grid.rows[0] = 1
+        self.assertFalse(self.grid.is_valid_position(tetromino, (0, 0)))
+        self.assertTrue(self.grid.is_valid_position(tetromino, (1, 1)))
+        self.assertFalse(self.grid.is_valid_position(tetromino, (19, 9)))
+        self.assertTrue(self.grid.is_valid_position(tetromino, (-1, 2)))  # Above the top is allowed
+
+    def test_empty_leading_column_may_sit_left_of_board(self):
+        tetromino = TetrominoMock([[0, 1], [0, 1]], (255, 0, 0))
+        self.assertTrue(self.grid.is_valid_position(tetromino, (0, -1)))
+        self.grid.place_tetromino(tetromino, (0, -1), False)
+        self.assertEqual(self.grid.rows[0], 1)
+
+    def test_place_and_clear(self):
+        self.grid.rows[19] = 0b1111111100
+        self.grid.refresh_counters()  # Cells were written directly
+        tetromino = TetrominoMock([[1, 1]], (0, 255, 0))
+        self.assertEqual(self.grid.place_tetromino(tetromino, (19, 0), False), 1)
+        self.assertEqual(self.grid.rows[19], 0)
+        self.assertEqual(self.grid.color_grid[19][0], (0, 0, 0))
+
+    def test_place_out_of_bounds(self):
+        tetromino = TetrominoMock([[1, 1], [1, 1]], (255, 0, 0))
+        self.assertEqual(self.grid.place_tetromino(tetromino, (-1, -1), False), 0)
+        self.assertEqual(self.grid.rows, [0] * 20)
+
+    def test_matches_list_backend(self):
+        rng = random.Random(3)
+        reference = Grid(8, 30, load_sounds=False)
+        bitboard = BitboardGrid(8, 30, load_sounds=False)
+        shapes = list(Tetromino.shapes.items())
+        for _ in range(300):
+            name, shape = rng.choice(shapes)
+            for _ in range(rng.randrange(4)):
+                shape = [list(row) for row in zip(*shape[::-1])]
+            piece = TetrominoMock(shape, Tetromino.colors[name])
+            position = [rng.randrange(-2, 30), rng.randrange(-2, 9)]
+            valid = reference.is_valid_position(piece, position)
+            self.assertEqual(bitboard.is_valid_position(piece, position), valid)
+            if valid and position[0] >= 0:
+                self.assertEqual(bitboard.place_tetromino(piece, position, False),
+                                 reference.place_tetromino(piece, position, False))
+            self.assertEqual(bitboard.grid, reference.grid)
+            self.assertEqual(bitboard.color_grid, reference.color_grid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the directory containing engine.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import TetrisEngine, ACTIONS, LEFT, RIGHT, DOWN, HARD_DROP
+from grid import Grid
+from tetromino import Tetromino
+
+
+class FixedTetromino(Tetromino):
+    """Tetromino that always spawns as an 'O' piece."""
+    def random_shape(self):
+        return 'O'
+
+
+class TestTetrisEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = TetrisEngine(10, 20, tetromino_factory=FixedTetromino)
+
+    def test_headless_grid_has_no_sounds(self):
+        self.assertIsInstance(self.engine.grid, Grid)
+        self.assertIsNone(self.engine.grid.tetromino_place_sound)
+        self.assertFalse(self.engine.grid.sound_effects_enabled)
+
+    def test_spawn_position(self):
+        self.assertEqual(self.engine.tetromino_position, [0, 4])
+
+    def test_move_left_right(self):
+        self.assertTrue(self.engine.apply(LEFT))
+        self.assertEqual(self.engine.tetromino_position, [0, 3])
+        self.assertTrue(self.engine.apply(RIGHT))
+        self.assertEqual(self.engine.tetromino_position, [0, 4])
+
+    def test_move_blocked_by_wall(self):
+        for _ in range(4):
+            self.engine.apply(LEFT)
+        self.assertFalse(self.engine.apply(LEFT))
+        self.assertEqual(self.engine.tetromino_position, [0, 0])
+
+    def test_gravity_locks_piece(self):
+        for _ in range(18):
+            self.assertTrue(self.engine.gravity())
+        self.assertFalse(self.engine.gravity())  # Blocked by the floor, piece locks
+        self.assertEqual(self.engine.pieces_placed, 1)
+        self.assertEqual(self.engine.grid.grid[19][4], 1)
+        self.assertEqual(self.engine.tetromino_position, [0, 4])
+
+    def test_line_clear_scores_100_per_row(self):
+        self.engine.grid.grid[18] = [1, 1, 1, 1, 0, 0, 1, 1, 1, 1]
+        self.engine.grid.grid[19] = [1, 1, 1, 1, 0, 0, 1, 1, 1, 1]
+        self.engine.tetromino_position = [18, 4]
+        self.assertEqual(self.engine.place_current_tetromino(), 2)
+        self.assertEqual(self.engine.score, 200)
+        self.assertEqual(self.engine.lines_cleared, 2)
+
+    def test_game_over_when_spawn_blocked(self):
+        self.engine.grid.grid[1][4] = 1
+        self.engine.tetromino_position = [5, 0]
+        self.engine.place_current_tetromino()
+        self.assertTrue(self.engine.game_over)
+
+    def test_reset(self):
+        self.engine.score = 500
+        self.engine.game_over = True
+        self.engine.grid.grid[19][0] = 1
+        self.engine.reset()
+        self.assertEqual(self.engine.score, 0)
+        self.assertFalse(self.engine.game_over)
+        self.assertEqual(self.engine.grid.grid[19][0], 0)
+
+    def test_random_games_terminate(self):
+        rng = random.Random(1)
+        engine = TetrisEngine(10, 20)
+        for _ in range(3):
+            engine.reset()
+            moves = 0
+            while not engine.game_over and moves < 100000:
+                engine.apply(rng.choice(ACTIONS))
+                engine.apply(DOWN)
+                moves += 1
+            self.assertTrue(engine.game_over)
+
+    def test_hard_drop_locks_at_landing_row(self):
+        self.engine.grid.place_tetromino(Tetromino('O'), (18, 4), False)
+        self.assertEqual(self.engine.landing_position(), [16, 4])
+        self.engine.apply(HARD_DROP)
+        self.assertEqual(self.engine.pieces_placed, 1)
+        self.assertEqual(self.engine.grid.grid[16][4], 1)
+        self.assertEqual(self.engine.grid.heights[4], 4)
+        self.assertEqual(self.engine.tetromino_position, [0, 4])  # Next piece spawned
+
+    def test_unknown_action(self):
+        with self.assertRaises(ValueError):
+            self.engine.apply('jump')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,10 @@ import os
 # Add the directory containing grid.py to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from grid import Grid
+from grid import Grid, GRID_BACKENDS, create_grid, compact_rows, SHAPE_IDS, BLOCK_ID
+from unittest.mock import patch
+from tetromino import Tetromino
+import random
 import pygame
 
 class TetrominoMock:
@@ -93,6 +96,183 @@ class TestGrid(unittest.TestCase):
         expected_state = [[0 for _ in range(self.grid.width)] for _ in range(self.grid.height)]
         self.assertEqual(self.grid.get_state(), expected_state)
 
+    def test_heights_follow_lock_and_clear(self):
+        grid = Grid(4, 6, load_sounds=False)
+        grid.place_tetromino(Tetromino('T'), (4, 0), False)  # Flat side down on the floor
+        self.assertEqual(grid.heights, [1, 2, 1, 0])
+        grid.place_tetromino(TetrominoMock([[1]], (255, 0, 0)), (5, 3), False)  # Completes the bottom row
+        self.assertEqual(grid.heights, [0, 1, 0, 0])
+        grid.reset()
+        self.assertEqual(grid.heights, [0, 0, 0, 0])
+
+    def test_clear_drops_column_topped_by_cleared_row(self):
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                grid = create_grid(4, 4, backend=backend, load_sounds=False)
+                grid.grid = [[0, 0, 0, 0], [0, 0, 0, 0], [1, 1, 0, 0], [0, 1, 1, 1]]  # Column 0 has a hole under its top
+                self.assertEqual(grid.place_tetromino(Tetromino('O'), (1, 2), False), 1)
+                self.assertEqual(grid.heights, [0, 1, 2, 2])
+
+    def test_clear_searches_new_top_below_cleared_rows(self):
+        bottom = [[1, 1, 1, 0], [0, 0, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0], [0, 1, 0, 1], [1, 0, 0, 1]]
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                grid = create_grid(4, 300, backend=backend, load_sounds=False)
+                grid.grid = [[0] * 4] * 294 + bottom  # Columns 0 to 2 are topped by a cleared row, above holes
+                self.assertEqual(grid.place_tetromino(Tetromino('I', rotation=1), (294, 3), False), 2)
+                self.assertEqual(grid.heights, [1, 2, 4, 4])
+                expected = list(grid.heights)
+                grid.refresh_counters()
+                self.assertEqual(grid.heights, expected)
+
+    def test_landing_row_uses_profile(self):
+        self.grid.place_tetromino(TetrominoMock([[1]], (255, 0, 0)), (19, 5), False)
+        self.assertEqual(self.grid.landing_row(Tetromino('I'), (0, 3)), 18)  # Rests on the single block
+        self.assertEqual(self.grid.landing_row(Tetromino('I'), (0, 6)), 19)
+        self.assertEqual(self.grid.landing_row(Tetromino('T', rotation=2), (0, 4)), 17)  # The stem lands on the block
+
+    def test_landing_row_under_overhang(self):
+        self.grid.place_tetromino(TetrominoMock([[1, 1, 1]], (255, 0, 0)), (15, 0), False)
+        piece = TetrominoMock([[1]], (0, 255, 0))
+        self.assertEqual(self.grid.landing_row(piece, (17, 1)), 19)  # Below the skyline: falls back to scanning
+        self.assertEqual(self.grid.landing_row(piece, (0, 1)), 14)
+
+    def test_skyline_matches_scan_on_every_backend(self):
+        shapes = list(Tetromino.shapes)
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(5)
+                grid = create_grid(8, 16, backend=backend, load_sounds=False)
+                for _ in range(400):
+                    piece = Tetromino(rng.choice(shapes), rotation=rng.randrange(4))
+                    position = (0, rng.randrange(-1, 8))
+                    if not grid.is_valid_position(piece, position):
+                        grid.reset()
+                        continue
+                    landing = grid.landing_row(piece, position)
+                    self.assertEqual(landing, grid.scan_landing_row(piece, position))
+                    grid.place_tetromino(piece, (landing, position[1]), False)
+                    expected = (list(grid.heights), list(grid.row_counts))
+                    grid.refresh_counters()
+                    self.assertEqual((grid.heights, grid.row_counts), expected)
+
+    def test_board_hash_follows_lock_and_clear(self):
+        shapes = list(Tetromino.shapes)
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(7)
+                grid = create_grid(4, 16, backend=backend, load_sounds=False)
+                for _ in range(400):
+                    piece = Tetromino(rng.choice(shapes), rotation=rng.randrange(4))
+                    position = (0, rng.randrange(-1, 4))
+                    if not grid.is_valid_position(piece, position):
+                        grid.reset()
+                        self.assertEqual(grid.board_hash, 0)
+                        continue
+                    grid.place_tetromino(piece, (grid.landing_row(piece, position), position[1]), False)
+                    expected = grid.board_hash
+                    grid.refresh_counters()
+                    self.assertEqual(grid.board_hash, expected)
+
+    def test_board_hash_after_split_clear(self):
+        bottom = [[1, 1, 1, 0], [0, 1, 0, 0], [1, 1, 1, 0], [1, 0, 0, 0], [1, 1, 0, 1]]  # A vertical I clears rows 15 and 17
+        for backend in GRID_BACKENDS:
+            for stacked in (1, 12):  # Few rows above the clears, or more than below them
+                with self.subTest(backend=backend, stacked=stacked):
+                    grid = create_grid(4, 20, backend=backend, load_sounds=False)
+                    grid.grid = [[0] * 4] * (15 - stacked) + [[0, 1, 1, 0]] * stacked + bottom
+                    self.assertEqual(grid.place_tetromino(Tetromino('I', rotation=1), (15, 3), False), 2)
+                    expected = grid.board_hash
+                    grid.refresh_counters()
+                    self.assertEqual(grid.board_hash, expected)
+
+    def test_board_hash_identifies_boards(self):
+        first = Grid(6, 6, load_sounds=False)
+        second = Grid(6, 6, load_sounds=False)
+        first.place_tetromino(Tetromino('O'), (4, 0), False)
+        first.place_tetromino(Tetromino('O'), (4, 2), False)
+        second.place_tetromino(Tetromino('O'), (4, 2), False)
+        self.assertNotEqual(first.board_hash, second.board_hash)
+        second.place_tetromino(Tetromino('O'), (4, 0), False)
+        self.assertEqual(first.board_hash, second.board_hash)  # Same cells in another order
+
+    def test_view_writes_update_counters(self):
+        self.grid.grid[19] = [1] * 9 + [0]
+        self.grid.grid[18][0] = 1
+        self.assertEqual(self.grid.landing_row(Tetromino('O'), (0, 0)), 16)  # Rests on the written block
+        self.assertEqual(self.grid.place_tetromino(Tetromino('I', rotation=1), (16, 9), False), 1)
+        self.assertEqual((self.grid.heights[0], self.grid.row_counts[19]), (1, 2))
+        self.grid.grid[19][0] = 0  # Removing a column's top block lowers the column
+        self.assertEqual(self.grid.heights[0], 0)
+        expected = (list(self.grid.heights), list(self.grid.row_counts), self.grid.board_hash)
+        self.grid.refresh_counters()
+        self.assertEqual((self.grid.heights, self.grid.row_counts, self.grid.board_hash), expected)
+
+    def test_item_writes_on_every_backend(self):
+        for backend in GRID_BACKENDS:
+            with self.subTest(backend=backend):
+                grid = create_grid(4, 6, backend=backend, load_sounds=False)
+                grid.grid[5] = [1, 1, 1, 0]
+                grid.grid[4][0] = 1
+                grid.color_grid[4][0] = (1, 2, 3)
+                self.assertEqual(grid.grid[5], [1, 1, 1, 0])
+                self.assertEqual(grid.color_grid[4][0], (1, 2, 3))
+                self.assertFalse(grid.is_valid_position(Tetromino('O'), (3, 0)))  # Collides with the written block
+                self.assertEqual(grid.landing_row(Tetromino('O'), (0, 1)), 3)
+                self.assertEqual((grid.heights, grid.row_counts), ([2, 1, 1, 0], [0, 0, 0, 0, 1, 3]))
+                grid.grid[4][0] = 0
+                self.assertEqual(grid.heights, [1, 1, 1, 0])
+                grid.grid[5][3] = 1
+                self.assertEqual(grid.check_filled_rows(), [5])
+                self.assertEqual(grid.clear_filled_rows(False, [5]), 1)
+                self.assertEqual(grid.grid, [[0] * 4] * 6)
+                expected = (list(grid.heights), list(grid.row_counts), grid.board_hash)
+                grid.refresh_counters()
+                self.assertEqual((grid.heights, grid.row_counts, grid.board_hash), expected)
+
+    def test_row_counts_follow_lock_and_clear(self):
+        grid = Grid(4, 6, load_sounds=False)
+        grid.place_tetromino(Tetromino('T'), (4, 0), False)
+        self.assertEqual(grid.row_counts, [0, 0, 0, 0, 1, 3])
+        self.assertEqual(grid.place_tetromino(TetrominoMock([[1]], (255, 0, 0)), (5, 3), False), 1)
+        self.assertEqual(grid.row_counts, [0, 0, 0, 0, 0, 1])
+
+    def test_lock_checks_only_touched_rows(self):
+        grid = Grid(4, 1000, load_sounds=False)
+        with patch.object(grid, 'check_filled_rows') as check_filled_rows:
+            self.assertEqual(grid.place_tetromino(Tetromino('I'), (999, 0), False), 1)
+        check_filled_rows.assert_not_called()
+        self.assertEqual(grid.row_counts[-1], 0)
+
+    def test_cells_are_palette_ids(self):
+        grid = Grid(4, 3, load_sounds=False)
+        self.assertIsInstance(grid.cell_ids, bytearray)
+        self.assertEqual(len(grid.cell_ids), 12)
+        grid.place_tetromino(Tetromino('T'), (1, 0), False)
+        self.assertEqual(grid.cell_ids[4 * 2], SHAPE_IDS['T'])
+        self.assertEqual(grid.palette[SHAPE_IDS['T']], Tetromino.colors['T'])
+        self.assertEqual(grid.color_grid[2][0], Tetromino.colors['T'])
+        snapshot = grid.snapshot()
+        grid.reset()
+        self.assertEqual(grid.cell_ids, bytearray(12))
+        self.assertEqual(snapshot[4 * 2], SHAPE_IDS['T'])  # Snapshots are independent copies
+
+    def test_views_write_through(self):
+        self.grid.grid[5][2] = 1
+        self.assertEqual(self.grid.cell_ids[5 * 10 + 2], BLOCK_ID)
+        self.assertEqual(self.grid.color_grid[5][2], (0, 0, 0))
+        self.grid.color_grid[5][2] = (1, 2, 3)  # A color not in the palette yet
+        self.assertEqual(self.grid.palette[self.grid.cell_ids[52]], (1, 2, 3))
+        self.grid.color_grid[5][3] = (1, 2, 3)  # Empty cells have no color
+        self.assertEqual(self.grid.grid[5][3], 0)
+        self.grid.grid[5] = [0] * 10
+        self.assertEqual(self.grid.cell_ids, bytearray(200))
+
+    def test_compact_rows(self):
+        plane = ['a', 'b', 'c', 'd', 'e']
+        compact_rows(plane, [1, 3], lambda: '-')
+        self.assertEqual(plane, ['-', '-', 'a', 'c', 'e'])
+
 if __name__ == "__main__":
     pygame.init()
     unittest.main()
@@ -4,11 +4,13 @@ import copy
 import sys
 import os
 import tempfile
+import threading
+from unittest.mock import patch
 
 # Add the directory containing grid.py to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from high_score_manager import HighScoreManager
+from high_score_manager import HighScoreManager, ScoreWriter, write_atomic
 
 class TestHighScoreManager(unittest.TestCase):
     def setUp(self):
@@ -29,8 +31,10 @@ class TestHighScoreManager(unittest.TestCase):
         self.manager.high_scores = self.original_high_scores
         self.manager.save_high_scores()
 
-        # Remove the temporary test file
-        os.remove(self.temp_file.name)
+        # Remove the temporary test file, its score log and index
+        for path in (self.temp_file.name, self.manager.log_filename, self.manager.index_filename):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_load_high_scores(self):
         """Test loading high scores from a valid file."""
@@ -58,6 +62,146 @@ class TestHighScoreManager(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0][0], 500)
 
+    def test_history_is_append_only(self):
+        """Every result stays in the log, even those that fall out of the top scores."""
+        for score in range(10):
+            self.manager.add_high_score(score, f"2024-08-14 15:00:{score:02}")
+        self.assertEqual([score for score, _ in self.manager.history()], list(range(10)))
+        self.assertEqual([score for score, _ in self.manager.high_scores], [9, 8, 7, 6, 5])
+
+    def test_equal_scores_keep_older_first(self):
+        """Ties rank like the old stable sort: the earlier result stays ahead."""
+        self.manager.add_high_score(100, "first")
+        self.manager.add_high_score(100, "second")
+        self.assertEqual(self.manager.high_scores, [(100, "first"), (100, "second")])
+
+    def test_reload_replays_log_after_snapshot(self):
+        """A fresh manager sees scores logged after the last compaction."""
+        self.manager.add_high_score(300, "a")
+        self.manager.compact()
+        self.manager.add_high_score(700, "b")
+        self.manager.flush()
+        reloaded = HighScoreManager(self.temp_file.name)
+        self.assertEqual(reloaded.high_scores, [(700, "b"), (300, "a")])
+        self.assertEqual(reloaded.pending, 1)  # Only the tail after the index offset was read
+
+    def test_reload_skips_entries_already_in_snapshot(self):
+        """A stale index (e.g. a crash mid-compaction) does not duplicate scores."""
+        self.manager.add_high_score(300, "a")
+        self.manager.compact()
+        self.manager.flush()
+        os.remove(self.manager.index_filename)
+        reloaded = HighScoreManager(self.temp_file.name)
+        self.assertEqual(reloaded.high_scores, [(300, "a")])
+
+    def test_repeated_results_survive_reload(self):
+        """The same (score, timestamp) logged twice counts twice, before and after a compaction."""
+        self.manager.add_high_score(100, "t")
+        self.manager.compact()
+        self.manager.add_high_score(100, "t")
+        self.manager.flush()
+        self.assertEqual(HighScoreManager(self.temp_file.name).high_scores, [(100, "t"), (100, "t")])
+        os.remove(self.manager.index_filename)  # Without an index the whole log is replayed
+        self.assertEqual(HighScoreManager(self.temp_file.name).high_scores, [(100, "t"), (100, "t")])
+
+    def test_index_written_before_snapshot(self):
+        """A crash after the index write but before the snapshot write loses nothing and duplicates nothing."""
+        self.manager.add_high_score(300, "a")
+        self.manager.compact()
+        self.manager.flush()
+        with open(self.temp_file.name, 'w') as f:
+            json.dump([], f)  # The snapshot write that never happened
+        self.manager.add_high_score(300, "a")
+        self.manager.flush()
+        self.assertEqual(HighScoreManager(self.temp_file.name).high_scores, [(300, "a"), (300, "a")])
+
+    def test_rebuild_keeps_unlogged_snapshot_entries(self):
+        """Scores from before the log existed survive a rebuild."""
+        with open(self.temp_file.name, 'w') as f:
+            json.dump([[100, "old"], [0, "older"]], f)
+        manager = HighScoreManager(self.temp_file.name)
+        manager.add_high_score(50, "new")
+        self.assertEqual(manager.rebuild(), [(100, "old"), (50, "new"), (0, "older")])
+        manager.flush()
+        self.assertEqual(HighScoreManager(self.temp_file.name).rebuild(), [(100, "old"), (50, "new"), (0, "older")])
+
+    def test_compacts_periodically(self):
+        manager = HighScoreManager(self.temp_file.name, compact_every=3)
+        for score in (1, 2, 3):
+            manager.add_high_score(score, "t")
+        self.assertEqual(manager.pending, 0)
+        manager.flush()
+        with open(self.temp_file.name, 'r') as f:
+            self.assertEqual([entry[0] for entry in json.load(f)], [3, 2, 1])
+
+    def test_rebuild_from_history(self):
+        """Raising keep recovers scores that were only in the log."""
+        for score in range(8):
+            self.manager.add_high_score(score, "t")
+        self.manager.keep = 8
+        self.assertEqual([score for score, _ in self.manager.rebuild()], list(range(7, -1, -1)))
+
+    def test_torn_log_line_is_skipped(self):
+        self.manager.add_high_score(50, "t")
+        self.manager.flush()
+        with open(self.manager.log_filename, 'a') as f:
+            f.write('[60, "unfin')
+        self.assertEqual(HighScoreManager(self.temp_file.name).high_scores, [(50, "t")])
+
+    def test_add_does_not_touch_disk(self):
+        """The caller returns while the writer is still blocked; the score is visible in memory."""
+        release = threading.Event()
+        original = ScoreWriter.write_batch
+        with patch.object(ScoreWriter, 'write_batch', lambda writer, batch: (release.wait(5), original(writer, batch))):
+            self.manager.add_high_score(900, "t")
+            self.assertEqual(self.manager.high_scores, [(900, "t")])
+            self.assertFalse(os.path.exists(self.manager.log_filename))
+            release.set()
+            self.manager.flush()
+        self.assertEqual(self.manager.history(), [(900, "t")])
+
+    def test_bursts_are_coalesced(self):
+        """Saves queued while the writer is busy are written as one batch with one snapshot."""
+        entered, release = threading.Event(), threading.Event()
+        original = ScoreWriter.write_batch
+
+        def blocked_write_batch(writer, batch):
+            entered.set()
+            release.wait(5)
+            original(writer, batch)
+
+        with patch.object(ScoreWriter, 'write_batch', blocked_write_batch), \
+                patch.object(ScoreWriter, 'write_snapshot', autospec=True, side_effect=ScoreWriter.write_snapshot) as write_snapshot:
+            self.manager.add_high_score(1, "t")  # Occupies the writer
+            entered.wait(5)
+            for score in range(2, 12):
+                self.manager.add_high_score(score, "t")
+                self.manager.compact()
+            release.set()
+            self.manager.flush()
+        self.assertEqual(self.manager.writer.batches, 2)
+        self.assertEqual(write_snapshot.call_count, 1)
+        self.assertEqual(len(self.manager.history()), 11)
+        with open(self.temp_file.name, 'r') as f:
+            self.assertEqual([entry[0] for entry in json.load(f)], [11, 10, 9, 8, 7])
+
+    def test_write_atomic_keeps_old_file_on_failure(self):
+        with open(self.temp_file.name, 'w') as f:
+            f.write('[[1, "old"]]')
+        with patch('os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                write_atomic(self.temp_file.name, '[[2, "new"]]')
+        with open(self.temp_file.name, 'r') as f:
+            self.assertEqual(f.read(), '[[1, "old"]]')
+        os.remove(self.temp_file.name + '.tmp')
+
+    def test_close_flushes_pending_scores(self):
+        self.manager.add_high_score(42, "t")
+        self.manager.close()
+        self.assertEqual(HighScoreManager(self.temp_file.name).pending, 0)
+        with open(self.temp_file.name, 'r') as f:
+            self.assertEqual(json.load(f), [[42, "t"]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -98,8 +98,7 @@ class TestTetrisGameIntegration(unittest.TestCase):
 
     @patch('tetris_game.Tetromino')
     @patch('tetris_game.Grid')
-    @patch('pygame.time.get_ticks', return_value=1000)  # Mock get_ticks to return a consistent time
-    def test_restart_game(self, mock_get_ticks, MockGrid, MockTetromino):
+    def test_restart_game(self, MockGrid, MockTetromino):
         # Initialize the game
         width, height, block_size = 10, 20, 30
         game = TetrisGame(width, height, block_size)
@@ -114,7 +113,7 @@ class TestTetrisGameIntegration(unittest.TestCase):
         self.assertFalse(game.game_over)  # This should be False after restarting
         self.assertEqual(game.score, 0)
         self.assertEqual(game.tetromino_position, [0, game.grid.width // 2 - 1])
-        self.assertEqual(game.last_drop_time, 1.0)
+        self.assertEqual(game.ticks_since_drop, 0)  # Gravity restarts a full interval
 
     def setUp(self):
         # Log the current working directory
@@ -0,0 +1,84 @@
+import unittest
+import random
+import sys
+import os
+import pygame
+
+# Add the directory containing layers.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from layers import LayerCache
+from grid import Grid
+
+
+class TestLayerCache(unittest.TestCase):
+    def test_builds_once_per_key(self):
+        cache = LayerCache()
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+        self.assertEqual(cache.get('layer', (10, 20), build), 1)
+        self.assertEqual(cache.get('layer', (10, 20), build), 1)
+        self.assertEqual(cache.get('layer', (10, 30), build), 2)  # Geometry changed, rebuild
+        self.assertEqual(cache.builds, 2)
+        cache.clear()
+        self.assertEqual(cache.get('layer', (10, 30), build), 3)
+
+
+class TestGridLayers(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.grid = Grid(load_sounds=False)
+
+    def test_background_layer_is_cached(self):
+        layer = self.grid.background_layer()
+        self.assertIs(self.grid.background_layer(), layer)
+        self.assertEqual(layer.get_size(), (300, 600))
+        self.assertEqual(layer.get_at((0, 0))[:3], (200, 200, 200))
+        self.assertEqual(layer.get_at((15, 15))[:3], (0, 0, 0))
+
+    def test_layers_rebuild_on_block_size_change(self):
+        sprite = self.grid.block_sprite((255, 0, 0))
+        self.assertIs(self.grid.block_sprite((255, 0, 0)), sprite)
+        self.grid.block_size = 10
+        self.assertEqual(self.grid.block_sprite((255, 0, 0)).get_size(), (10, 10))
+        self.assertEqual(self.grid.background_layer().get_size(), (100, 200))
+
+    def test_draw_matches_cells(self):
+        surface = pygame.Surface((300, 600))
+        self.grid.grid[19][0] = 1
+        self.grid.color_grid[19][0] = (0, 255, 0)
+        self.grid.draw(surface)
+        self.assertEqual(surface.get_at((15, 19 * 30 + 15))[:3], (0, 255, 0))
+        self.assertEqual(surface.get_at((30, 0))[:3], (200, 200, 200))
+        self.assertEqual(surface.get_at((45, 15))[:3], (0, 0, 0))
+
+    def test_draw_matches_per_cell_painting(self):
+        """The single scaled blit looks exactly like painting every cell on its own."""
+        rng = random.Random(2)
+        for y in range(10, 20):
+            for x in range(10):
+                if rng.random() < 0.6:
+                    self.grid.cell_ids[y * 10 + x] = rng.randrange(1, len(self.grid.palette))
+        self.grid.grid[9][3] = 1  # A block without a color is black
+        self.grid.color_grid[19][9] = (1, 2, 3)  # A color added to the palette after the first draw
+        drawn = pygame.Surface((300, 600))
+        self.grid.draw(drawn)
+        painted = pygame.Surface((300, 600))
+        palette = self.grid.palette
+        for index, piece_id in enumerate(self.grid.cell_ids):
+            y, x = divmod(index, 10)
+            self.grid.draw_cell(painted, x, y, palette[piece_id] if piece_id else None)
+        self.assertEqual(pygame.image.tostring(drawn, 'RGB'), pygame.image.tostring(painted, 'RGB'))
+
+    def test_draw_cost_does_not_depend_on_cells(self):
+        """Drawing builds its surfaces once; later frames only reuse them."""
+        surface = pygame.Surface((300, 600))
+        self.grid.draw(surface)
+        builds = self.grid.layers.builds
+        self.grid.grid[19] = [1] * 10
+        self.grid.draw(surface)
+        self.assertEqual(self.grid.layers.builds, builds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import random
+import numpy as np
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grid import Grid, create_grid, SHAPE_IDS
+from numpy_grid import NumpyGrid
+from tetromino import Tetromino
+
+
+class TetrominoMock:
+    def __init__(self, shape, color):
+        self.shape = shape
+        self.color = color
+
+    def get_shape(self):
+        return self.shape
+
+    def get_color(self):
+        return self.color
+
+
+class TestNumpyGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = NumpyGrid(load_sounds=False)
+
+    def test_create_grid_selects_backend(self):
+        self.assertIsInstance(create_grid(backend='numpy', load_sounds=False), NumpyGrid)
+
+    def test_initial_views(self):
+        self.assertEqual(self.grid.grid, [[0] * 10 for _ in range(20)])
+        self.assertEqual(self.grid.color_grid[0][0], (0, 0, 0))
+        self.assertEqual(self.grid.cells.dtype, np.uint8)
+
+    def test_place_stores_piece_id(self):
+        tetromino = Tetromino('T')
+        self.grid.place_tetromino(tetromino, (18, 0), False)
+        self.assertEqual(self.grid.piece_ids[18, 1], SHAPE_IDS['T'])
+        self.assertEqual(self.grid.color_grid[18][1], Tetromino.colors['T'])
+        self.assertEqual(self.grid.cells.sum(), 4)
+
+    def test_place_mock_registers_color(self):
+        self.grid.place_tetromino(TetrominoMock([[1, 1]], (1, 2, 3)), (19, 0), False)
+        self.assertEqual(self.grid.color_grid[19][0], (1, 2, 3))
+
+    def test_piece_ids_share_cell_buffer(self):
+        self.grid.piece_ids[3, 2] = SHAPE_IDS['I']
+        self.assertEqual(self.grid.cell_ids[3 * 10 + 2], SHAPE_IDS['I'])
+        self.grid.reset()
+        self.assertEqual(self.grid.snapshot(), bytes(200))
+
+    def test_check_and_clear_filled_rows(self):
+        self.grid.cells[19] = 1
+        self.grid.cells[17] = 1
+        self.grid.cells[18, 0] = 1
+        self.assertEqual(self.grid.check_filled_rows(), [17, 19])
+        self.assertEqual(self.grid.clear_filled_rows(False), 2)
+        self.assertEqual(self.grid.cells[19, 0], 1)
+        self.assertEqual(self.grid.cells[:19].sum(), 0)
+
+    def test_valid_positions_matches_is_valid_position(self):
+        rng = random.Random(5)
+        self.grid.grid = [[1 if y > 12 and rng.random() < 0.6 else 0 for _ in range(10)] for y in range(20)]
+        for shape in Tetromino.shapes:
+            tetromino = Tetromino(shape)
+            positions = [(rotation, row, col) for rotation in range(4) for row in range(-2, 21) for col in range(-2, 11)]
+            mask = self.grid.valid_positions(tetromino, positions)
+            self.assertEqual(mask.dtype, bool)
+            for (rotation, row, col), valid in zip(positions, mask):
+                tetromino.rotation = rotation
+                self.assertEqual(bool(valid), self.grid.is_valid_position(tetromino, (row, col)))
+
+    def test_valid_positions_mock_piece(self):
+        tetromino = TetrominoMock([[1, 1], [1, 1]], (255, 0, 0))
+        self.grid.cells[0, 0] = 1
+        mask = self.grid.valid_positions(tetromino, [(0, 0, 0), (0, 1, 1), (0, 19, 9)])
+        self.assertEqual(mask.tolist(), [False, True, False])
+
+    def test_matches_list_backend(self):
+        rng = random.Random(9)
+        reference = Grid(6, 24, load_sounds=False)
+        shapes = list(Tetromino.shapes)
+        grid = NumpyGrid(6, 24, load_sounds=False)
+        for _ in range(300):
+            tetromino = Tetromino(rng.choice(shapes), rng.randrange(4))
+            position = [rng.randrange(0, 24), rng.randrange(-1, 6)]
+            if reference.is_valid_position(tetromino, position):
+                self.assertEqual(grid.place_tetromino(tetromino, position, False),
+                                 reference.place_tetromino(tetromino, position, False))
+            self.assertEqual(grid.grid, reference.grid)
+            self.assertEqual(grid.color_grid, reference.color_grid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+
+# Add the directory containing profiler.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from profiler import FrameProfiler, percentile
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_laps_accumulate_per_phase(self):
+        profiler = FrameProfiler(phases=('a', 'b'))
+        profiler.begin_frame()
+        profiler.mark -= 3000  # Pretend phase a ran for 3 us, then b, then a again
+        profiler.lap('a')
+        profiler.mark -= 2000
+        profiler.lap('b')
+        profiler.mark -= 1000
+        profiler.lap('a')
+        profiler.end_frame()
+        a, b, total = profiler.samples
+        self.assertGreaterEqual(a, 4000)
+        self.assertGreaterEqual(b, 2000)
+        self.assertFalse(profiler.timing)
+
+    def test_percentiles_use_the_rolling_window(self):
+        profiler = FrameProfiler(window=4, phases=('a',))
+        for value in (100, 1, 2, 3, 4):  # The first frame falls out of the window
+            profiler.begin_frame()
+            profiler.current[0] = value * 1_000_000
+            profiler.end_frame()
+        p50, p99 = profiler.percentiles()['a']
+        self.assertEqual((p50, p99), (2.0, 4.0))
+        self.assertEqual(profiler.frames, 5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 0.99), 10)
+
+    def test_csv_has_one_row_per_frame(self):
+        profiler = FrameProfiler(phases=('a', 'b'))
+        for _ in range(3):
+            profiler.begin_frame()
+            profiler.lap('b')
+            profiler.end_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.csv')
+            self.assertEqual(profiler.write_csv(path), 3)
+            with open(path, newline='') as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['frame', 'a_us', 'b_us', 'frame_us'])
+        self.assertEqual([row[0] for row in rows[1:]], ['0', '1', '2'])
+
+    def test_overlay_controls_timing_unless_enabled(self):
+        profiler = FrameProfiler()
+        profiler.show_overlay(True)
+        self.assertTrue(profiler.enabled)
+        profiler.begin_frame()
+        profiler.show_overlay(False)
+        self.assertFalse(profiler.enabled)
+        self.assertFalse(profiler.timing)  # The interrupted frame is dropped
+        profiler.enable('profile.csv')
+        profiler.show_overlay(True)
+        profiler.show_overlay(False)
+        self.assertTrue(profiler.enabled)
+        self.assertEqual(profiler.path, 'profile.csv')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import pygame
+
+# Add the directory containing renderer.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tetris_game import TetrisGame
+from tetromino import Tetromino
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    @patch.object(TetrisGame, 'play_background_music')
+    @patch('tetris_game.HighScoreManager')
+    def setUp(self, MockHighScoreManager, mock_music):
+        MockHighScoreManager.return_value.load_high_scores.return_value = []
+        pygame.init()
+        self.game = TetrisGame()
+        self.game.screen = pygame.Surface((self.game.screen_width, self.game.screen_height))
+        self.game.current_tetromino = Tetromino('T')
+        self.game.tetromino_position = [0, 4]
+        self.renderer = self.game.renderer
+
+    def assert_matches_full_render(self):
+        """The incrementally painted screen must equal a from-scratch paint."""
+        painted = self.game.screen
+        self.game.screen = pygame.Surface(painted.get_size())
+        self.renderer.render_full()
+        expected = pygame.image.tostring(self.game.screen, 'RGB')
+        self.game.screen = painted
+        self.assertEqual(pygame.image.tostring(painted, 'RGB'), expected)
+
+    def test_first_frame_is_full(self):
+        rects = self.renderer.render()
+        self.assertEqual(rects, [self.game.screen.get_rect()])
+
+    def test_idle_frame_repaints_nothing(self):
+        self.renderer.render()
+        self.assertEqual(self.renderer.render(), [])
+        self.assertEqual(self.renderer.last_repainted_area, 0)
+
+    def test_piece_move_repaints_footprint_only(self):
+        self.renderer.render()
+        self.game.move_tetromino(0, 1)
+        rects = self.renderer.render()
+        block = self.game.grid.block_size
+        self.assertTrue(0 < len(rects) <= 8)
+        self.assertLessEqual(self.renderer.last_repainted_area, 8 * block * block)
+        self.assert_matches_full_render()
+
+    def test_ghost_follows_piece(self):
+        self.renderer.render()
+        block = self.game.grid.block_size
+        ghost_top = (self.game.ghost_position()[0] + 1) * block  # Bottom row of the flat T at the floor
+        self.assertEqual(self.game.screen.get_at((4 * block, ghost_top))[:3], Tetromino.colors['T'])
+        self.game.move_tetromino(-1, 0)
+        rects = self.renderer.render()
+        self.assertLessEqual(len(rects), 16)  # Old and new piece plus old and new ghost footprints
+        self.assert_matches_full_render()
+        self.assertEqual(self.game.screen.get_at((3 * block, ghost_top))[:3], Tetromino.colors['T'])
+
+    def test_lock_and_clear_repaints_changed_cells(self):
+        self.renderer.render()
+        self.game.grid.grid[19] = [1] * 10
+        self.game.grid.grid[19][4] = 0
+        self.game.grid.grid[18][4] = 1
+        self.game.grid.color_grid[19] = [(0, 255, 0)] * 10
+        self.renderer.render()
+        self.assert_matches_full_render()
+        self.game.grid.clear_filled_rows(False)
+        self.renderer.render()
+        self.assert_matches_full_render()
+
+    def test_score_change_repaints_panel(self):
+        self.renderer.render()
+        self.game.score = 300
+        rects = self.renderer.render()
+        self.assertEqual(rects, [self.renderer.panel_rect()])
+        self.assert_matches_full_render()
+
+    def test_level_up_banner_is_repainted_over_changes_and_wiped(self):
+        self.renderer.render()
+        self.game.level_up_message = True
+        banner_rect = self.renderer.render()[0]
+        self.assertEqual(self.renderer.render(), [])
+        self.game.score = 200  # Panel repaint overlaps the banner
+        rects = self.renderer.render()
+        self.assertIn(banner_rect, rects)
+        self.game.level_up_message = False
+        self.assertEqual(self.renderer.render(), [self.game.screen.get_rect()])
+
+    def test_invalidate_forces_full_frame(self):
+        self.renderer.render()
+        self.renderer.invalidate()
+        self.assertEqual(self.renderer.render(), [self.game.screen.get_rect()])
+
+
+if __name__ == "__main__":
+    unittest.main()
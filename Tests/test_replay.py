@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import random
+import tempfile
+import pygame
+
+# Add the directory containing replay.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from replay import InputRecorder, ReplayRunner, load_replay
+from tetris_game import TetrisGame
+
+KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_DOWN]
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.replay')
+        patcher = patch('tetris_game.HighScoreManager')  # Keep the real high score file untouched
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def play_recorded_game(self, seed, max_ticks=20000):
+        """Play with random keys at random ticks, the way the live loop interleaves them."""
+        rng = random.Random(seed)
+        game = TetrisGame(seed=seed, record_path=self.path)
+        game.draw_game_over = lambda: None
+        while not game.game_over and game.tick < max_ticks:
+            game.update(rng.randrange(0, 30))
+            for _ in range(rng.randrange(0, 3)):
+                if game.game_over:
+                    break
+                game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(KEYS)))
+            game.after_input()
+        game.recorder.finish_game(game.tick, game.score)
+        game.recorder.save()
+        return game
+
+    def test_recorder_round_trip(self):
+        recorder = InputRecorder(self.path)
+        recorder.start_game(7, 'bag', 10, 20)
+        recorder.record(5, pygame.K_LEFT)
+        recorder.record(5, pygame.K_UP)
+        recorder.record(40, pygame.K_DOWN)
+        recorder.finish_game(90, 300)
+        self.assertEqual(recorder.save(), 1)
+        game, = load_replay(self.path)
+        self.assertEqual(game['events'], [(5, pygame.K_LEFT), (5, pygame.K_UP), (40, pygame.K_DOWN)])
+        self.assertEqual((game['seed'], game['policy'], game['ticks'], game['score']), (7, 'bag', 90, 300))
+
+    def test_headless_replay_reproduces_the_game(self):
+        live = self.play_recorded_game(seed=3)
+        record, = load_replay(self.path)
+        self.assertGreater(len(record['events']), 0)
+        for render in (False, True):
+            runner = ReplayRunner(record, render=render)
+            result = runner.run()
+            self.assertTrue(result['matches'])
+            self.assertEqual(result['score'], live.score)
+            self.assertEqual(runner.game.grid.get_state(), live.grid.get_state())
+            self.assertEqual(result['frames'] > 0, render)
+            self.assertEqual(set(result['timings']), {'update', 'input', 'render', 'present'})
+
+    def test_replay_does_not_record_scores(self):
+        self.play_recorded_game(seed=4)
+        record, = load_replay(self.path)
+        runner = ReplayRunner(record, render=False)
+        runner.game.draw_game_over = lambda: None
+        with patch.object(runner.game, 'add_high_score') as mock_add_high_score:
+            runner.run()
+        mock_add_high_score.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
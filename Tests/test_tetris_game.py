@@ -5,12 +5,16 @@ import sys
 import os
 import copy
 import json
+import time
+import io
+import contextlib
 
 # Add the directory containing grid.py and tetromino.py to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from tetris_game import TetrisGame
+from tetris_game import TetrisGame, PLAYING, GAME_OVER, PAUSED, IDLE_WAIT_MS
 from tetromino import Tetromino
+from tracing import tracer
 
 class TetrominoMock:
     def __init__(self, shape):
@@ -40,11 +44,28 @@ class TestTetrisGame(unittest.TestCase):
                 self.original_high_scores = json.load(file)
         else:
             self.original_high_scores = []
+        # The score log and its index are restored too, so tests leave no history behind
+        self.original_files = {}
+        for path in (self.filename + '.log', self.filename + '.idx'):
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    self.original_files[path] = file.read()
+            else:
+                self.original_files[path] = None
 
     def tearDown(self):
         """Restore the original high scores after each test."""
+        if hasattr(self, 'game'):
+            self.game.high_score_manager.flush()  # Let the background writer finish before restoring
         with open(self.filename, 'w') as file:
             json.dump(self.original_high_scores, file)
+        for path, content in self.original_files.items():
+            if content is None:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                with open(path, 'wb') as file:
+                    file.write(content)
 
     @patch('pygame.display.set_mode', return_value=pygame.Surface((800, 600)))
     @patch('pygame.font.Font')
@@ -226,12 +247,14 @@ class TestTetrisGame(unittest.TestCase):
         game.screen_height = 600
         game.score = 1234
 
-        # Mock the event to simulate pressing 'N' for a new game
-        mock_pygame_event_get.side_effect = [[Mock(type=pygame.KEYDOWN, key=pygame.K_n)], []]
-
-        # Call draw_game_over
+        # Call draw_game_over; it only draws, input is handled by the game over state
         with patch.object(game, 'restart_game') as mock_restart_game:
+            game.state = GAME_OVER
             game.draw_game_over()
+            mock_pygame_event_get.assert_not_called()
+
+            # Simulate pressing 'N' for a new game
+            game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_n))
 
             # Define the area where the "GAME OVER" text should be
             rect_x = game.screen_width // 2 - 100  # Adjust the size of the rectangle if needed
@@ -252,10 +275,103 @@ class TestTetrisGame(unittest.TestCase):
         # Verify that the display was updated
         mock_pygame_display_flip.assert_called_once()
 
+    @patch('pygame.display.flip')
+    def test_game_over_state_transitions(self, mock_pygame_display_flip):
+        game = TetrisGame()
+        with patch.object(game, 'add_high_score') as mock_add_high_score:
+            game.end_game()
+            game.end_game()  # Already over: no second score entry
+        self.assertEqual(game.state, GAME_OVER)
+        self.assertTrue(game.game_over)
+        mock_add_high_score.assert_called_once()
+
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_LEFT))  # Ignored while the game is over
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_n))
+        self.assertEqual(game.state, PLAYING)
+        self.assertFalse(game.game_over)
+
+    def test_space_hard_drops(self):
+        game = TetrisGame(seed=1)
+        top, left = game.ghost_position()
+        piece = game.current_tetromino
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_SPACE))
+        self.assertEqual(game.engine.pieces_placed, 1)
+        for y, x in piece.get_cells():
+            self.assertEqual(game.grid.color_grid[top + y][left + x], piece.get_color())
+        self.assertEqual(top + max(y for y, _ in piece.get_cells()), game.grid.height - 1)  # Landed on the floor
+
+    def test_autoplay_presses_keys_once_per_piece(self):
+        game = TetrisGame(seed=4, autoplay=True)
+        pressed = []
+        handle_event = game.handle_event
+        game.handle_event = lambda event: (pressed.append(event.key), handle_event(event))
+        game.autoplay()
+        self.assertEqual(pressed[-1], pygame.K_SPACE)  # Rotations and shifts, then a hard drop
+        self.assertEqual(game.engine.pieces_placed, 1)
+        game.autoplay_piece = game.current_tetromino
+        pressed.clear()
+        game.autoplay()  # This piece was played already
+        self.assertEqual(pressed, [])
+
+    def test_profiler_overlay_times_frame_phases(self):
+        game = TetrisGame(uncapped=True)
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_F3))
+        self.assertTrue(game.profiler.overlay)
+        for _ in range(3):
+            game.play_frame()
+        self.assertEqual(game.profiler.frames, 3)
+        stats = game.profiler.percentiles()
+        self.assertGreater(stats['board'][1], 0)
+        self.assertGreater(stats['tables'][1], 0)  # The first frame repaints the whole panel
+        self.assertGreater(stats['frame'][0], 0)
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_F3))
+        self.assertFalse(game.profiler.enabled)
+        game.play_frame()
+        self.assertEqual(game.profiler.frames, 3)  # Hidden overlay: nothing is timed
+
+    def test_profiler_times_banner_in_its_own_phase(self):
+        game = TetrisGame(uncapped=True)
+        game.profiler.enable()
+        game.level_up_message = True
+        draw_level_up = game.draw_level_up
+        with patch.object(game, 'draw_level_up', side_effect=lambda: (time.sleep(0.02), draw_level_up())[1]):
+            game.play_frame()
+        stats = game.profiler.percentiles()
+        self.assertGreaterEqual(stats['banner'][0], 20)
+        self.assertLess(stats['score'][0], 20)
+
+    def test_profiler_records_frame_that_ends_the_game(self):
+        self.game = game = TetrisGame(uncapped=True)
+        game.profiler.enable()
+        with patch.object(game, 'update', side_effect=lambda ticks: game.end_game()):
+            game.play_frame()
+        self.assertEqual(game.state, GAME_OVER)
+        self.assertEqual(game.profiler.frames, 1)
+        self.assertFalse(game.profiler.timing)
+
+    @patch('pygame.display.flip')
+    def test_pause_freezes_input(self, mock_pygame_display_flip):
+        game = TetrisGame()
+        position = list(game.tetromino_position)
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_p))
+        self.assertEqual(game.state, PAUSED)
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_RIGHT))
+        self.assertEqual(game.tetromino_position, position)
+        game.handle_event(Mock(type=pygame.KEYDOWN, key=pygame.K_p))
+        self.assertEqual(game.state, PLAYING)
+
+    @patch('pygame.event.wait', return_value=pygame.event.Event(pygame.QUIT))
+    def test_idle_states_block_on_event_wait(self, mock_pygame_event_wait):
+        game = TetrisGame()
+        game.state = GAME_OVER
+        with patch('pygame.quit'):
+            game.run()
+        mock_pygame_event_wait.assert_called_once_with(IDLE_WAIT_MS)
+        self.assertFalse(game.running)
+
     @patch('tetris_game.Tetromino')
     @patch('tetris_game.Grid')
-    @patch('pygame.time.get_ticks', return_value=1000)  # Mock get_ticks to return a consistent time
-    def test_restart_game(self, mock_get_ticks, MockGrid, MockTetromino):
+    def test_restart_game(self, MockGrid, MockTetromino):
         self.setUpGame()
         # Initialize the game
         width, height, block_size = 10, 20, 30
@@ -277,7 +393,7 @@ class TestTetrisGame(unittest.TestCase):
         self.assertEqual(game.current_tetromino, mock_tetromino_instance)  # Check if the tetromino was reset
         self.assertEqual(game.tetromino_position, [0, game.grid.width // 2 - 1])  # Check if the tetromino position was reset
         self.assertEqual(game.score, 0)  # Check if the score was reset
-        self.assertEqual(game.last_drop_time, 1.0)  # Check if the drop time was reset correctly
+        self.assertEqual(game.ticks_since_drop, 0)  # Check if the gravity countdown was reset
 
     @patch('tetris_game.Grid')
     @patch('tetris_game.Tetromino')
@@ -369,6 +485,34 @@ class TestTetrisGame(unittest.TestCase):
         for rect in expected_rects:
             mock_draw_rect.assert_any_call(game.screen, (255, 0, 0), rect)  # Ensure each rectangle was drawn with the correct color and position
 
+    @patch('pygame.draw.rect')
+    def test_draw_tetromino_uses_block_size(self, mock_draw_rect):
+        self.setUpGame()
+        game = TetrisGame(10, 20, 20)
+        mock_tetromino = Mock()
+        mock_tetromino.current_shape = [[1]]
+        mock_tetromino.get_color.return_value = (255, 0, 0)
+        game.current_tetromino = mock_tetromino
+        game.tetromino_position = [5, 3]
+        game.draw_tetromino()
+        mock_draw_rect.assert_called_once_with(game.screen, (255, 0, 0), pygame.Rect(60, 100, 20, 20))
+
+    def test_draw_level_up_traces_instead_of_printing(self):
+        game = TetrisGame()
+        game.level_up_ticks_left = 5
+        output = io.StringIO()
+        tracer.clear()
+        tracer.enable()
+        try:
+            with contextlib.redirect_stdout(output):
+                game.draw_level_up()
+            events = tracer.events()
+        finally:
+            tracer.disable()
+            tracer.clear()
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual([(event[1], event[2], event[5]) for event in events], [('level_up', 'render', {'ticks_left': 5})])
+
 
 if __name__ == "__main__":
     pygame.init()
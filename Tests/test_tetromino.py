@@ -5,7 +5,7 @@ import os
 # Add the directory containing tetromino.py to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from tetromino import Tetromino
+from tetromino import Tetromino, ROTATIONS
 
 class TestTetromino(unittest.TestCase):
     def setUp(self):
@@ -83,5 +83,43 @@ class TestTetromino(unittest.TestCase):
             rotated_shape = [list(row) for row in zip(*tetromino.current_shape[::-1])]
             self.assertTrue(tetromino.is_valid_rotation(rotated_shape, grid_state, position))
 
+    def test_rotation_tables(self):
+        for shape, matrix in self.shapes.items():
+            states = ROTATIONS[shape]
+            self.assertEqual(len(states), 4)
+            self.assertEqual([list(row) for row in states[0].matrix], matrix)
+            self.assertEqual([list(row) for row in states[1].matrix], self.expected_rotations[shape])
+            for state in states:
+                self.assertIsInstance(state.matrix, tuple)
+                self.assertEqual(len(state.cells), 4)
+                self.assertEqual(state.height, len(state.matrix))
+                self.assertEqual(state.width, len(state.matrix[0]))
+
+    def test_rotate_cycles_rotation_index(self):
+        grid_state = [[0]*10 for _ in range(20)]
+        tetromino = Tetromino('T')
+        for expected in (1, 2, 3, 0):
+            self.assertTrue(tetromino.rotate(grid_state, [5, 5]))
+            self.assertEqual(tetromino.rotation, expected)
+        self.assertEqual(tetromino.get_cells(), ROTATIONS['T'][0].cells)
+
+    def test_rotate_blocked_keeps_rotation(self):
+        grid_state = [[0]*10 for _ in range(20)]
+        tetromino = Tetromino('I')
+        self.assertFalse(tetromino.rotate(grid_state, [18, 0]))  # Vertical I would leave the board
+        self.assertEqual(tetromino.rotation, 0)
+
+    def test_current_shape_setter_rejects_foreign_matrix(self):
+        tetromino = Tetromino('O')
+        with self.assertRaises(ValueError):
+            tetromino.current_shape = [[1, 1, 1, 1]]
+
+    def test_copy(self):
+        tetromino = Tetromino('L', rotation=2)
+        clone = tetromino.copy()
+        clone.rotation = 3
+        self.assertEqual((clone.shape, clone.color), ('L', tetromino.color))
+        self.assertEqual(tetromino.rotation, 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+import pygame
+
+# Add the directory containing text_cache.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from text_cache import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.cache = TextCache(max_entries=2)
+
+    def test_render_only_on_value_change(self):
+        surface = self.cache.render('Score: 0100', 36, (255, 255, 255))
+        self.assertIs(self.cache.render('Score: 0100', 36, (255, 255, 255)), surface)
+        self.assertIsNot(self.cache.render('Score: 0200', 36, (255, 255, 255)), surface)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_fonts_created_once_per_size(self):
+        font = self.cache.font(24)
+        self.assertIs(self.cache.font(24), font)
+        self.assertIsNot(self.cache.font(36), font)
+
+    def test_least_recently_used_is_evicted(self):
+        first = self.cache.render('a', 24, (0, 0, 0))
+        self.cache.render('b', 24, (0, 0, 0))
+        self.cache.render('a', 24, (0, 0, 0))  # 'a' is now the most recent
+        self.cache.render('c', 24, (0, 0, 0))  # Evicts 'b'
+        self.assertIs(self.cache.render('a', 24, (0, 0, 0)), first)
+        self.assertNotIn((24, 'b', (0, 0, 0)), self.cache.surfaces)
+
+    def test_end_frame_rolls_counters(self):
+        self.cache.render('a', 24, (0, 0, 0))
+        self.cache.render('a', 24, (0, 0, 0))
+        self.assertEqual(self.cache.end_frame(), (1, 1))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+        self.cache.render('a', 24, (0, 0, 0))
+        self.cache.end_frame()
+        self.assertEqual((self.cache.last_frame_hits, self.cache.last_frame_misses), (1, 0))
+        self.assertEqual((self.cache.total_hits, self.cache.total_misses), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import random
+import pygame
+
+# Add the directory containing timestep.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from timestep import FixedTimestep, LOGIC_HZ, NS_PER_SECOND
+from tetris_game import TetrisGame
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_ticks_depend_only_on_elapsed_time(self):
+        rng = random.Random(3)
+        clock = FakeClock()
+        timestep = FixedTimestep(LOGIC_HZ, clock)
+        ticks = 0
+        for _ in range(1000):
+            clock.now += rng.randrange(0, 50_000_000)  # Frames between 0 and 50 ms, some dropped
+            ticks += timestep.advance()
+        self.assertEqual(ticks, clock.now * LOGIC_HZ // NS_PER_SECOND)
+        self.assertEqual(timestep.ticks, ticks)
+
+    def test_exact_tick_boundaries(self):
+        clock = FakeClock()
+        timestep = FixedTimestep(60, clock)
+        clock.now = NS_PER_SECOND  # Exactly one second is exactly 60 ticks, no rounding drift
+        self.assertEqual(timestep.advance(), 60)
+        self.assertEqual(timestep.ns_until_tick(), -(-NS_PER_SECOND // 60))
+        timestep.reset()
+        self.assertEqual(timestep.ticks, 0)
+
+
+class TestFixedTimestepGravity(unittest.TestCase):
+    def make_game(self, clock):
+        with patch.object(TetrisGame, 'play_background_music'):
+            game = TetrisGame(seed=1)
+        game.timestep = FixedTimestep(LOGIC_HZ, clock)
+        return game
+
+    def test_gravity_is_independent_of_frame_timing(self):
+        steady_clock, jittery_clock = FakeClock(), FakeClock()
+        steady, jittery = self.make_game(steady_clock), self.make_game(jittery_clock)
+        rng = random.Random(7)
+        while jittery_clock.now < 5 * NS_PER_SECOND:
+            jittery_clock.now += rng.choice([1_000_000, 16_000_000, 250_000_000])  # Includes long stalls
+            jittery.update(jittery.timestep.advance())
+        steady_clock.now = jittery_clock.now
+        steady.update(steady.timestep.advance())  # All the time in a single frame
+        self.assertEqual(steady.tetromino_position, jittery.tetromino_position)
+        self.assertEqual(steady.tetromino_position[0], int(jittery_clock.now * LOGIC_HZ // NS_PER_SECOND) // steady.drop_ticks)
+
+    def test_idle_frames_are_not_rendered(self):
+        clock = FakeClock()
+        game = self.make_game(clock)
+        with patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT)) as mock_wait:
+            game.play_frame()  # First frame draws everything
+            rendered = game.frames_rendered
+            game.play_frame()  # Nothing changed: sleep until the next gravity step instead
+        self.assertEqual(game.frames_rendered, rendered)
+        mock_wait.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
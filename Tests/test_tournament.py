@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from functools import partial
+import pygame
+
+# Add the directory containing tournament.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tournament import play_bot_game, play_replay_game, run_games, summarize, outcomes, scaling_workers, main
+
+
+class TestTournament(unittest.TestCase):
+    def test_results_do_not_depend_on_worker_count(self):
+        play = partial(play_bot_game, max_pieces=30)
+        seeds = list(range(6))
+        single, _ = run_games(play, seeds, workers=1)
+        pooled, _ = run_games(play, seeds, workers=2, chunksize=2)
+        self.assertEqual(outcomes(single), outcomes(pooled))
+        self.assertEqual([result['seed'] for result in pooled], seeds)  # Game order is kept
+        self.assertEqual(single[0], dict(single[0], pieces=30, topped_out=False))
+
+    def test_replay_games(self):
+        keys = [pygame.K_LEFT, pygame.K_LEFT, pygame.K_SPACE, pygame.K_RIGHT, pygame.K_UP, pygame.K_SPACE]
+        events = [(6 * index, key) for index, key in enumerate(keys * 4, 1)]
+        record = {'seed': 3, 'policy': 'bag', 'width': 10, 'height': 20, 'events': events, 'ticks': 200, 'score': None}
+        first, _ = run_games(play_replay_game, [record], workers=1)
+        record['score'] = first[0]['score']  # Recorded outcome of the game
+        record['ticks'] = first[0]['ticks']
+        results, _ = run_games(play_replay_game, [record, record], workers=2, chunksize=1)
+        self.assertTrue(all(result['matches'] for result in results))
+        self.assertGreaterEqual(results[0]['pieces'], 8)  # A hard drop every third key, plus gravity
+        self.assertEqual(outcomes(results[:1]), outcomes(results[1:]))
+
+    def test_summarize(self):
+        results = [{'score': 100, 'lines': 1}, {'score': 300, 'lines': 3}, {'score': 200, 'lines': 2}]
+        summary = summarize(results, ('score', 'lines'))
+        self.assertEqual(summary['score'], {'mean': 200, 'stdev': 100, 'min': 100, 'median': 200, 'max': 300})
+        self.assertEqual(summarize(results[:1], ('lines',))['lines']['stdev'], 0.0)
+
+    def test_scaling_workers(self):
+        self.assertEqual(scaling_workers(1), [1])
+        self.assertEqual(scaling_workers(8), [1, 2, 4, 8])
+        self.assertEqual(scaling_workers(6), [1, 2, 4, 6])
+
+    def test_main_writes_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            self.assertEqual(main(['--games', '3', '--max-pieces', '10', '--workers', '1', '--output', path]), 0)
+            with open(path) as file:
+                data = json.load(file)
+        self.assertEqual(data['games'], 3)
+        self.assertEqual([result['seed'] for result in data['results']], [0, 1, 2])
+        self.assertEqual(data['summary']['pieces']['mean'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the directory containing tracing.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tracing import Tracer, tracer
+from engine import TetrisEngine
+from tetromino import Tetromino
+
+
+class TestTracer(unittest.TestCase):
+    def test_ring_buffer_keeps_latest_events(self):
+        trace = Tracer(capacity=4)
+        trace.enable()
+        for index in range(6):
+            trace.instant(f'event {index}')
+        self.assertEqual([event[1] for event in trace.events()], ['event 2', 'event 3', 'event 4', 'event 5'])
+        self.assertEqual(trace.total, 6)
+
+    def test_chrome_export(self):
+        trace = Tracer(capacity=8)
+        trace.enable()
+        start = trace.now()
+        trace.instant('clear', 'engine', {'rows': 2})
+        trace.complete('render', start)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            self.assertEqual(trace.dump(path), 2)
+            with open(path) as file:
+                events = json.load(file)['traceEvents']
+        self.assertEqual(events[0]['ph'], 'i')
+        self.assertEqual(events[0]['args'], {'rows': 2})
+        self.assertEqual(events[1]['ph'], 'X')
+        self.assertGreaterEqual(events[1]['dur'], 0)
+
+    def test_disabled_tracer_records_nothing(self):
+        self.assertFalse(tracer.enabled)
+        engine = TetrisEngine(6, 8, tetromino_factory=lambda: Tetromino('O'))
+        while not engine.game_over:
+            engine.gravity()
+        self.assertEqual(tracer.total, 0)
+
+    def test_engine_traces_locks_and_clears(self):
+        tracer.clear()
+        tracer.enable()
+        try:
+            engine = TetrisEngine(4, 6, tetromino_factory=lambda: Tetromino('I'))
+            engine.rotate_tetromino()  # Vertical I fits in an empty board
+            engine.tetromino_position = [0, 0]
+            engine.rotate_tetromino()  # Back to horizontal
+            while engine.pieces_placed == 0:
+                engine.gravity()
+            names = [event[1] for event in tracer.events()]
+        finally:
+            tracer.disable()
+            tracer.clear()
+        self.assertIn('lock', names)
+        self.assertIn('clear', names)
+
+
+if __name__ == "__main__":
+    unittest.main()
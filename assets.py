@@ -0,0 +1,145 @@
+import logging
+import os
+import threading
+import time
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(__file__), 'assets')
+
+# Sound effects shared by Grid and TetrisGame
+PLACE_SOUND = 'solidify.mp3'
+ROW_CLEAR_SOUND = 'row_clear.mp3'
+GAME_OVER_SOUND = 'game_over.mp3'
+SOUND_EFFECTS = (PLACE_SOUND, ROW_CLEAR_SOUND, GAME_OVER_SOUND)
+BACKGROUND_MUSIC = 'background_music.mp3'
+
+
+class SoundAsset:
+    """Handle to a sound effect that is decoded on first use (or by a preload).
+
+    play() is a no-op when the file or the audio device is missing, so
+    callers never need to check whether the sound actually loaded.
+    """
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+
+    def play(self):
+        sound = self.manager.sound(self.name)
+        if sound is not None:
+            sound.play()
+
+
+class AssetManager:
+    """Decode each asset file once and share it between every user.
+
+    Sound effects are decoded lazily, either on first play or ahead of time
+    by preload() on a background thread. Music is streamed by the mixer
+    straight from disk. A missing file or audio device is logged once and
+    the asset then behaves as silent. load_times maps each decoded asset to
+    the seconds its decode took.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR):
+        self.asset_dir = asset_dir
+        self.sounds = {}  # name -> decoded pygame Sound, or None if it could not be loaded
+        self.load_times = {}
+        self.lock = threading.Lock()
+        self.preload_thread = None
+        self.audio_available = None  # Unknown until the mixer is first needed
+
+    def path(self, name):
+        return os.path.join(self.asset_dir, name)
+
+    def mixer_ready(self):
+        """Initialize the mixer once; False if there is no usable audio device."""
+        if self.audio_available is None:
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                self.audio_available = True
+            except pygame.error as e:
+                logging.warning("Audio device unavailable, sounds disabled: %s", e)
+                self.audio_available = False
+        return self.audio_available
+
+    def sound_asset(self, name):
+        """Return a SoundAsset handle; nothing is decoded yet."""
+        return SoundAsset(self, name)
+
+    def sound(self, name):
+        """Return the decoded Sound for `name`, decoding it on first request (None if unavailable)."""
+        if name in self.sounds:
+            return self.sounds[name]
+        with self.lock:
+            if name not in self.sounds:  # Another thread may have finished it while we waited
+                self.sounds[name] = self._decode(name)
+        return self.sounds[name]
+
+    def _decode(self, name):
+        path = self.path(name)
+        if not self.mixer_ready():
+            return None
+        if not os.path.exists(path):
+            logging.warning("Sound file %s is missing; it will stay silent.", path)
+            return None
+        start = time.perf_counter()
+        try:
+            sound = pygame.mixer.Sound(path)
+        except pygame.error as e:
+            logging.error("Error loading sound %s: %s", path, e)
+            return None
+        self.load_times[name] = time.perf_counter() - start
+        logging.info("Loaded %s in %.1f ms", name, self.load_times[name] * 1000)
+        return sound
+
+    def preload(self, names=SOUND_EFFECTS, background=True):
+        """Decode `names` ahead of use, on a daemon thread unless background is False."""
+        self.mixer_ready()  # Initialize the mixer on the calling thread
+        if not background:
+            for name in names:
+                self.sound(name)
+            return None
+        self.preload_thread = threading.Thread(target=lambda: [self.sound(name) for name in names],
+                                               name='asset-preload', daemon=True)
+        self.preload_thread.start()
+        return self.preload_thread
+
+    def wait(self, timeout=None):
+        """Block until a running preload has finished."""
+        if self.preload_thread is not None:
+            self.preload_thread.join(timeout)
+
+    def play_music(self, name=BACKGROUND_MUSIC, volume=0.5, loops=-1):
+        """Stream music from disk in a loop. Returns False if it cannot be played."""
+        path = self.path(name)
+        if not self.mixer_ready():
+            return False
+        if not os.path.exists(path):
+            logging.warning("Music file %s is missing; playing without music.", path)
+            return False
+        try:
+            pygame.mixer.music.load(path)  # The mixer decodes music incrementally while it plays
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops)
+        except pygame.error as e:
+            logging.error("Error playing music %s: %s", path, e)
+            return False
+        return True
+
+    def report(self):
+        """Return one line per decoded asset with its load time, slowest first."""
+        return [f"{name}: {seconds * 1000:.1f} ms" for name, seconds in
+                sorted(self.load_times.items(), key=lambda item: item[1], reverse=True)]
+
+
+_shared_manager = None
+
+
+def get_asset_manager():
+    """Return the process-wide AssetManager used by Grid and TetrisGame."""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = AssetManager()
+    return _shared_manager
@@ -0,0 +1,301 @@
+"""Built-in autoplayer: exhaustive placement search with a weighted board heuristic.
+
+For the active piece (and, with lookahead, the next piece of the preview)
+every distinct rotation is dropped from the top in every column, and the
+board it leaves is scored from four features: lines cleared, aggregate
+column height, holes and bumpiness. The best placement is turned into
+ordinary inputs (rotate, shift, hard drop), applied to a TetrisEngine
+directly or fed to a TetrisGame as key presses, so a recorded autoplayed
+session replays like a human one.
+
+The search runs on SearchBoard, a copy of the board reduced to what the
+heuristic needs: one bitmask per row, the column heights and the filled
+cell count. A placement touches only the piece's rows and columns, and
+every feature follows from the heights in O(width): a column's holes are
+its height minus its filled cells, so all holes are the aggregate height
+minus the filled count.
+
+Each SearchBoard carries the Zobrist hash of its occupancy, updated on
+every placement like Grid.board_hash. With a table_size, the scored
+placements of each (board hash, shape, rotation) are kept in an LRU
+TranspositionTable, so a board reached again is not evaluated twice. The
+table is off by default: in the two-piece search almost the only board
+reached again is the one the last decision looked ahead on, and the
+lookups cost more than the evaluations they save.
+"""
+from collections import namedtuple, OrderedDict
+from operator import sub
+from engine import LEFT, RIGHT, ROTATE, HARD_DROP
+from grid import ROTATION_PROFILES, zobrist_keys, mask_hash, rotate_key, cleared_hash
+from bitboard_grid import ROTATION_MASKS
+from pieces import PieceQueue
+from tetromino import Tetromino, ROTATIONS
+
+# Weight of each board feature in a placement's score; higher scores are better
+HeuristicWeights = namedtuple('HeuristicWeights', ['lines', 'height', 'holes', 'bumpiness'])
+DEFAULT_WEIGHTS = HeuristicWeights(lines=0.760666, height=-0.510066, holes=-0.35663, bumpiness=-0.184483)
+
+# Rotations of every shape with distinct block layouts (O has one, I, S and Z two): DISTINCT_ROTATIONS[shape]
+DISTINCT_ROTATIONS = {
+    name: tuple(rotation for rotation, state in enumerate(states)
+                if state.cells not in [previous.cells for previous in states[:rotation]])
+    for name, states in ROTATIONS.items()
+}
+
+# One candidate placement: the orientation, the left column of its bounding box, the row it lands on,
+# the rows it clears and the heuristic score of the search
+Placement = namedtuple('Placement', ['rotation', 'column', 'landing', 'cleared', 'score'])
+# Transposition table entries when one is used, each the placements of one orientation on one board. A
+# decision stores about a hundred, and boards recur from one decision to the next, so a few thousand
+# suffice; more only keep more objects alive for the garbage collector to scan
+DEFAULT_TABLE_SIZE = 4096
+
+
+class TranspositionTable:
+    """LRU map from (board hash, shape, rotation) to the Placements evaluated for it.
+
+    hits and misses count lookups since creation or the last clear().
+    """
+
+    def __init__(self, max_entries=DEFAULT_TABLE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the stored placements for `key`, or None."""
+        placements = self.entries.get(key)
+        if placements is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return placements
+
+    def put(self, key, placements):
+        self.entries[key] = placements
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # Evict the least recently used board
+
+    def hit_rate(self):
+        """Fraction of lookups answered from the table."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+class SearchBoard:
+    """Occupancy of a board as row bitmasks plus column heights, for placement search.
+
+    Bit x of rows[y] is set when cell (x, y) is filled. hash is the Zobrist
+    hash of the occupancy, with the same keys as Grid.board_hash. Boards are
+    never modified; place() returns a new one.
+    """
+    __slots__ = ('width', 'height', 'rows', 'heights', 'filled', 'hash', 'keys')
+
+    def __init__(self, width, height, rows, heights, filled, board_hash=None, keys=None):
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.heights = heights
+        self.filled = filled
+        self.keys = zobrist_keys(width, height) if keys is None else keys
+        self.hash = self.rows_hash() if board_hash is None else board_hash
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Snapshot any Grid backend (bitboard rows are shared, other boards are packed from cell_ids)."""
+        width = grid.width
+        rows = getattr(grid, 'rows', None)
+        if rows is None:
+            cells = bytes(grid.cell_ids)
+            rows = [sum(1 << x for x in range(width) if cells[start + x]) for start in range(0, len(cells), width)]
+        return cls(width, grid.height, list(rows), list(grid.heights), sum(bin(row).count('1') for row in rows), grid.board_hash)
+
+    def rows_hash(self):
+        """Zobrist hash of the rows, computed from scratch."""
+        columns, _, _, bits = self.keys
+        result = 0
+        for y, row in enumerate(self.rows):
+            if row:
+                result ^= rotate_key(mask_hash(columns, 0, row), y, bits)
+        return result
+
+    def column_height(self, rows, x, start=0):
+        """Filled height of column x in a list of row bitmasks, searched for from row `start` down."""
+        bit = 1 << x
+        for y in range(start, len(rows)):
+            if rows[y] & bit:
+                return self.height - y
+        return 0
+
+    def landing_row(self, shape, rotation, column):
+        """Row at which an orientation dropped from the top at `column` comes to rest (negative if it tops out)."""
+        heights = self.heights
+        floor = self.height - 1
+        return min(floor - heights[column + dx] - bottom for dx, _, bottom in ROTATION_PROFILES[shape][rotation])
+
+    def place(self, shape, rotation, column, landing):
+        """Return the board after locking the orientation at (landing, column) and clearing full rows."""
+        rows = list(self.rows)
+        width = self.width
+        full_row = (1 << width) - 1
+        columns, cell_keys = self.keys.columns, self.keys.cells
+        board_hash = self.hash
+        cleared = []
+        for dy, mask in ROTATION_MASKS[shape][rotation][0]:
+            y = landing + dy
+            rows[y] |= mask << column
+            board_hash ^= mask_hash(cell_keys, y * width, mask << column)
+            if rows[y] == full_row:
+                cleared.append(y)
+        heights = list(self.heights)
+        floor = self.height
+        for dx, top, _ in ROTATION_PROFILES[shape][rotation]:
+            heights[column + dx] = floor - landing - top
+        if cleared:
+            board_hash = cleared_hash(board_hash, lambda y: mask_hash(columns, 0, rows[y]), cleared, floor - max(heights),
+                                      self.keys)
+            for y in reversed(cleared):
+                del rows[y]
+            rows[:0] = [0] * len(cleared)
+            # A full row lies under every column's top, so columns drop by the number cleared, except
+            # those whose top block was cleared: their new top is searched for below that row, as in Grid
+            tops = set(cleared)
+            heights = [self.column_height(rows, x, floor - height + 1) if floor - height in tops else height - len(cleared)
+                       for x, height in enumerate(heights)]
+        filled = self.filled + len(ROTATIONS[shape][rotation].cells) - len(cleared) * width
+        return SearchBoard(width, self.height, rows, heights, filled, board_hash, self.keys)
+
+
+class AutoPlayer:
+    """Pick placements by exhaustive search and play them as inputs.
+
+    With lookahead, a placement of the current piece is scored by the best
+    placement of the next piece on the board it leaves, so the choice sets
+    up the preview piece too. self.evaluations counts the placements scored;
+    with a transposition table (table_size entries, e.g. DEFAULT_TABLE_SIZE;
+    0, the default, runs without one) placements found in it are not scored
+    again.
+    """
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, lookahead=True, table_size=0):
+        self.weights = HeuristicWeights(*weights)
+        self.lookahead = lookahead
+        self.evaluations = 0
+        self.table = TranspositionTable(table_size) if table_size else None
+
+    def evaluate_rotation(self, board, shape, rotation):
+        """Score every column where one orientation can land; returns a list of Placements."""
+        lines_weight, height_weight, holes_weight, bumpiness_weight = self.weights
+        width = board.width
+        floor = board.height - 1
+        rows = board.rows
+        heights = board.heights
+        full_row = (1 << width) - 1
+        profile = ROTATION_PROFILES[shape][rotation]
+        row_masks = ROTATION_MASKS[shape][rotation][0]
+        blocks = len(ROTATIONS[shape][rotation].cells)
+        results = []
+        for column in range(width - ROTATIONS[shape][rotation].width + 1):
+            landing = min(floor - heights[column + dx] - bottom for dx, _, bottom in profile)
+            if landing < 0:
+                continue  # The piece would stick out above the board: game over
+            cleared = 0
+            for dy, mask in row_masks:
+                if rows[landing + dy] | (mask << column) == full_row:
+                    cleared += 1
+            if cleared:
+                new_heights = board.place(shape, rotation, column, landing).heights  # Clears are rare: build the board
+            else:
+                new_heights = list(heights)
+                for dx, top, _ in profile:
+                    new_heights[column + dx] = floor + 1 - landing - top
+            aggregate = sum(new_heights)
+            holes = aggregate - (board.filled + blocks - cleared * width)
+            bumpiness = sum(map(abs, map(sub, new_heights[1:], new_heights[:-1])))
+            score = lines_weight * cleared + height_weight * aggregate + holes_weight * holes + bumpiness_weight * bumpiness
+            results.append(Placement(rotation, column, landing, cleared, score))
+        self.evaluations += len(results)
+        return results
+
+    def placements(self, board, shape):
+        """Every placement of `shape` on `board`, scored by the heuristic alone."""
+        table = self.table
+        results = []
+        for rotation in DISTINCT_ROTATIONS[shape]:
+            if table is None:
+                results += self.evaluate_rotation(board, shape, rotation)
+                continue
+            key = (board.hash, shape, rotation)
+            placements = table.get(key)
+            if placements is None:
+                placements = tuple(self.evaluate_rotation(board, shape, rotation))
+                table.put(key, placements)
+            results += placements
+        return results
+
+    def best_placement(self, board, shape, next_shape=None):
+        """Return the best Placement of `shape`, looking one piece ahead if `next_shape` is given.
+
+        Ties go to the first placement found (rotations, then columns, in
+        ascending order), so the search is deterministic. Returns None when
+        no placement fits.
+        """
+        best = None
+        for placement in self.placements(board, shape):
+            if next_shape is not None:
+                after = board.place(shape, placement.rotation, placement.column, placement.landing)
+                follow_ups = self.placements(after, next_shape)
+                if follow_ups:
+                    # The lines of both pieces count; the board features are those left by the second
+                    score = self.weights.lines * placement.cleared + max(follow_up.score for follow_up in follow_ups)
+                else:
+                    score = float('-inf')  # The next piece would top out
+                placement = placement._replace(score=score)
+            if best is None or placement.score > best.score:
+                best = placement
+        return best
+
+    def plan(self, grid, tetromino, position, preview=()):
+        """Return the actions that bring `tetromino` from `position` to its best placement and lock it.
+
+        Only Tetromino pieces are planned for; anything else is simply hard-dropped.
+        """
+        if not isinstance(tetromino, Tetromino):
+            return [HARD_DROP]
+        next_shape = preview[0] if self.lookahead and preview else None
+        placement = self.best_placement(SearchBoard.from_grid(grid), tetromino.shape, next_shape)
+        if placement is None:
+            return [HARD_DROP]  # Every placement tops out; the game is lost anyway
+        actions = [ROTATE] * ((placement.rotation - tetromino.rotation) % 4)
+        shift = placement.column - position[1]
+        actions += [RIGHT if shift > 0 else LEFT] * abs(shift)
+        actions.append(HARD_DROP)
+        return actions
+
+    def plan_engine(self, engine):
+        """Plan the active piece of a TetrisEngine, using its PieceQueue preview when it has one."""
+        factory = engine.tetromino_factory
+        preview = factory.preview(1) if isinstance(factory, PieceQueue) else ()
+        return self.plan(engine.grid, engine.current_tetromino, engine.tetromino_position, preview)
+
+    def play_piece(self, engine):
+        """Place the engine's active piece where the search says; returns the rows cleared."""
+        cleared = 0
+        for action in self.plan_engine(engine):
+            if action == HARD_DROP:
+                cleared = engine.apply(action)
+            else:
+                engine.apply(action)
+        return cleared
+
+    def play_game(self, engine, max_pieces=None):
+        """Play a whole game on a TetrisEngine (up to `max_pieces` pieces); returns the final score."""
+        while not engine.game_over and (max_pieces is None or engine.pieces_placed < max_pieces):
+            self.play_piece(engine)
+        return engine.score
@@ -0,0 +1,124 @@
+import numpy as np
+from engine import POINTS_PER_ROW
+from tetromino import Tetromino, ROTATIONS
+
+# Shape order used for piece ids: board cells hold SHAPES.index(name) + 1, 0 is empty
+SHAPES = tuple(Tetromino.shapes)
+# Block offsets of every shape and rotation: (shapes, 4 rotations, 4 blocks, 2) as (dy, dx)
+PIECE_OFFSETS = np.array([[state.cells for state in ROTATIONS[name]] for name in SHAPES], dtype=np.int64)
+# Bounding box width of every shape and rotation: (shapes, 4 rotations)
+PIECE_WIDTHS = np.array([[state.width for state in ROTATIONS[name]] for name in SHAPES], dtype=np.int64)
+
+
+class BatchTetrisEnv:
+    """N independent Tetris boards advanced together with vectorized rules.
+
+    Every board lives in one contiguous (N, height, width) uint8 array whose
+    cells hold the piece id that filled them (0 = empty). An action places
+    the board's current piece: (rotation, column) drops the rotated piece
+    straight down from above the board with its bounding box's left edge at
+    column, locks it, clears full rows and scores POINTS_PER_ROW per row,
+    like TetrisEngine. A board is done when its piece cannot fit below the
+    top or the next piece cannot spawn; done boards ignore actions until
+    reset.
+
+    boards, pieces, scores, lines and done are the live arrays, so reading
+    them (or the tuple returned by step) never copies.
+    """
+
+    def __init__(self, num_boards, width=10, height=20, seed=None, autoreset=False):
+        self.num_boards = num_boards
+        self.width = width
+        self.height = height
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros((num_boards, height, width), dtype=np.uint8)
+        self.pieces = np.zeros(num_boards, dtype=np.int64)  # Index into SHAPES of each board's current piece
+        self.scores = np.zeros(num_boards, dtype=np.int64)
+        self.lines = np.zeros(num_boards, dtype=np.int64)
+        self.done = np.zeros(num_boards, dtype=bool)
+        self.spawn_column = width // 2 - 1
+        self._board_index = np.arange(num_boards)
+        self._row_index = np.arange(height)
+        self.reset()
+
+    def reset(self, indices=None):
+        """Reset all boards, or only the boards selected by an index array or mask."""
+        if indices is None:
+            indices = self._board_index
+        self.boards[indices] = 0
+        self.scores[indices] = 0
+        self.lines[indices] = 0
+        self.done[indices] = False
+        self.pieces[indices] = self.rng.integers(0, len(SHAPES), size=self._board_index[indices].shape)
+        return self.observe()
+
+    def observe(self):
+        """Return (boards, pieces, scores, done) as views of the live arrays."""
+        return self.boards, self.pieces, self.scores, self.done
+
+    def column_tops(self, boards=None):
+        """Row index of the highest filled cell in each column, or height if empty: (N, width)."""
+        boards = self.boards if boards is None else boards
+        filled = boards != 0
+        return np.where(filled.any(axis=1), filled.argmax(axis=1), self.height)
+
+    def landing_rows(self, pieces, rotations, columns, tops):
+        """Row at which each piece comes to rest when dropped from above (may be negative)."""
+        offsets = PIECE_OFFSETS[pieces, rotations]  # (N, blocks, 2)
+        block_columns = columns[:, None] + offsets[:, :, 1]
+        block_tops = np.take_along_axis(tops, block_columns, axis=1)
+        return (block_tops - 1 - offsets[:, :, 0]).min(axis=1)
+
+    def step(self, actions):
+        """Apply one (rotation, column) action per board.
+
+        actions is an (N, 2) integer array. Returns (boards, rewards, done)
+        where rewards holds the points scored by each board this step. With
+        autoreset, finished boards are reset before returning and done is a
+        copy flagging which boards finished during this step.
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_boards, 2)
+        boards = self.boards
+        live = ~self.done
+        pieces = self.pieces
+        rotations = actions[:, 0] % 4
+        widths = PIECE_WIDTHS[pieces, rotations]
+        columns = np.minimum(np.maximum(actions[:, 1], 0), self.width - widths)
+
+        offsets = PIECE_OFFSETS[pieces, rotations]  # (N, blocks, 2)
+        landing = self.landing_rows(pieces, rotations, columns, self.column_tops())
+        fits = landing + offsets[:, :, 0].min(axis=1) >= 0  # Every block below the top edge
+
+        # Lock the pieces of live boards that fit
+        locked = np.flatnonzero(fits & live)
+        rows = landing[locked, None] + offsets[locked, :, 0]
+        cols = columns[locked, None] + offsets[locked, :, 1]
+        boards[locked[:, None], rows, cols] = pieces[locked, None] + 1
+
+        # Clear full rows: stable-sort each board's rows so cleared rows come first, then blank them
+        full = (boards != 0).all(axis=2)
+        cleared = full.sum(axis=1)
+        clearing = np.flatnonzero(cleared)
+        if clearing.size:
+            order = np.argsort(~full[clearing], axis=1, kind='stable')
+            compacted = np.take_along_axis(boards[clearing], order[:, :, None], axis=1)
+            compacted[self._row_index[None, :] < cleared[clearing, None]] = 0
+            boards[clearing] = compacted
+
+        rewards = cleared * POINTS_PER_ROW
+        self.scores += rewards
+        self.lines += cleared
+
+        # Spawn the next pieces (drawn for every board so the RNG stream never depends on which are done)
+        next_pieces = self.rng.integers(0, len(SHAPES), size=self.num_boards)
+        spawn_offsets = PIECE_OFFSETS[next_pieces, 0]
+        spawn_blocked = boards[self._board_index[:, None], spawn_offsets[:, :, 0], self.spawn_column + spawn_offsets[:, :, 1]].any(axis=1)
+        np.copyto(pieces, next_pieces, where=live)
+        self.done |= live & (~fits | spawn_blocked)
+
+        if self.autoreset and self.done.any():
+            finished = self.done.copy()
+            self.reset(finished)
+            return boards, rewards, finished
+        return boards, rewards, self.done
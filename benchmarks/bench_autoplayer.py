@@ -0,0 +1,87 @@
+"""Headless throughput benchmark for the autoplayer's placement search.
+
+Lets the AutoPlayer play seeded games on a TetrisEngine and reports
+placements scored per second, pieces per second and the slowest single
+decision, which has to stay well under the fastest gravity interval
+(0.1 s) for the bot to keep up in the live game. --table-size N searches
+with an N-entry transposition table (off by default) and reports its hit
+rate too.
+
+Usage: python benchmarks/bench_autoplayer.py [--games N] [--pieces P] [--width W] [--height H]
+           [--seed S] [--backend B] [--no-lookahead] [--table-size N]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the directory containing autoplayer.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autoplayer import AutoPlayer
+from engine import TetrisEngine
+from grid import GRID_BACKENDS
+
+FASTEST_DROP_SECONDS = 0.1  # Gravity interval of the top adjust_drop_speed level
+
+
+def run_benchmark(games=5, pieces=500, width=10, height=20, seed=0, backend='list', lookahead=True, table_size=0):
+    """Play `games` bot games of at most `pieces` pieces each and return a dict of throughput figures."""
+    player = AutoPlayer(lookahead=lookahead, table_size=table_size)
+    engine = TetrisEngine(width, height, backend=backend, seed=seed, policy='bag')
+    total_pieces = 0
+    total_lines = 0
+    slowest = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        engine.reset()
+        while not engine.game_over and engine.pieces_placed < pieces:
+            decision_start = time.perf_counter()
+            player.play_piece(engine)
+            slowest = max(slowest, time.perf_counter() - decision_start)
+        total_pieces += engine.pieces_placed
+        total_lines += engine.lines_cleared
+    elapsed = time.perf_counter() - start
+    return {
+        'games': games,
+        'board': f'{width}x{height}',
+        'backend': backend,
+        'lookahead': lookahead,
+        'pieces': total_pieces,
+        'lines': total_lines,
+        'placements': player.evaluations,
+        'seconds': elapsed,
+        'placements_per_sec': player.evaluations / elapsed,
+        'pieces_per_sec': total_pieces / elapsed,
+        'slowest_decision': slowest,
+        'table_hit_rate': player.table.hit_rate() if player.table else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--pieces', type=int, default=500, help='stop a game after this many pieces')
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=sorted(GRID_BACKENDS), default='list')
+    parser.add_argument('--no-lookahead', action='store_true', help='score placements of the current piece only')
+    parser.add_argument('--table-size', type=int, default=0, help='transposition table entries (0, the default, runs without one)')
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.games, args.pieces, args.width, args.height, args.seed, args.backend, not args.no_lookahead,
+                           args.table_size)
+    print(f"{result['backend']} board {result['board']}, lookahead {'on' if result['lookahead'] else 'off'}: "
+          f"{result['games']} games, {result['pieces']} pieces, {result['lines']} lines in {result['seconds']:.3f}s")
+    print(f"  placements scored: {result['placements']}")
+    print(f"  placements/sec: {result['placements_per_sec']:.0f}")
+    print(f"  pieces/sec: {result['pieces_per_sec']:.1f}")
+    print(f"  slowest decision: {result['slowest_decision'] * 1000:.2f} ms "
+          f"({result['slowest_decision'] / FASTEST_DROP_SECONDS:.1%} of the fastest drop interval)")
+    if result['table_hit_rate'] is not None:
+        print(f"  transposition table hit rate: {result['table_hit_rate']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Scaling benchmark for the vectorized multi-board environment.
+
+Steps BatchTetrisEnv with random (rotation, column) actions for a range of
+board counts and reports placements/sec, so the step cost can be checked
+for linear scaling in N.
+
+Usage: python benchmarks/bench_batch_env.py [--boards 1,64,1024,16384] [--steps N] [--seed S]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Add the directory containing batch_env.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_env import BatchTetrisEnv
+
+
+def run_benchmark(num_boards, steps=200, width=10, height=20, seed=0):
+    """Step `num_boards` boards `steps` times; return (seconds, placements/sec)."""
+    env = BatchTetrisEnv(num_boards, width, height, seed=seed, autoreset=True)
+    rng = np.random.default_rng(seed)
+    actions = np.stack([rng.integers(0, 4, (steps, num_boards)), rng.integers(0, width, (steps, num_boards))], axis=2)
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    elapsed = time.perf_counter() - start
+    return elapsed, num_boards * steps / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--boards', default='1,64,1024,16384')
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for num_boards in (int(n) for n in args.boards.split(',')):
+        elapsed, rate = run_benchmark(num_boards, args.steps, seed=args.seed)
+        print(f"N={num_boards:>6}: {elapsed * 1000 / args.steps:8.3f} ms/step  {rate:>12.0f} placements/sec")
+
+
+if __name__ == '__main__':
+    main()
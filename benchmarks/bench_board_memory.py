@@ -0,0 +1,78 @@
+"""Memory and copy cost of a board: piece-id buffer versus the previous lists of rows.
+
+The previous Grid kept two lists of row lists: 0/1 flags and an RGB tuple
+per cell. The current one keeps one byte per cell (a palette-indexed piece
+id). For each board size this reports the bytes allocated for the board
+contents of each layout (measured with tracemalloc), and the time to take
+a snapshot of the board (what the dirty-rect renderer does every frame)
+and to reset it.
+
+Usage: python benchmarks/bench_board_memory.py [--sizes 10x20,100x1000,1000x1000] [--repeats N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grid import Grid
+from tetromino import Tetromino
+
+
+def list_board(width, height):
+    """The previous layout, filled with colored blocks like a board in play."""
+    color = Tetromino.colors['T']
+    cells = [[1 for _ in range(width)] for _ in range(height)]
+    colors = [[color for _ in range(width)] for _ in range(height)]
+    return cells, colors
+
+
+def allocated(build):
+    """Bytes still allocated by the object build() returns."""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    board = build()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del board
+    return size
+
+
+def per_call(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10x20,100x1000,1000x1000')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for size in args.sizes.split(','):
+        width, height = (int(n) for n in size.split('x'))
+        before = allocated(lambda: list_board(width, height))
+        after = allocated(lambda: bytearray(width * height))  # Grid.cell_ids
+        counters = allocated(lambda: ([0] * height, [0] * width))  # row_counts and heights, both layouts now
+        print(f"{size:>10}: {before / 1024:>10.1f} KiB as lists of rows, {after / 1024:>8.1f} KiB as piece ids "
+              f"({before / after:.0f}x smaller; counters add {counters / 1024:.1f} KiB)")
+
+        cells, colors = list_board(width, height)
+        grid = Grid(width, height, load_sounds=False)
+        grid.cell_ids[:] = bytes([1]) * (width * height)
+        copy_lists = per_call(lambda: ([list(row) for row in cells], [list(row) for row in colors]), args.repeats)
+        copy_ids = per_call(grid.snapshot, args.repeats)
+        reset_lists = per_call(lambda: ([[0 for _ in range(width)] for _ in range(height)],
+                                        [[(0, 0, 0) for _ in range(width)] for _ in range(height)]), args.repeats)
+        reset_ids = per_call(grid.reset, args.repeats)
+        print(f"{'':>10}  snapshot {copy_lists * 1e6:>10.1f} us -> {copy_ids * 1e6:>8.2f} us   "
+              f"reset {reset_lists * 1e6:>10.1f} us -> {reset_ids * 1e6:>8.2f} us")
+
+
+if __name__ == '__main__':
+    main()
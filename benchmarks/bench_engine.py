@@ -0,0 +1,85 @@
+"""Headless throughput benchmark for the game rules.
+
+Plays random games on a TetrisEngine (no display, no mixer) and reports
+moves/sec and games/sec, so regressions in Grid.is_valid_position and
+Grid.place_tetromino show up as numbers.
+
+With --trace the run records into the ring buffer, to measure tracing
+overhead against the default (disabled) run.
+
+Usage: python benchmarks/bench_engine.py [--games N] [--width W] [--height H] [--seed S] [--backend B] [--trace]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the directory containing engine.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine import TetrisEngine, ACTIONS, DOWN
+from grid import GRID_BACKENDS
+from tracing import tracer
+
+
+def play_random_game(engine, rng, gravity_every=4, max_moves=100000):
+    """Play one game with random actions plus periodic gravity; return the number of moves."""
+    engine.reset()
+    moves = 0
+    while not engine.game_over and moves < max_moves:
+        engine.apply(rng.choice(ACTIONS))
+        moves += 1
+        if moves % gravity_every == 0 and not engine.game_over:
+            engine.apply(DOWN)
+            moves += 1
+    return moves
+
+
+def run_benchmark(games=200, width=10, height=20, seed=0, backend='list'):
+    """Play `games` random games and return a dict of throughput figures."""
+    rng = random.Random(seed)
+    total_moves = 0
+    total_pieces = 0
+    engine = TetrisEngine(width, height, backend=backend, seed=seed)  # Same seed, same pieces
+    start = time.perf_counter()
+    for _ in range(games):
+        total_moves += play_random_game(engine, rng)
+        total_pieces += engine.pieces_placed
+    elapsed = time.perf_counter() - start
+    return {
+        'games': games,
+        'board': f'{width}x{height}',
+        'backend': backend,
+        'moves': total_moves,
+        'pieces': total_pieces,
+        'seconds': elapsed,
+        'moves_per_sec': total_moves / elapsed,
+        'games_per_sec': games / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=sorted(GRID_BACKENDS), default='list')
+    parser.add_argument('--trace', action='store_true', help='record trace events while playing')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        tracer.enable()
+
+    result = run_benchmark(args.games, args.width, args.height, args.seed, args.backend)
+    print(f"{result['backend']} board {result['board']}: {result['games']} games, {result['moves']} moves, "
+          f"{result['pieces']} pieces in {result['seconds']:.3f}s")
+    print(f"  moves/sec: {result['moves_per_sec']:.0f}")
+    print(f"  games/sec: {result['games_per_sec']:.1f}")
+    if args.trace:
+        print(f"  trace events: {tracer.total}")
+
+
+if __name__ == '__main__':
+    main()
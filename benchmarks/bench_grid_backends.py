@@ -0,0 +1,176 @@
+"""Compare Grid storage backends on collision checks and lock/clear cycles.
+
+For each backend and board size this times Grid.is_valid_position over
+random positions on a half-filled board, and Grid.place_tetromino on a
+board where every other lock completes a row. The NumPy backend's batch
+valid_positions query is also compared with the equivalent single calls,
+and the skyline-based Grid.landing_row (hard drop and ghost piece) with
+stepping the piece down one collision check at a time. Finally lock cost
+is measured on boards of growing height (10x20 up to 10x1000) against the
+previous list-of-lists Grid that scanned every row and cleared with pop/insert.
+
+Usage: python benchmarks/bench_grid_backends.py [--sizes 10x20,64x128,256x512] [--heights 20,100,1000] [--checks N] [--locks N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import numpy as np
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from grid import GRID_BACKENDS, Grid, create_grid, piece_cells
+from tetromino import Tetromino
+
+
+def make_pieces():
+    """Return one tetromino per shape, without touching the global RNG."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [Tetromino(shape) for shape in Tetromino.shapes]
+
+
+def fill_lower_half(grid, rng):
+    """Randomly fill the lower half of the board, leaving one hole per row."""
+    cells = grid.get_state()
+    cells = [list(row) for row in cells]
+    for y in range(grid.height // 2, grid.height):
+        hole = rng.randrange(grid.width)
+        cells[y] = [0 if x == hole else 1 for x in range(grid.width)]
+    grid.grid = cells
+
+
+def bench_is_valid_position(backend, width, height, checks, seed):
+    rng = random.Random(seed)
+    grid = create_grid(width, height, backend=backend, load_sounds=False)
+    fill_lower_half(grid, rng)
+    pieces = make_pieces()
+    queries = [(rng.choice(pieces), [rng.randrange(height), rng.randrange(-1, width)]) for _ in range(checks)]
+    is_valid_position = grid.is_valid_position
+    start = time.perf_counter()
+    for piece, position in queries:
+        is_valid_position(piece, position)
+    return checks / (time.perf_counter() - start)
+
+
+def bench_place_and_clear(backend, width, height, locks, seed):
+    """Lock vertical I pieces along the floor so that rows fill and clear repeatedly."""
+    grid = create_grid(width, height, backend=backend, load_sounds=False)
+    piece = make_pieces()[0]
+    piece.rotation = 1  # Vertical I
+    start = time.perf_counter()
+    for i in range(locks):
+        grid.place_tetromino(piece, [height - 4, i % width], False)
+    return locks / (time.perf_counter() - start)
+
+
+class FullScanGrid(Grid):
+    """The list Grid as it was before row fill counters: lists of rows, and every lock scans all rows."""
+
+    def __init__(self, width, height, **kwargs):
+        super().__init__(width, height, **kwargs)
+        self.cell_rows = [[0 for _ in range(width)] for _ in range(height)]
+        self.color_rows = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]
+
+    def place_tetromino(self, tetromino, position, sound_effects_enabled=True):
+        color = tetromino.get_color()
+        for y, x in piece_cells(tetromino):
+            self.cell_rows[position[0] + y][position[1] + x] = 1
+            self.color_rows[position[0] + y][position[1] + x] = color
+        return self.clear_filled_rows(sound_effects_enabled)
+
+    def clear_filled_rows(self, sound_effects_enabled=True, rows=None):
+        filled_rows = [y for y in range(self.height) if all(self.cell_rows[y])]
+        for row in filled_rows:
+            self.cell_rows.pop(row)
+            self.cell_rows.insert(0, [0 for _ in range(self.width)])
+            self.color_rows.pop(row)
+            self.color_rows.insert(0, [(0, 0, 0) for _ in range(self.width)])
+        return len(filled_rows)
+
+
+def bench_lock_height(grid, locks):
+    """Locks per second on a board with a settled stack: vertical I pieces fill and clear the bottom rows."""
+    piece = make_pieces()[0]
+    piece.rotation = 1  # Vertical I
+    height = grid.height
+    start = time.perf_counter()
+    for i in range(locks):
+        grid.place_tetromino(piece, [height - 4, i % grid.width], False)
+    return locks / (time.perf_counter() - start)
+
+
+def bench_landing(width, height, checks, seed):
+    """Time landing rows from the spawn row: skyline lookup versus row-by-row scan."""
+    rng = random.Random(seed)
+    grid = create_grid(width, height, load_sounds=False)
+    fill_lower_half(grid, rng)
+    pieces = make_pieces()
+    queries = []
+    while len(queries) < checks:
+        piece = rng.choice(pieces)
+        position = (0, rng.randrange(width - 3))
+        if grid.is_valid_position(piece, position):
+            queries.append((piece, position))
+    results = []
+    for landing_row in (grid.landing_row, grid.scan_landing_row):
+        start = time.perf_counter()
+        for piece, position in queries:
+            landing_row(piece, position)
+        results.append(checks / (time.perf_counter() - start))
+    return results
+
+
+def bench_batch_query(width, height, repeats, seed):
+    """Time 40 placement queries via one valid_positions call versus 40 is_valid_position calls."""
+    rng = random.Random(seed)
+    grid = create_grid(width, height, backend='numpy', load_sounds=False)
+    fill_lower_half(grid, rng)
+    piece = make_pieces()[2]
+    positions = [(rotation, height // 2 - 2, col) for rotation in range(4) for col in range(10)]
+    position_array = np.array(positions)  # Bots build the candidate array once and reuse it
+    start = time.perf_counter()
+    for _ in range(repeats):
+        grid.valid_positions(piece, position_array)
+    batched = repeats / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for rotation, row, col in positions:
+            piece.rotation = rotation
+            grid.is_valid_position(piece, (row, col))
+    single = repeats / (time.perf_counter() - start)
+    return batched, single
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10x20,64x128,256x512')
+    parser.add_argument('--heights', default='20,100,1000')
+    parser.add_argument('--checks', type=int, default=50000)
+    parser.add_argument('--locks', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for size in args.sizes.split(','):
+        width, height = (int(n) for n in size.split('x'))
+        for backend in GRID_BACKENDS:
+            checks = bench_is_valid_position(backend, width, height, args.checks, args.seed)
+            locks = bench_place_and_clear(backend, width, height, args.locks, args.seed)
+            print(f"{size:>9} {backend:>9}: is_valid_position {checks:>10.0f}/s   place+clear {locks:>9.0f}/s")
+        skyline, scan = bench_landing(width, height, args.locks, args.seed)
+        print(f"{size:>9}      list: landing row {skyline:>10.0f}/s skyline vs {scan:>9.0f}/s scanning")
+        batched, single = bench_batch_query(width, height, args.locks, args.seed)
+        print(f"{size:>9}     numpy: 40-placement query {batched:>9.0f}/s batched vs {single:>9.0f}/s one by one")
+
+    for height in (int(n) for n in args.heights.split(',')):
+        rates = {backend: bench_lock_height(create_grid(10, height, backend=backend, load_sounds=False), args.locks)
+                 for backend in GRID_BACKENDS}
+        rates['full scan'] = bench_lock_height(FullScanGrid(10, height, load_sounds=False), args.locks)
+        print(f"{'10x' + str(height):>9} lock+clear: " + '   '.join(f"{name} {rate:>8.0f}/s" for name, rate in rates.items()))
+
+
+if __name__ == '__main__':
+    main()
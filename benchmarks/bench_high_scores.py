@@ -0,0 +1,75 @@
+"""High score store: startup and per-result cost with a long history.
+
+Fills a temporary store with N logged results, then times loading it
+(snapshot plus log tail) and the cost of recording one more result with
+the append-only log (on the calling thread and until the background writer
+has it on disk) against the previous approach of sorting the full list and
+rewriting the whole file.
+
+Usage: python benchmarks/bench_high_scores.py [--history N] [--inserts N]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from high_score_manager import HighScoreManager
+
+
+def rewrite_insert(path, scores, score):
+    """The previous scheme: append, sort everything and rewrite the file."""
+    scores.append((score, "2024-01-01 00:00:00"))
+    scores.sort(key=lambda x: x[0], reverse=True)
+    with open(path, 'w') as file:
+        json.dump(scores, file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--history', type=int, default=100_000)
+    parser.add_argument('--inserts', type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # The manager logs every result
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scores.json')
+        with open(path + '.log', 'w') as file:
+            for _ in range(args.history):
+                file.write(json.dumps([rng.randrange(100_000), "2024-01-01 00:00:00"]) + '\n')
+
+        start = time.perf_counter()
+        manager = HighScoreManager(path)
+        cold = time.perf_counter() - start
+        manager.compact()
+        manager.flush()
+        start = time.perf_counter()
+        manager = HighScoreManager(path)
+        warm = time.perf_counter() - start
+        print(f"startup, {args.history} results: {cold * 1e3:.1f} ms uncompacted, {warm * 1e3:.2f} ms compacted")
+
+        start = time.perf_counter()
+        for _ in range(args.inserts):
+            manager.add_high_score(rng.randrange(100_000), "2024-01-01 00:00:00")
+        append = (time.perf_counter() - start) / args.inserts
+        manager.flush()
+        flushed = (time.perf_counter() - start) / args.inserts
+
+        full = [(score, timestamp) for score, timestamp in manager.history()]
+        rewrite_path = os.path.join(directory, 'rewrite.json')
+        start = time.perf_counter()
+        for _ in range(args.inserts):
+            rewrite_insert(rewrite_path, full, rng.randrange(100_000))
+        rewrite = (time.perf_counter() - start) / args.inserts
+        print(f"per result: {append * 1e6:.1f} us on the game thread, {flushed * 1e6:.1f} us until durable "
+              f"({manager.writer.batches} writer batches); {rewrite * 1e6:.1f} us sort and rewrite")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""CPU usage of an idle game-over screen.
+
+Starts a game in a fresh interpreter, ends it, lets TetrisGame.run sit on
+the game-over screen with no input and reports the CPU time the process
+used as a percentage of one core over the measurement window.
+
+Usage: SDL_VIDEODRIVER=dummy python benchmarks/bench_idle.py [--seconds S]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = """
+import contextlib, io, os, sys, threading, time
+from unittest.mock import patch
+import pygame
+
+seconds = float(sys.argv[1])
+
+def measure():
+    time.sleep(0.5)  # Let the game reach the game-over screen
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    sys.__stdout__.write(f"{100 * cpu / wall:.1f}\\n")
+    sys.__stdout__.flush()
+    os._exit(0)
+
+with contextlib.redirect_stdout(io.StringIO()), patch('tetris_game.HighScoreManager'):
+    from tetris_game import TetrisGame
+    game = TetrisGame()
+    game.game_over = True
+    threading.Thread(target=measure, daemon=True).start()
+    game.run()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    output = subprocess.run([sys.executable, '-c', CHILD, str(args.seconds)], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    print(f"idle game-over screen: {output.strip().splitlines()[-1]}% of one core over {args.seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Cost of the frame profiler on the live loop.
+
+Runs TetrisGame.play_frame uncapped (every iteration renders) with the
+profiler off, timing only, and timing plus the on-screen overlay, and
+reports microseconds per frame for each.
+
+Usage: SDL_VIDEODRIVER=dummy python benchmarks/bench_profiler.py [--frames N] [--rounds R]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from unittest.mock import patch
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Add the directory containing tetris_game.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+
+def make_game():
+    from tetris_game import TetrisGame
+    with contextlib.redirect_stdout(io.StringIO()), patch.object(TetrisGame, 'play_background_music'), \
+            patch('tetris_game.HighScoreManager') as manager:
+        manager.return_value.high_scores = []
+        game = TetrisGame(uncapped=True, seed=1)
+    game.sound_effects_enabled = False
+    return game
+
+
+def bench_frames(game, frames):
+    """Return microseconds per play_frame call; pieces that lock restart the game."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(frames):
+            game.play_frame()
+            if game.game_over:
+                game.restart_game(seed=1)
+    return (time.perf_counter() - start) * 1e6 / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    game = make_game()
+    modes = {
+        'off': lambda: game.profiler.show_overlay(False),
+        'timing': lambda: game.profiler.enable(),
+        'overlay': lambda: game.profiler.show_overlay(True),
+    }
+    best = {}
+    for _ in range(args.rounds):  # Interleaved rounds so drift affects every mode alike
+        for mode, setup in modes.items():
+            game.profiler.always_on = False
+            setup()
+            best[mode] = min(best.get(mode, float('inf')), bench_frames(game, args.frames))
+    for mode, micros in best.items():
+        print(f"profiler {mode:8s}: {micros:8.2f} us/frame ({micros - best['off']:+.2f} us vs off)")
+
+
+if __name__ == '__main__':
+    main()
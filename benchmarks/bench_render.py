@@ -0,0 +1,83 @@
+"""Per-frame draw cost of the board and side panel.
+
+Times Grid.draw on half-filled boards of several sizes and the side panel
+(score plus both high score tables) under the dummy SDL video driver.
+
+Usage: SDL_VIDEODRIVER=dummy python benchmarks/bench_render.py [--sizes 10x20:30,100x200:4] [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from grid import Grid
+from tetromino import Tetromino
+
+
+def half_filled_grid(width, height, block_size, seed):
+    rng = random.Random(seed)
+    grid = Grid(width, height, block_size, load_sounds=False)
+    colors = list(Tetromino.colors.values())
+    for y in range(height // 2, height):
+        for x in range(width):
+            if rng.random() < 0.7:
+                grid.grid[y][x] = 1
+                grid.color_grid[y][x] = rng.choice(colors)
+    return grid
+
+
+def bench_grid_draw(width, height, block_size, frames, seed=0):
+    """Return milliseconds per Grid.draw call."""
+    grid = half_filled_grid(width, height, block_size, seed)
+    surface = pygame.Surface((width * block_size, height * block_size))
+    grid.draw(surface)  # Warm up (and build any caches)
+    start = time.perf_counter()
+    for _ in range(frames):
+        grid.draw(surface)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def bench_panel_draw(frames):
+    """Return milliseconds per TetrisGame.draw_panel call with full score tables."""
+    from tetris_game import TetrisGame
+    with patch.object(TetrisGame, 'play_background_music'), patch('tetris_game.HighScoreManager') as manager:
+        manager.return_value.load_high_scores.return_value = []
+        game = TetrisGame()
+    game.screen = pygame.Surface((game.screen_width, game.screen_height))
+    scores = [(1000 - i * 100, f'2024-01-0{i + 1} 12:00:00') for i in range(5)]
+    game.current_session_scores = list(scores)
+    game.all_time_high_scores = list(scores)
+    game.draw_panel()  # Warm up
+    start = time.perf_counter()
+    for _ in range(frames):
+        game.draw_panel()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10x20:30,100x200:4', help='WIDTHxHEIGHT:BLOCK_SIZE list')
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for size in args.sizes.split(','):
+        dimensions, block_size = size.split(':')
+        width, height = (int(n) for n in dimensions.split('x'))
+        milliseconds = bench_grid_draw(width, height, int(block_size), args.frames)
+        print(f"Grid.draw {dimensions:>8} @ {block_size:>2}px: {milliseconds:8.3f} ms/frame ({1000 / milliseconds:.0f} full redraws/s)")
+    print(f"draw_panel              : {bench_panel_draw(args.frames):8.3f} ms/frame")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Startup time: from launching main.py to the first frame on screen.
+
+Each run starts a fresh interpreter that performs main.py's setup, renders
+and pushes the first frame, and reports the elapsed time. The asset decode
+times of the run are printed once the background preload has finished.
+
+Usage: SDL_VIDEODRIVER=dummy python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Mirrors main.py up to the first display update
+CHILD = """
+import time
+start = time.perf_counter()
+import contextlib, io, json
+import pygame
+with contextlib.redirect_stdout(io.StringIO()):
+    from tetris_game import TetrisGame
+    pygame.init()
+    pygame.mixer.init()
+    game = TetrisGame()
+    pygame.display.update(game.renderer.render())
+first_frame = time.perf_counter() - start
+game.assets.wait()
+print(json.dumps({'first_frame': first_frame, 'assets': game.assets.report()}))
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    times = [result['first_frame'] * 1000 for result in results]
+    print(f"first frame: median {statistics.median(times):.1f} ms, min {min(times):.1f} ms over {args.runs} runs")
+    print("asset load times (last run):")
+    for line in results[-1]['assets']:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
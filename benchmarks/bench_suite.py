@@ -0,0 +1,274 @@
+"""Benchmark suite for the grid, piece and render hot paths, with regression checks.
+
+Times Grid.is_valid_position, Grid.place_tetromino, Grid.clear_filled_rows,
+Tetromino.rotate, Grid.draw, the two score tables and a full scripted game
+(played through ReplayRunner, so input, gravity and rendering all run) on
+several board sizes. Every metric is microseconds per call, the best of
+--repeats interleaved rounds, so lower is better.
+
+Results are compared with a stored JSON baseline and the run exits with
+status 1 if any metric is slower than the baseline by more than
+--threshold (a fraction, 0.25 = 25%) and by more than --min-delta
+microseconds, so a few-microsecond metric needs more than a noisy
+stretch of the machine to fail the run; metrics over the threshold are
+measured again before they count. --save writes the results as the
+new baseline instead. Baselines are only comparable on the machine that
+produced them; regenerate it after hardware or Python changes.
+
+Usage: SDL_VIDEODRIVER=dummy SDL_AUDIODRIVER=dummy python benchmarks/bench_suite.py
+           [--sizes 10x20:30,100x200:4] [--repeats N] [--threshold F] [--min-delta US] [--baseline FILE] [--save] [--output FILE]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from unittest.mock import patch
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# Add the directory containing grid.py to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from grid import Grid
+from bench_grid_backends import make_pieces, fill_lower_half
+from bench_render import half_filled_grid
+from bench_profiler import make_game
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = '10x20:30,100x200:4'
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown against the baseline before a metric counts as a regression
+DEFAULT_MIN_DELTA = 2.0  # Microseconds a metric must also lose; run-to-run noise on few-microsecond metrics is about 1 us
+SCRIPT_KEYS = (pygame.K_LEFT, pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT, pygame.K_SPACE,
+               pygame.K_RIGHT, pygame.K_UP, pygame.K_RIGHT, pygame.K_SPACE)  # Keys of the scripted game, in turn
+
+
+def per_call(run, calls):
+    """Microseconds per call of run(calls), which performs `calls` calls, with the GC paused like timeit."""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run(calls)
+        return (time.perf_counter() - start) * 1e6 / calls
+    finally:
+        gc.enable()
+
+
+def bench_is_valid_position(width, height, calls, seed=0):
+    rng = random.Random(seed)
+    grid = Grid(width, height, load_sounds=False)
+    fill_lower_half(grid, rng)
+    pieces = make_pieces()
+    queries = [(rng.choice(pieces), [rng.randrange(height), rng.randrange(-1, width)]) for _ in range(calls)]
+    is_valid_position = grid.is_valid_position
+
+    def run(calls):
+        for piece, position in queries:
+            is_valid_position(piece, position)
+    return per_call(run, calls)
+
+
+def bench_place_tetromino(width, height, calls):
+    """Lock vertical I pieces along the floor so that rows fill and clear repeatedly."""
+    grid = Grid(width, height, load_sounds=False)
+    piece = make_pieces()[0]
+    piece.rotation = 1  # Vertical I
+
+    def run(calls):
+        for i in range(calls):
+            grid.place_tetromino(piece, [height - 4, i % width], False)
+    return per_call(run, calls)
+
+
+def bench_clear_filled_rows(width, height, calls, batch=50):
+    """Clear four full rows under a half-filled board, as a lock does.
+
+    A clear takes a few microseconds, so it is timed over `batch` boards
+    filled beforehand, one timer read per batch, and the fastest batch
+    counts, like the best of the rounds in run_suite; refilling is not
+    timed.
+    """
+    board = bytearray(half_filled_grid(width, height, 1, seed=0).cell_ids)
+    board[-4 * width:] = bytes([1]) * (4 * width)
+    grids = [Grid(width, height, 1, load_sounds=False) for _ in range(batch)]
+    rows = list(range(height - 4, height))  # The rows the last lock touched
+    fastest = float('inf')
+    gc.disable()
+    try:
+        for _ in range(max(1, calls // batch)):
+            for grid in grids:
+                grid.cell_ids[:] = board
+                grid.refresh_counters()
+            start = time.perf_counter()
+            for grid in grids:
+                grid.clear_filled_rows(False, rows)
+            fastest = min(fastest, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return fastest * 1e6 / batch
+
+
+def bench_rotate(width, height, calls, seed=0):
+    grid = Grid(width, height, load_sounds=False)
+    fill_lower_half(grid, random.Random(seed))
+    state = grid.get_state()
+    pieces = make_pieces()
+    position = [height // 2 - 4, width // 2 - 1]  # Just above the filled half: rotations near the stack
+
+    def run(calls):
+        for i in range(calls):
+            pieces[i % len(pieces)].rotate(state, position)
+    return per_call(run, calls)
+
+
+def bench_grid_draw(width, height, block_size, calls):
+    grid = half_filled_grid(width, height, block_size, seed=0)
+    surface = pygame.Surface((width * block_size, height * block_size))
+    grid.draw(surface)  # Warm up (and build any caches)
+
+    def run(calls):
+        for _ in range(calls):
+            grid.draw(surface)
+    return per_call(run, calls)
+
+
+def bench_score_tables(game, calls):
+    """Both high score tables with five entries each, as drawn on a panel repaint."""
+    scores = [(1000 - i * 100, f'2024-01-0{i + 1} 12:00:00') for i in range(5)]
+    game.current_session_scores = list(scores)
+    game.all_time_high_scores = list(scores)
+    game.draw_high_score_table(60)  # Warm up the layer and text caches
+
+    def run(calls):
+        for _ in range(calls):
+            game.draw_high_score_table(60)
+            game.draw_high_scores(300)
+    return per_call(run, calls)
+
+
+def scripted_record(width, height, inputs=400, every=6, seed=7):
+    """A replay record pressing SCRIPT_KEYS in turn every `every` logic ticks."""
+    events = [(index * every, SCRIPT_KEYS[index % len(SCRIPT_KEYS)]) for index in range(1, inputs + 1)]
+    return {'seed': seed, 'policy': 'bag', 'width': width, 'height': height, 'events': events,
+            'ticks': inputs * every + every, 'score': None}
+
+
+def bench_scripted_game(width, height, calls):
+    """Microseconds per scripted game: logic, input and rendering of every frame it draws."""
+    from replay import ReplayRunner
+    from tetris_game import TetrisGame
+    record = scripted_record(width, height)
+    elapsed = 0
+    with contextlib.redirect_stdout(io.StringIO()), patch.object(TetrisGame, 'play_background_music'):
+        for _ in range(calls):
+            runner = ReplayRunner(record)
+            start = time.perf_counter()
+            runner.run()
+            elapsed += time.perf_counter() - start
+    return elapsed * 1e6 / calls
+
+
+def suite_cases(sizes, scale=1):
+    """Return {metric: callable returning microseconds per call}.
+
+    The scripted game always runs on the standard 10x20 board: the game
+    window is sized for 30 pixel blocks.
+    """
+    game = make_game()
+    cases = {'game.scripted[10x20]': lambda: bench_scripted_game(10, 20, scale)}
+    for width, height, block_size in sizes:
+        board = f'{width}x{height}'
+        cases[f'grid.is_valid_position[{board}]'] = lambda w=width, h=height: bench_is_valid_position(w, h, 100000 * scale)
+        cases[f'grid.place_tetromino[{board}]'] = lambda w=width, h=height: bench_place_tetromino(w, h, 20000 * scale)
+        cases[f'grid.clear_filled_rows[{board}]'] = lambda w=width, h=height: bench_clear_filled_rows(w, h, 2000 * scale)
+        cases[f'tetromino.rotate[{board}]'] = lambda w=width, h=height: bench_rotate(w, h, 50000 * scale)
+        cases[f'grid.draw[{board}@{block_size}px]'] = lambda w=width, h=height, b=block_size: bench_grid_draw(w, h, b, 100 * scale)
+    cases['panel.score_tables'] = lambda: bench_score_tables(game, 200 * scale)
+    return cases
+
+
+def run_suite(cases, repeats, best=None):
+    """Return {metric: microseconds per call}, the best of `repeats` rounds (and of `best`, if given)."""
+    best = dict(best or {})
+    for _ in range(repeats):  # Interleaved rounds, so a slow stretch of the machine hits every metric once at most
+        for name, case in cases.items():
+            best[name] = min(best.get(name, float('inf')), case())
+    return best
+
+
+def compare(results, baseline, threshold, min_delta=0.0):
+    """Return (name, baseline, current, change) for every regressed metric.
+
+    A metric regressed when it is slower than its baseline by more than
+    threshold (a fraction) and by more than min_delta microseconds.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current > previous * (1 + threshold) and current - previous > min_delta:
+            regressions.append((name, previous, current, current / previous - 1))
+    return regressions
+
+
+def parse_sizes(text):
+    sizes = []
+    for size in text.split(','):
+        dimensions, block_size = size.split(':')
+        width, height = (int(n) for n in dimensions.split('x'))
+        sizes.append((width, height, int(block_size)))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='WIDTHxHEIGHT:BLOCK_SIZE list')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=1, help='multiply the calls per run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA, help='smallest slowdown in us that counts')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.ERROR)  # Keep missing-asset warnings out of the report
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    cases = suite_cases(parse_sizes(args.sizes), args.scale)
+    results = run_suite(cases, args.repeats)
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)['metrics']
+        # A regression has to survive a second set of rounds, so one noisy stretch does not fail the run
+        suspects = {name: cases[name] for name, *_ in compare(results, baseline, args.threshold, args.min_delta)}
+        results.update(run_suite(suspects, args.repeats, results))
+    report = {'machine': platform.platform(), 'python': platform.python_version(), 'unit': 'us/call', 'metrics': results}
+    for path in filter(None, [args.output, args.baseline if args.save else None]):
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+        change = f"{current / previous - 1:+7.1%}" if previous else '    new'
+        print(f"{name:36s} {current:12.2f} us  {change}")
+    if args.save:
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    for name, previous, current, change in regressions:
+        print(f"REGRESSION {name}: {previous:.2f} -> {current:.2f} us ({change:+.1%}, threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
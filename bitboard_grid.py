@@ -0,0 +1,154 @@
+import logging
+from grid import Grid, compact_rows
+from tetromino import Tetromino, ROTATIONS
+
+# Per-shape row masks, keyed by the shape matrix as a tuple of tuples
+_mask_cache = {}
+# Fast path keyed by id(shape); entries keep the shape alive so ids are not reused
+_identity_cache = {}
+_IDENTITY_CACHE_SIZE = 1024
+
+
+def shape_masks(shape):
+    """Return (row_masks, left, right) for a shape matrix.
+
+    row_masks is a tuple of (dy, mask) for every non-empty row, where bit x of
+    mask is set when column x of that row is a block. left and right are the
+    first and last occupied columns.
+    """
+    entry = _identity_cache.get(id(shape))
+    if entry is not None and entry[0] is shape:
+        return entry[1]
+    key = tuple(map(tuple, shape))
+    masks = _mask_cache.get(key)
+    if masks is None:
+        row_masks = []
+        columns = []
+        for dy, row in enumerate(key):
+            mask = 0
+            for x, block in enumerate(row):
+                if block:
+                    mask |= 1 << x
+                    columns.append(x)
+            if mask:
+                row_masks.append((dy, mask))
+        masks = (tuple(row_masks), min(columns, default=0), max(columns, default=-1))
+        _mask_cache[key] = masks
+    if len(_identity_cache) >= _IDENTITY_CACHE_SIZE:
+        _identity_cache.clear()
+    _identity_cache[id(shape)] = (shape, masks)
+    return masks
+
+
+# Row masks of every precomputed rotation: ROTATION_MASKS[shape][rotation]
+ROTATION_MASKS = {name: tuple(shape_masks(state.matrix) for state in states) for name, states in ROTATIONS.items()}
+
+
+def piece_masks(tetromino):
+    """Return (row_masks, left, right) for a tetromino's current orientation."""
+    if isinstance(tetromino, Tetromino):
+        return ROTATION_MASKS[tetromino.shape][tetromino.rotation]
+    return shape_masks(tetromino.get_shape())
+
+
+class BitboardGrid(Grid):
+    """Grid backend that stores each row as an integer bitmask.
+
+    Bit x of self.rows[y] is set when cell (x, y) is filled. Collision is a
+    few AND operations per piece, a full row is a compare against a constant
+    and clears are list slicing. Colors stay in the inherited cell_ids
+    buffer, which mirrors the rows, so grid and color_grid are the
+    inherited views of it; writes through them set the row bits too.
+    """
+
+    def __init__(self, width=10, height=20, block_size=30, load_sounds=True):
+        self.full_row = (1 << width) - 1
+        self.rows = [0] * height
+        super().__init__(width, height, block_size, load_sounds)
+
+    @Grid.grid.setter
+    def grid(self, cells):
+        cells = [list(row) for row in cells]
+        self.rows = [sum(1 << x for x, block in enumerate(row) if block) for row in cells]
+        self.match_occupancy(cells)
+
+    def write_cell(self, index, value, color=False):
+        super().write_cell(index, value, color)
+        if not color:
+            y, x = divmod(index, self.width)
+            if value:
+                self.rows[y] |= 1 << x
+            else:
+                self.rows[y] &= ~(1 << x)
+
+    def reset(self):
+        self.rows = [0] * self.height
+        super().reset()
+
+    def refresh_row_counts(self):
+        self.row_counts = [bin(row).count('1') for row in self.rows]
+
+    def refresh_heights(self):
+        height = self.height
+        heights = [0] * self.width
+        seen = 0
+        for y, row in enumerate(self.rows):
+            new = row & ~seen  # Columns whose first block is in this row
+            seen |= row
+            while new:
+                low_bit = new & -new
+                heights[low_bit.bit_length() - 1] = height - y
+                new ^= low_bit
+        self.heights = heights
+
+    def is_full(self):
+        return self.rows[0] != 0  # Check if the top row is filled
+
+    def is_valid_position(self, tetromino, position):
+        row_masks, left, right = piece_masks(tetromino)
+        top, col = position
+        if col + left < 0 or col + right >= self.width:
+            return False  # Out of bounds horizontally
+        rows = self.rows
+        height = self.height
+        for dy, mask in row_masks:
+            y = top + dy
+            if y >= height:
+                return False  # Below the floor
+            if y >= 0 and rows[y] & (mask << col if col >= 0 else mask >> -col):
+                return False  # Overlapping with another tetromino
+        return True
+
+    def _lock_cells(self, tetromino, position):
+        row_masks, left, right = piece_masks(tetromino)
+        top, col = position
+        if col + left < 0 or col + right >= self.width:
+            return False
+        for dy, _ in row_masks:
+            if not 0 <= top + dy < self.height:
+                return False
+        piece_id = self.piece_id(tetromino)  # Stores the color
+        cell_ids = self.cell_ids
+        width = self.width
+        for dy, mask in row_masks:
+            y = top + dy
+            shifted = mask << col if col >= 0 else mask >> -col
+            self.rows[y] |= shifted
+            start = y * width - 1
+            while shifted:
+                low_bit = shifted & -shifted
+                cell_ids[start + low_bit.bit_length()] = piece_id
+                shifted ^= low_bit
+        return True
+
+    def check_filled_rows(self):
+        full_row = self.full_row
+        filled_rows = [y for y, row in enumerate(self.rows) if row == full_row]
+        logging.debug("check_filled_rows: Filled rows detected: %s", filled_rows)  # Log for filled rows
+        return filled_rows
+
+    def _remove_rows(self, rows):
+        if not rows:
+            return
+        compact_rows(self.rows, rows, int)
+        super()._remove_rows(rows)  # The piece ids
@@ -0,0 +1,173 @@
+import logging
+from grid import create_grid
+from tetromino import Tetromino
+from pieces import PieceQueue
+from tracing import tracer
+
+# Actions understood by TetrisEngine.apply
+LEFT = 'left'
+RIGHT = 'right'
+DOWN = 'down'
+ROTATE = 'rotate'
+HARD_DROP = 'hard_drop'
+ACTIONS = (LEFT, RIGHT, DOWN, ROTATE)  # The random-play action set; apply also accepts HARD_DROP
+
+POINTS_PER_ROW = 100  # Score awarded for each cleared row
+
+
+class TetrisEngine:
+    """Pure game rules: board, active piece, gravity, scoring and game over.
+
+    The engine never touches the display or the mixer, so it can be stepped
+    headless. TetrisGame wraps one engine and adds rendering, sound and input.
+    Pieces come from a seeded PieceQueue unless another tetromino_factory is
+    given, so the same seed and the same actions replay the same game.
+    """
+
+    def __init__(self, width=10, height=20, grid=None, tetromino_factory=None, backend='list', seed=None, policy='uniform'):
+        if grid is None:
+            grid = create_grid(width, height, backend=backend, load_sounds=False)
+        if tetromino_factory is None:
+            tetromino_factory = PieceQueue(seed, policy)
+        self.grid = grid
+        self.tetromino_factory = tetromino_factory
+        self.score = 0
+        self.game_over = False
+        self.pieces_placed = 0
+        self.lines_cleared = 0
+        self.current_tetromino = None
+        self.tetromino_position = None
+        self.spawn_tetromino()
+
+    def spawn_position(self):
+        """Return the spawn position of a new tetromino as [row, column]."""
+        return [0, self.grid.width // 2 - 1]
+
+    def spawn_tetromino(self):
+        """Create a new active tetromino at the top of the grid."""
+        self.current_tetromino = self.tetromino_factory()
+        self.tetromino_position = self.spawn_position()
+
+    def reset(self, seed=None):
+        """Reset the engine for a new game (with the piece sequence of `seed`, if given)."""
+        if isinstance(self.tetromino_factory, PieceQueue):
+            self.tetromino_factory.reset(seed)
+        self.grid.reset()
+        self.score = 0
+        self.game_over = False
+        self.pieces_placed = 0
+        self.lines_cleared = 0
+        self.spawn_tetromino()
+
+    def try_move(self, dx, dy):
+        """Move the active tetromino if the target position is free.
+
+        Returns True if the tetromino moved.
+        """
+        new_position = [self.tetromino_position[0] + dy, self.tetromino_position[1] + dx]
+        if self.grid.is_valid_position(self.current_tetromino, new_position):
+            self.tetromino_position = new_position
+            return True
+        return False
+
+    def move_tetromino(self, dx, dy, sound_effects_enabled=False):
+        """Move the active tetromino; a blocked downward move locks it.
+
+        Returns True if the tetromino moved.
+        """
+        if self.try_move(dx, dy):
+            return True
+        if dy == 1:  # If moving down and collision occurs, place the tetromino
+            self.place_current_tetromino(sound_effects_enabled)
+        return False
+
+    def gravity(self, sound_effects_enabled=False):
+        """Advance the active tetromino by one gravity step."""
+        return self.move_tetromino(0, 1, sound_effects_enabled)
+
+    def landing_position(self):
+        """Return the [row, column] where the active tetromino would land if dropped now."""
+        top, left = self.tetromino_position
+        return [self.grid.landing_row(self.current_tetromino, (top, left)), left]
+
+    def hard_drop(self, sound_effects_enabled=False):
+        """Drop the active tetromino straight to its landing row and lock it.
+
+        Returns the number of rows cleared.
+        """
+        landing = self.landing_position()
+        if tracer.enabled:
+            tracer.instant('hard_drop', 'engine', {'rows': landing[0] - self.tetromino_position[0]})
+        self.tetromino_position = landing
+        return self.place_current_tetromino(sound_effects_enabled)
+
+    def rotate_tetromino(self):
+        """Rotate the active tetromino, reverting if the result collides."""
+        tetromino = self.current_tetromino
+        if isinstance(tetromino, Tetromino):
+            # Table-driven pieces: try the next rotation index directly against the grid
+            rotation = tetromino.rotation
+            tetromino.rotation = (rotation + 1) % 4
+            if self.tetromino_position[0] >= 0 and self.grid.is_valid_position(tetromino, self.tetromino_position):
+                if tracer.enabled:
+                    tracer.instant('rotate', 'engine', {'shape': tetromino.shape, 'rotation': tetromino.rotation})
+                return True
+            tetromino.rotation = rotation
+            if tracer.enabled:
+                tracer.instant('rotate_blocked', 'engine', {'position': list(self.tetromino_position)})
+            return False
+        original_shape = tetromino.current_shape  # Backup the original shape
+        if not tetromino.rotate(self.grid.get_state(), self.tetromino_position):
+            return False
+        if not self.grid.is_valid_position(tetromino, self.tetromino_position):
+            tetromino.current_shape = original_shape
+            return False
+        return True
+
+    def place_current_tetromino(self, sound_effects_enabled=False):
+        """Lock the active tetromino, score cleared rows and spawn the next one.
+
+        Returns the number of rows cleared.
+        """
+        start = tracer.now() if tracer.enabled else 0
+        filled_rows = self.grid.place_tetromino(self.current_tetromino, self.tetromino_position, sound_effects_enabled)
+        if tracer.enabled:
+            tracer.complete('lock', start, 'engine', {'position': list(self.tetromino_position), 'rows': filled_rows})
+        if filled_rows > 0:
+            if tracer.enabled:
+                tracer.instant('clear', 'engine', {'rows': filled_rows})
+            self.update_score(filled_rows)
+        self.pieces_placed += 1
+        self.lines_cleared += filled_rows
+
+        self.spawn_tetromino()
+        if self.check_game_over():
+            self.game_over = True
+            if tracer.enabled:
+                tracer.instant('game_over', 'engine', {'score': self.score})
+        return filled_rows
+
+    def update_score(self, filled_rows):
+        """Increment the score by 100 for each row cleared."""
+        self.score += filled_rows * POINTS_PER_ROW
+
+    def check_game_over(self):
+        """Check if the game is over (i.e., if a new tetromino collides on spawn)."""
+        if not self.grid.is_valid_position(self.current_tetromino, self.tetromino_position):
+            logging.debug("Game Over: New tetromino cannot be placed.")
+            return True
+        return False
+
+    def apply(self, action):
+        """Apply one player action (LEFT, RIGHT, DOWN, ROTATE or HARD_DROP)."""
+        if action == LEFT:
+            return self.move_tetromino(-1, 0)
+        if action == RIGHT:
+            return self.move_tetromino(1, 0)
+        if action == DOWN:
+            return self.move_tetromino(0, 1)
+        if action == ROTATE:
+            return self.rotate_tetromino()
+        if action == HARD_DROP:
+            return self.hard_drop()
+        raise ValueError(f"Unknown action: {action}")
@@ -1,88 +1,577 @@
 import pygame
-import os
 import logging
+import importlib
+import random
+import numpy as np
+from collections import namedtuple
+from tetromino import Tetromino, ROTATIONS, matrix_cells
+from layers import LayerCache
+from assets import get_asset_manager, PLACE_SOUND, ROW_CLEAR_SOUND, GAME_OVER_SOUND
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Piece ids stored in the board: 0 is empty, shapes are numbered in Tetromino.shapes order
+SHAPE_IDS = {name: index + 1 for index, name in enumerate(Tetromino.shapes)}
+EMPTY_COLOR = (0, 0, 0)
+BLOCK_ID = len(SHAPE_IDS) + 1  # A filled cell written without a color (drawn black, like the old default)
+# Palette every board starts from: piece id -> color; colors of other pieces are appended on first use
+PALETTE = (EMPTY_COLOR,) + tuple(Tetromino.colors[name] for name in SHAPE_IDS) + (EMPTY_COLOR,)
+MAX_PIECE_IDS = 256  # Ids are stored in one byte per cell
+EMPTY_KEY = (255, 0, 254)  # Color of empty cells in the 8-bit cell surface, made transparent by colorkey
+
+ZOBRIST_SEED = 'tetris-zobrist'  # Seeds the keys, so a board hashes the same in every process
+_zobrist_cache = {}  # (width, height) -> ZobristKeys
+
+# Keys of the board hash for one board size: a random key per column, `bits` wide, the key of every cell,
+# cells[y * width + x], which is columns[x] rotated left by y bits, and the combined key of each full row
+ZobristKeys = namedtuple('ZobristKeys', ['columns', 'cells', 'full_rows', 'bits'])
+
+# Board storage backends selectable through create_grid: name -> (module, class)
+GRID_BACKENDS = {
+    'list': ('grid', 'Grid'),
+    'bitboard': ('bitboard_grid', 'BitboardGrid'),
+    'numpy': ('numpy_grid', 'NumpyGrid'),
+}
+
+
+def create_grid(width=10, height=20, block_size=30, backend='list', **kwargs):
+    """Create a grid using the named storage backend (see GRID_BACKENDS)."""
+    try:
+        module_name, class_name = GRID_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown grid backend: {backend}. Choose from {sorted(GRID_BACKENDS)}")
+    grid_class = getattr(importlib.import_module(module_name), class_name)
+    return grid_class(width, height, block_size, **kwargs)
+
+
+def zobrist_keys(width, height):
+    """Return the ZobristKeys of a width x height board, created once per size."""
+    keys = _zobrist_cache.get((width, height))
+    if keys is None:
+        bits = 64 * -(-height // 64)  # At least one bit per row, so no two rows rotate a key alike
+        rng = random.Random(f'{ZOBRIST_SEED}:{width}x{height}')
+        columns = tuple(rng.getrandbits(bits) for _ in range(width))
+        cells = tuple(rotate_key(columns[x], y, bits) for y in range(height) for x in range(width))
+        full_row = mask_hash(columns, 0, (1 << width) - 1)
+        full_rows = tuple(rotate_key(full_row, y, bits) for y in range(height))
+        keys = _zobrist_cache[(width, height)] = ZobristKeys(columns, cells, full_rows, bits)
+    return keys
+
+
+def rotate_key(key, shift, bits):
+    """Rotate a `bits` wide key left by `shift` bits (0 <= shift < bits)."""
+    return ((key << shift) | (key >> (bits - shift))) & ((1 << bits) - 1)
+
+
+def mask_hash(keys, start, mask):
+    """XOR of keys[start + x] for every set bit x of a row mask."""
+    result = 0
+    while mask:
+        low_bit = mask & -mask
+        result ^= keys[start + low_bit.bit_length() - 1]
+        mask ^= low_bit
+    return result
+
+
+def cleared_hash(board_hash, row_hash, rows, top, keys):
+    """Return the board hash after removing the full `rows` (ascending) and dropping the rows above them.
+
+    row_hash(y) is the XOR of the column keys of row y before the clear,
+    and top the highest non-empty row. A row at y adds its row hash
+    rotated by y, so all rows above the first cleared one, which drop by
+    the number cleared, change by their combined key rotated once; that
+    key is read off whichever side of the first cleared row has fewer
+    rows. Only the rows between cleared rows are re-keyed one by one.
+    """
+    full_rows = keys.full_rows
+    bits = keys.bits
+    height = len(full_rows)
+    cleared = len(rows)
+    first = rows[0]
+    for y in rows:
+        board_hash ^= full_rows[y]
+    if first - top <= height - first:
+        above, scanned = 0, range(top, first)
+    else:
+        above, scanned = board_hash, range(first + 1, height)  # The whole board minus the rows below
+    for y in scanned:
+        if y not in rows:
+            above ^= rotate_key(row_hash(y), y, bits)
+    board_hash ^= above ^ rotate_key(above, cleared, bits)
+    for index, y in enumerate(rows[:-1]):
+        drop = cleared - index - 1  # Rows between this and the next cleared row drop by the clears below them
+        for between in range(y + 1, rows[index + 1]):
+            key = row_hash(between)
+            board_hash ^= rotate_key(key, between, bits) ^ rotate_key(key, between + drop, bits)
+    return board_hash
+
+
+def piece_cells(tetromino):
+    """Return the (dy, dx) block offsets of a tetromino.
+
+    Tetromino instances read them from the precomputed rotation tables; any
+    other object exposing get_shape() has them derived from its matrix.
+    """
+    if isinstance(tetromino, Tetromino):
+        return tetromino.get_cells()
+    return matrix_cells(tetromino.get_shape())
+
+
+def cells_profile(cells):
+    """Return (dx, top_dy, bottom_dy) for every column covered by the given block offsets."""
+    columns = {}
+    for y, x in cells:
+        top, bottom = columns.get(x, (y, y))
+        columns[x] = (min(top, y), max(bottom, y))
+    return tuple((x, top, bottom) for x, (top, bottom) in sorted(columns.items()))
+
+
+def compact_rows(plane, rows, empty_row):
+    """Remove `rows` (ascending indices) from a list of rows and add as many empty rows on top.
+
+    Deleting moves only the rows below each cleared row (few: clears happen
+    near the piece) and the empty rows go in with a single insertion, a
+    pointer memmove. No row is inspected or copied, so the Python-level
+    work does not grow with the board height. empty_row() creates one new row.
+    """
+    for y in reversed(rows):
+        del plane[y]
+    plane[:0] = [empty_row() for _ in rows]
+
+
+# Column profiles of every precomputed rotation: ROTATION_PROFILES[shape][rotation]
+ROTATION_PROFILES = {name: tuple(cells_profile(state.cells) for state in states) for name, states in ROTATIONS.items()}
+
+
+def piece_profile(tetromino):
+    """Return the (dx, top_dy, bottom_dy) column profile of a tetromino's current orientation."""
+    if isinstance(tetromino, Tetromino):
+        return ROTATION_PROFILES[tetromino.shape][tetromino.rotation]
+    return cells_profile(piece_cells(tetromino))
+
+
+class CellRow:
+    """One board row as a mutable sequence of occupancy flags (0/1) or of colors.
+
+    Reads and writes go straight to the board's cell_ids buffer, so code
+    that indexes grid[y][x] or color_grid[y][x] keeps working.
+    """
+    __slots__ = ('board', 'start', 'colors')
+
+    def __init__(self, board, y, colors):
+        self.board = board
+        self.start = y * board.width
+        self.colors = colors
+
+    def __len__(self):
+        return self.board.width
+
+    def tolist(self):
+        ids = self.board.cell_ids[self.start:self.start + self.board.width]
+        if self.colors:
+            palette = self.board.palette
+            return [palette[piece_id] for piece_id in ids]
+        return [1 if piece_id else 0 for piece_id in ids]
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return self.tolist()[x]
+        width = self.board.width
+        if x < 0:
+            x += width
+        if not 0 <= x < width:
+            raise IndexError('row index out of range')
+        piece_id = self.board.cell_ids[self.start + x]
+        if self.colors:
+            return self.board.palette[piece_id]
+        return 1 if piece_id else 0
+
+    def __setitem__(self, x, value):
+        if isinstance(x, slice):
+            for index, item in zip(range(*x.indices(self.board.width)), value):
+                self[index] = item
+            return
+        width = self.board.width
+        if x < 0:
+            x += width
+        if not 0 <= x < width:
+            raise IndexError('row assignment index out of range')
+        self.board.write_cell(self.start + x, value, self.colors)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        try:
+            return self.tolist() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+class CellPlane:
+    """The board as a list-like of CellRows: occupancy (grid) or colors (color_grid)."""
+    __slots__ = ('board', 'colors')
+
+    def __init__(self, board, colors):
+        self.board = board
+        self.colors = colors
+
+    def __len__(self):
+        return self.board.height
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [CellRow(self.board, index, self.colors) for index in range(*y.indices(self.board.height))]
+        if y < 0:
+            y += self.board.height
+        if not 0 <= y < self.board.height:
+            raise IndexError('grid index out of range')
+        return CellRow(self.board, y, self.colors)
+
+    def __setitem__(self, y, values):
+        row = self[y]
+        for x, value in enumerate(values):
+            row[x] = value
+
+    def __iter__(self):
+        return (CellRow(self.board, y, self.colors) for y in range(self.board.height))
+
+    def tolist(self):
+        return [row.tolist() for row in self]
+
+    def __eq__(self, other):
+        try:
+            return self.tolist() == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
 class Grid:
-    def __init__(self, width=10, height=20, block_size=30):
+    """Board of width x height cells with collision, locking and line clears.
+
+    Each cell holds a one-byte piece id in self.cell_ids (row-major, 0 =
+    empty) that self.palette maps to a color, so occupancy and color share
+    one compact buffer: reset is a single fill and a snapshot is a copy of
+    the buffer. grid and color_grid are list-like views of it.
+
+    board_hash is the Zobrist hash of the occupancy (the XOR of the keys of
+    the filled cells, see ZobristKeys). Locks XOR in the piece's cells and
+    clears shift the rows above with one rotation (cleared_hash), so the
+    hash is never recomputed during play.
+    """
+
+    def __init__(self, width=10, height=20, block_size=30, load_sounds=True):
         self.width = width
         self.height = height
         self.block_size = block_size
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
-        self.color_grid = [[(0, 0, 0) for _ in range(width)] for _ in range(height)]  # New grid for colors
+        self.cell_ids = bytearray(width * height)
+        self.blank = bytes(width * height)  # Template for reset
+        self.palette = list(PALETTE)
+        self.palette_ids = {color: piece_id for piece_id, color in enumerate(PALETTE) if piece_id}  # EMPTY_COLOR -> BLOCK_ID
+        self.heights = [0] * width  # Skyline: filled height of each column, kept up to date on lock and clear
+        self.row_counts = [0] * height  # Filled cells per row, kept up to date on lock and clear
+        self.zobrist = zobrist_keys(width, height)
+        self.board_hash = 0  # Zobrist hash of the occupancy, kept up to date on lock and clear
+        self.layers = LayerCache()  # Pre-rendered background and block sprites
 
-        # Ensure mixer is initialized before loading sounds
-        pygame.mixer.init()
+        self.tetromino_place_sound = None
+        self.row_clear_sound = None
+        self.game_over_sound = None
+        self.sound_effects_enabled = load_sounds  # Headless grids never touch the mixer
+        if load_sounds:
+            self.load_sounds()
 
-        # Load sound effect for tetromino placement
-        self.tetromino_place_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'assets/solidify.mp3'))
+    def load_sounds(self):
+        """Attach the shared sound effects; they are decoded once per process, on first use or preload."""
+        assets = get_asset_manager()
+        self.tetromino_place_sound = assets.sound_asset(PLACE_SOUND)  # Sound effect for tetromino placement
+        self.row_clear_sound = assets.sound_asset(ROW_CLEAR_SOUND)  # Sound effect for row clearing
+        self.game_over_sound = assets.sound_asset(GAME_OVER_SOUND)  # Sound effect for game over
 
-        # Load sound effect for row clearing
-        self.row_clear_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'assets/row_clear.mp3'))
+    def background_layer(self):
+        """Board-sized surface with the grey outline of every cell, rendered once per geometry."""
+        def build():
+            layer = pygame.Surface((self.width * self.block_size, self.height * self.block_size))
+            layer.fill((0, 0, 0))
+            for y in range(self.height):
+                for x in range(self.width):
+                    rect = pygame.Rect(x * self.block_size, y * self.block_size, self.block_size, self.block_size)
+                    pygame.draw.rect(layer, (200, 200, 200), rect, 1)  # Draw empty block outline in grey
+            return layer
+        return self.layers.get('background', (self.width, self.height, self.block_size), build)
 
-        # Load sound effect for game over
-        game_over_sound_path = os.path.join(os.path.dirname(__file__), 'assets/game_over.mp3')
-        logging.info(f"Loading game over sound from: {game_over_sound_path}")  # Log the path being loaded
-        if not os.path.exists(game_over_sound_path):
-            logging.error(f"Error: Game over sound file does not exist at {game_over_sound_path}")  # Log if the file does not exist
-        try:
-            self.game_over_sound = pygame.mixer.Sound(game_over_sound_path)  # Load sound effect for game over
-            logging.info("Game over sound loaded successfully.")
-        except pygame.error as e:
-            logging.error(f"Error loading game over sound: {e}", exc_info=True)  # Log any error that occurs while loading the sound
+    def block_sprite(self, color):
+        """Solid block of one color, rendered once per block size."""
+        def build():
+            sprite = pygame.Surface((self.block_size, self.block_size))
+            sprite.fill(color)
+            return sprite
+        return self.layers.get(('block', color), self.block_size, build)
+
+    @property
+    def grid(self):
+        """Occupancy view: grid[y][x] is 1 for a filled cell, 0 for an empty one."""
+        return CellPlane(self, False)
+
+    @grid.setter
+    def grid(self, cells):
+        self.match_occupancy(cells)
+
+    @property
+    def color_grid(self):
+        """Color view: color_grid[y][x] is the color of the cell (EMPTY_COLOR when empty)."""
+        return CellPlane(self, True)
+
+    @color_grid.setter
+    def color_grid(self, colors):
+        for y, row in enumerate(colors):
+            self.color_grid[y] = row
+
+    def color_id(self, color):
+        """Return the piece id of a color, registering colors not seen before."""
+        color = tuple(color)
+        piece_id = self.palette_ids.get(color)
+        if piece_id is None:
+            piece_id = len(self.palette)
+            if piece_id >= MAX_PIECE_IDS:
+                raise ValueError(f"Palette full: cannot store more than {MAX_PIECE_IDS - 1} colors")
+            self.palette.append(color)
+            self.palette_ids[color] = piece_id
+        return piece_id
+
+    def piece_id(self, tetromino):
+        """Return the id stored in the board for a tetromino's blocks."""
+        if isinstance(tetromino, Tetromino):
+            return SHAPE_IDS[tetromino.shape]
+        return self.color_id(tetromino.get_color())
+
+    def write_cell(self, index, value, color=False):
+        """Write one cell through a view: an occupancy flag, or (color=True) a color.
+
+        Filling an empty cell gives it BLOCK_ID; a color only applies to a
+        filled cell, since an empty cell has no color. A change of occupancy
+        updates the skyline, the row fill counts and the board hash.
+        """
+        cell_ids = self.cell_ids
+        if color:
+            if cell_ids[index]:
+                cell_ids[index] = self.color_id(value)
+            return
+        if bool(value) == bool(cell_ids[index]):
+            return  # Occupancy unchanged; a filled cell keeps its color
+        cell_ids[index] = BLOCK_ID if value else 0
+        y, x = divmod(index, self.width)
+        self.board_hash ^= self.zobrist.cells[index]
+        if value:
+            self.row_counts[y] += 1
+            self.heights[x] = max(self.heights[x], self.height - y)
+        else:
+            self.row_counts[y] -= 1
+            if self.heights[x] == self.height - y:
+                self.heights[x] = self.column_height(x, y + 1)  # The column's top block was removed
+
+    def match_occupancy(self, cells):
+        """Make cell_ids agree with an occupancy plane (rows of flags) written as a whole, then the counters."""
+        cell_ids = self.cell_ids
+        index = 0
+        for row in cells:
+            for filled in row:
+                if not filled:
+                    cell_ids[index] = 0
+                elif not cell_ids[index]:
+                    cell_ids[index] = BLOCK_ID
+                index += 1
+        self.refresh_counters()
 
-        logging.info("Tetromino placement sound, row clear sound, and game over sound loaded successfully")  # Log sound loading
+    def snapshot(self):
+        """Immutable copy of the board contents (a copy of cell_ids), e.g. for diffing frames."""
+        return bytes(self.cell_ids)
 
-        self.sound_effects_enabled = True  # Initialize sound effects state to enabled
+    def cell_layers(self):
+        """(cells, scaled): an 8-bit width x height surface using the palette, and its board-sized scale target."""
+        def build():
+            palette = [EMPTY_KEY] + self.palette[1:]
+            cells = pygame.Surface((self.width, self.height), depth=8)
+            cells.set_palette(palette)
+            scaled = pygame.Surface((self.width * self.block_size, self.height * self.block_size), depth=8)
+            scaled.set_palette(palette)
+            scaled.set_colorkey(EMPTY_KEY)  # Empty cells let the outlines of the background show
+            return cells, scaled
+        return self.layers.get('cells', (self.width, self.height, self.block_size, len(self.palette)), build)
 
     def draw(self, surface):
-        surface.fill((0, 0, 0))
-        for y in range(self.height):
-            for x in range(self.width):
-                rect = pygame.Rect(x * self.block_size, y * self.block_size, self.block_size, self.block_size)
-                if self.grid[y][x] == 0:
-                    pygame.draw.rect(surface, (200, 200, 200), rect, 1)  # Draw empty block outline in grey
-                else:
-                    pygame.draw.rect(surface, self.color_grid[y][x], rect)  # Draw filled block with its original color
+        """Draw the board with a fixed number of blits, whatever its cell count.
+
+        The piece ids are copied into a one-pixel-per-cell 8-bit surface whose
+        palette is the board palette, scaled up so each pixel becomes a block,
+        and blitted over the cached outline layer, which is opaque and covers
+        the whole board area.
+        """
+        surface.blit(self.background_layer(), (0, 0))  # All empty cell outlines in one blit
+        cells, scaled = self.cell_layers()
+        ids = np.frombuffer(self.cell_ids, dtype=np.uint8).reshape(self.height, self.width)
+        pygame.surfarray.blit_array(cells, ids.T)  # surfarray indexes [x, y]
+        del ids  # Release the buffer so clears can resize cell_ids
+        pygame.transform.scale(cells, scaled.get_size(), scaled)
+        surface.blit(scaled, (0, 0))  # All filled blocks in one blit
+
+    def draw_cell(self, surface, x, y, color=None):
+        """Repaint one cell: a filled block of `color`, or an empty outline if color is None."""
+        rect = pygame.Rect(x * self.block_size, y * self.block_size, self.block_size, self.block_size)
+        if color is None:
+            surface.blit(self.background_layer(), rect, rect)  # Copy the outline from the background layer
+        else:
+            surface.blit(self.block_sprite(color), rect)  # Draw filled block with its original color
+        return rect
 
     def reset(self):
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
-        self.color_grid = [[(0, 0, 0) for _ in range(self.width)] for _ in range(self.height)]  # Reset color grid
+        self.cell_ids[:] = self.blank  # One buffer copy clears occupancy and colors
+        self.heights = [0] * self.width
+        self.row_counts = [0] * self.height
+        self.board_hash = 0
 
     def is_full(self):
-        return any(self.grid[0])  # Check if the top row is filled
+        return any(self.cell_ids[:self.width])  # Check if the top row is filled
+
+    def refresh_counters(self):
+        """Recompute the skyline, the row fill counts and the board hash from the cells.
+
+        Locks, clears and writes through the grid views keep them up to
+        date; this is only needed after writing cell_ids directly.
+        """
+        self.refresh_heights()
+        self.refresh_row_counts()
+        self.refresh_hash()
+
+    def refresh_hash(self):
+        """Recompute board_hash from the cells."""
+        cell_keys = self.zobrist.cells
+        board_hash = 0
+        for index, piece_id in enumerate(self.cell_ids):
+            if piece_id:
+                board_hash ^= cell_keys[index]
+        self.board_hash = board_hash
+
+    def row_hash(self, y):
+        """XOR of the column keys of the filled cells in row y."""
+        columns = self.zobrist.columns
+        start = y * self.width
+        result = 0
+        for x, piece_id in enumerate(self.cell_ids[start:start + self.width]):
+            if piece_id:
+                result ^= columns[x]
+        return result
+
+    def refresh_row_counts(self):
+        width = self.width
+        cell_ids = self.cell_ids
+        self.row_counts = [width - cell_ids.count(0, start, start + width) for start in range(0, len(cell_ids), width)]
+
+    def refresh_heights(self):
+        height = self.height
+        width = self.width
+        heights = [0] * width
+        for index, piece_id in enumerate(self.cell_ids):
+            x = index % width
+            if piece_id and not heights[x]:
+                heights[x] = height - index // width  # First filled cell from the top
+        self.heights = heights
+
+    def column_height(self, x, start=0):
+        """Filled height of column x, searched for from row `start` down (the column is empty above it).
+
+        The search stops at the first filled cell, so after a clear or an
+        erased top block it usually costs a step or two, whatever the height.
+        """
+        width = self.width
+        cell_ids = self.cell_ids
+        for index in range(start * width + x, len(cell_ids), width):
+            if cell_ids[index]:
+                return self.height - index // width
+        return 0
+
+    def landing_row(self, tetromino, position):
+        """Row at which the tetromino would lock if dropped straight down from `position`.
+
+        Uses the skyline, so it costs one step per column of the piece. Only
+        a piece tucked under an overhang falls back to stepping down cell by cell.
+        """
+        top, left = position
+        heights = self.heights
+        floor = self.height
+        landing = floor
+        for dx, _, bottom in piece_profile(tetromino):
+            surface = floor - heights[left + dx]  # First filled row of the column, or the floor
+            if top + bottom >= surface:
+                return self.scan_landing_row(tetromino, position)  # Below the skyline: it does not apply
+            landing = min(landing, surface - 1 - bottom)
+        return landing
+
+    def scan_landing_row(self, tetromino, position):
+        """landing_row by collision checks, one row at a time."""
+        top, left = position
+        while self.is_valid_position(tetromino, (top + 1, left)):
+            top += 1
+        return top
 
     def place_tetromino(self, tetromino, position, sound_effects_enabled=True):
-        shape = tetromino.get_shape()
-        color = tetromino.get_color()  # Get the color of the tetromino
-        for y, row in enumerate(shape):
-            for x, block in enumerate(row):
-                if block:  # If the block is part of the tetromino
-                    if 0 <= position[0] + y < self.height and 0 <= position[1] + x < self.width:
-                        self.grid[position[0] + y][position[1] + x] = 1  # Mark the grid as filled
-                        self.color_grid[position[0] + y][position[1] + x] = color  # Store the color
-                    else:
-                        logging.warning(f"Tetromino position {position} is out of bounds.")
-                        return 0  # Handle out-of-bounds gracefully
-        filled_rows = self.clear_filled_rows(sound_effects_enabled)  # Clear filled rows after placing a tetromino
-        if sound_effects_enabled:  # Check if sound effects are enabled before playing sound
+        if not self._lock_cells(tetromino, position):
+            logging.warning(f"Tetromino position {position} is out of bounds.")
+            return 0  # Handle out-of-bounds gracefully
+        top, left = position
+        heights = self.heights
+        for dx, top_dy, _ in piece_profile(tetromino):
+            heights[left + dx] = max(heights[left + dx], self.height - top - top_dy)
+        row_counts = self.row_counts
+        cell_keys = self.zobrist.cells
+        width = self.width
+        board_hash = self.board_hash
+        touched = []
+        for y, x in piece_cells(tetromino):
+            row_counts[top + y] += 1
+            board_hash ^= cell_keys[(top + y) * width + left + x]
+            if top + y not in touched:
+                touched.append(top + y)
+        self.board_hash = board_hash
+        touched.sort()
+        filled_rows = self.clear_filled_rows(sound_effects_enabled, touched)  # Only the rows the piece touched can have filled up
+        if sound_effects_enabled and self.tetromino_place_sound:  # Check if sound effects are enabled before playing sound
             self.tetromino_place_sound.play()  # Play sound effect when tetromino is placed
-        logging.info(f"place_tetromino: Filled rows cleared: {filled_rows}")  # Log for filled rows
+        logging.debug("place_tetromino: Filled rows cleared: %s", filled_rows)  # Log for filled rows
         return filled_rows  # Return the number of filled rows cleared
 
+    def _lock_cells(self, tetromino, position):
+        """Write the tetromino's blocks into the board; False if a block is out of bounds."""
+        top, left = position
+        width = self.width
+        cells = piece_cells(tetromino)
+        for y, x in cells:
+            if not (0 <= top + y < self.height and 0 <= left + x < width):
+                return False
+        piece_id = self.piece_id(tetromino)  # Marks the cells as filled and stores the color
+        cell_ids = self.cell_ids
+        for y, x in cells:
+            cell_ids[(top + y) * width + left + x] = piece_id
+        return True
+
     def is_valid_position(self, tetromino, position):
-        shape = tetromino.get_shape()
-        for y, row in enumerate(shape):
-            for x, block in enumerate(row):
-                if block:  # If the block is part of the tetromino
-                    new_x = position[1] + x
-                    new_y = position[0] + y
-                    if new_x < 0 or new_x >= self.width or new_y >= self.height:
-                        return False  # Out of bounds
-                    if new_y >= 0 and self.grid[new_y][new_x] != 0:
-                        return False  # Overlapping with another tetromino
+        top, left = position
+        width = self.width
+        cell_ids = self.cell_ids
+        for y, x in piece_cells(tetromino):
+            new_x = left + x
+            new_y = top + y
+            if new_x < 0 or new_x >= width or new_y >= self.height:
+                return False  # Out of bounds
+            if new_y >= 0 and cell_ids[new_y * width + new_x]:
+                return False  # Overlapping with another tetromino
         return True
 
     def get_state(self):
@@ -104,24 +593,40 @@ class Grid:
             return False
 
     def check_filled_rows(self):
-        filled_rows = []
-        for y in range(self.height):
-            if all(self.grid[y]):  # Check if all columns in the row are filled
-                filled_rows.append(y)  # Add the filled row index to the list
-        logging.info(f"check_filled_rows: Filled rows detected: {filled_rows}")  # Log for filled rows
+        width = self.width
+        cell_ids = self.cell_ids
+        filled_rows = [y for y in range(self.height) if 0 not in cell_ids[y * width:(y + 1) * width]]  # No empty cell
+        logging.debug("check_filled_rows: Filled rows detected: %s", filled_rows)  # Log for filled rows
         return filled_rows
 
-    def clear_filled_rows(self, sound_effects_enabled=True):
-        filled_rows = self.check_filled_rows()  # Get filled rows
-        for row in filled_rows:
-            self.grid.pop(row)  # Remove the filled row
-            self.grid.insert(0, [0 for _ in range(self.width)])  # Add a new empty row at the top
-            self.color_grid.pop(row)  # Remove the color row
-            self.color_grid.insert(0, [(0, 0, 0) for _ in range(self.width)])  # Add new empty color row
-        logging.info(f"clear_filled_rows: Cleared filled rows: {filled_rows}")  # Log for filled rows
+    def clear_filled_rows(self, sound_effects_enabled=True, rows=None):
+        """Clear the filled rows among `rows` (ascending), or among all rows if not given."""
+        if rows is None:
+            filled_rows = self.check_filled_rows()  # Get filled rows
+        else:
+            width = self.width
+            row_counts = self.row_counts
+            filled_rows = [y for y in rows if row_counts[y] == width]
+        if rows is not None and filled_rows:
+            self.board_hash = cleared_hash(self.board_hash, self.row_hash, filled_rows, self.height - max(self.heights),
+                                           self.zobrist)
+        self._remove_rows(filled_rows)
+        if rows is None:
+            self.refresh_counters()  # The cells may have been written directly
+        elif filled_rows:
+            # A full row lies under every column's top, so each column drops by the number cleared,
+            # unless its top block was in a cleared row: nothing of that column is left above the row
+            # after it, so its new top is searched for from there down
+            cleared = len(filled_rows)
+            floor = self.height
+            tops = set(filled_rows)
+            self.heights = [self.column_height(x, floor - height + 1) if floor - height in tops else height - cleared
+                            for x, height in enumerate(self.heights)]
+            compact_rows(self.row_counts, filled_rows, int)
+        logging.debug("clear_filled_rows: Cleared filled rows: %s", filled_rows)  # Log for filled rows
 
         if filled_rows:  # Check if any rows were cleared
-            if sound_effects_enabled:  # Check if sound effects are enabled before playing sound
+            if sound_effects_enabled and self.row_clear_sound:  # Check if sound effects are enabled before playing sound
                 try:
                     self.row_clear_sound.play()  # Play sound effect for row clearing
                     logging.info("Row clear sound played successfully.")  # Log sound playing
@@ -129,8 +634,20 @@ class Grid:
                     logging.error(f"Error playing row clear sound: {e}", exc_info=True)  # Log any error that occurs while playing sound
         return len(filled_rows)  # Return the number of cleared rows
 
+    def _remove_rows(self, rows):
+        """Remove the given rows (ascending indices) and shift everything above down."""
+        if not rows:
+            return
+        width = self.width
+        cell_ids = self.cell_ids
+        for y in reversed(rows):
+            del cell_ids[y * width:(y + 1) * width]  # Moves only the rows below
+        cell_ids[:0] = bytes(len(rows) * width)  # Empty rows on top in one insertion
+
     def play_game_over_sound(self):
         """Play the game over sound effect."""
+        if self.game_over_sound is None:
+            return  # No sounds loaded (headless grid)
         try:
             self.game_over_sound.play()  # Play sound effect for game over
             logging.info("Game over sound played successfully.")  # Log sound playing
@@ -141,6 +658,7 @@ class Grid:
         """Check if the game is over (i.e., if a new tetromino collides on spawn)."""
         if not self.is_valid_position(current_tetromino, tetromino_position):
             logging.info("Game Over: New tetromino cannot be placed.")
-            self.play_game_over_sound()  # Play the game over sound
+            if self.sound_effects_enabled:
+                self.play_game_over_sound()  # Play the game over sound
             return True
         return False
\ No newline at end of file
@@ -1,55 +1,282 @@
+import atexit
+import collections
+import heapq
+import itertools
 import json
 import os
+import queue
+import threading
 from datetime import datetime
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+TOP_K = 5  # Scores kept in the snapshot and shown in the all-time table
+COMPACT_EVERY = 64  # Results appended to the log before the snapshot is rewritten
+
+
+def write_atomic(path, text):
+    """Replace `path` with `text` so a crash leaves either the old or the new file, never a torn one."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    try:  # Make the rename itself durable (not supported on every platform)
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+
+class ScoreWriter:
+    """Background thread that performs all disk writes of a HighScoreManager.
+
+    The game thread only queues work. The writer takes everything queued so
+    far as one batch: log lines are appended with a single write and fsync,
+    and of several snapshot requests in the batch only the newest is
+    written, so a burst of saves costs one rewrite.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.batches = 0  # Batches written, for tests and benchmarks
+
+    def submit(self, kind, payload):
+        """Queue a ('line', text) or ('snapshot', entries) write; starts the thread on first use."""
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='high-score-writer', daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)  # Never drop queued scores on a normal interpreter exit
+        self.queue.put((kind, payload))
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                logging.error(f"Error saving high scores: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def write_batch(self, batch):
+        # Lines queued before the newest snapshot are covered by it; later ones stay in the log tail
+        last_snapshot = max((index for index, (kind, _) in enumerate(batch) if kind == 'snapshot'), default=-1)
+        self.append_lines([payload for kind, payload in batch[:last_snapshot + 1] if kind == 'line'])
+        if last_snapshot >= 0:
+            self.write_snapshot(batch[last_snapshot][1])
+        self.append_lines([payload for kind, payload in batch[last_snapshot + 1:] if kind == 'line'])
+        self.batches += 1
+
+    def append_lines(self, lines):
+        if not lines:
+            return
+        with open(self.manager.log_filename, 'a') as file:
+            file.write(''.join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def write_snapshot(self, high_scores):
+        manager = self.manager
+        log_offset = os.path.getsize(manager.log_filename) if os.path.exists(manager.log_filename) else 0
+        # The index goes first and holds the entries too: a crash between the two writes leaves an index
+        # that still matches its log offset, and the snapshot file is only a copy in the original format
+        write_atomic(manager.index_filename, json.dumps({'log_offset': log_offset, 'high_scores': high_scores}))
+        write_atomic(manager.filename, json.dumps(high_scores))
+        logging.info("High scores saved successfully.")
+
+
 class HighScoreManager:
-    def __init__(self, filename='all_time_high_scores.json'):
+    """High score store: an append-only log of every result plus a top-K snapshot.
+
+    filename holds the top scores as a JSON list of [score, timestamp] (the
+    original format). Every result is also appended as one JSON line to
+    filename + '.log', which is never rewritten, so no history is lost.
+    filename + '.idx' records the snapshot together with how much of the log
+    it covers, so startup reads the snapshot plus only the log written
+    since the last compaction. In memory the top scores live in a K-sized
+    min-heap.
+
+    Writes never happen on the calling thread: add_high_score() and
+    compact() hand them to a ScoreWriter. flush() waits for them, and
+    save_high_scores() and close() are the blocking durability points.
+    """
+
+    def __init__(self, filename='all_time_high_scores.json', keep=TOP_K, compact_every=COMPACT_EVERY):
         self.filename = filename
-        self.high_scores = self.load_high_scores()
+        self.log_filename = filename + '.log'
+        self.index_filename = filename + '.idx'
+        self.keep = keep
+        self.compact_every = compact_every
+        self._top = []  # Min-heap of (score, -sequence, timestamp); the weakest entry is at the root
+        self._sequence = itertools.count()  # Tie-break: among equal scores the older result ranks higher
+        self.pending = 0  # Results appended since the snapshot was last written
+        self.writer = ScoreWriter(self)
+        self.load_high_scores()
+
+    @property
+    def high_scores(self):
+        """Top scores as (score, timestamp) tuples, best first."""
+        return [(score, timestamp) for score, _, timestamp in sorted(self._top, reverse=True)]
+
+    @high_scores.setter
+    def high_scores(self, high_scores):
+        self._top = []
+        for score, timestamp in high_scores:
+            self._push(score, timestamp)
+
+    def _push(self, score, timestamp):
+        """Offer one result to the top-K heap in O(log K)."""
+        entry = (score, -next(self._sequence), timestamp)
+        if len(self._top) < self.keep:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
 
     def load_high_scores(self):
-        """Load high scores from the JSON file."""
+        """Load the snapshot and the log written after it; returns the top scores."""
+        self.flush()
+        snapshot, log_offset, covered = self.read_stored_scores()
+        self.high_scores = snapshot
+        # Without an index the whole log is replayed: skip one logged copy of each snapshot entry, so
+        # entries are not counted twice but a result that really was repeated still is
+        unmatched = collections.Counter() if covered else collections.Counter(snapshot)
+        self.pending = 0
+        for entry in self.read_log(log_offset):
+            if unmatched[entry]:
+                unmatched[entry] -= 1
+                continue
+            self._push(*entry)
+            self.pending += 1
+        high_scores = self.high_scores
+        logging.info(f"Loaded high scores: {high_scores}")
+        return high_scores
+
+    def read_stored_scores(self):
+        """Return (snapshot entries, log offset, whether the offset is known to match the entries).
+
+        The index holds both. Stores written before it did fall back to the
+        snapshot file and the index's offset, if any.
+        """
+        try:
+            with open(self.index_filename, 'r') as file:
+                index = json.load(file)
+            return [tuple(entry) for entry in index['high_scores']], index['log_offset'], True
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            return self.read_snapshot(), self.read_log_offset(), False
+
+    def read_snapshot(self):
+        """Return the entries of the snapshot file, or [] if it is missing or invalid."""
         try:
             with open(self.filename, 'r') as file:
                 high_scores = json.load(file)
                 # Ensure the entries are tuples
-                high_scores = [tuple(entry) if isinstance(entry, list) and len(entry) == 2 else self.handle_invalid_entry(entry) for entry in high_scores]
-            logging.info(f"Loaded high scores: {high_scores}")
-            return high_scores
+                return [tuple(entry) if isinstance(entry, list) and len(entry) == 2 else self.handle_invalid_entry(entry) for entry in high_scores]
         except (FileNotFoundError, json.JSONDecodeError):
             logging.warning("High scores file not found or invalid format. Starting with an empty list.")
             return []
 
-    def save_high_scores(self, high_scores=None):
-        """Save high scores to the file."""
-        if high_scores is None:
-            high_scores = self.high_scores
+    def read_log_offset(self):
+        """Byte offset in the log up to which the snapshot is up to date."""
+        try:
+            with open(self.index_filename, 'r') as file:
+                return json.load(file)['log_offset']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return 0
+
+    def read_log(self, offset=0):
+        """Yield (score, timestamp) for every log entry from byte `offset` on."""
         try:
-            with open(self.filename, 'w') as file:
-                json.dump(high_scores, file)
-            logging.info("High scores saved successfully.")
-        except Exception as e:
-            logging.error(f"Error saving high scores: {e}")
-
-    def add_high_score(self, score):
-        """Add a new high score with a valid timestamp."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(self.log_filename, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    try:
+                        score, timestamp = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Skipping unreadable high score log line: {line!r}")  # e.g. a torn final write
+                        continue
+                    yield score, timestamp
+        except FileNotFoundError:
+            return
+
+    def history(self):
+        """Every result ever recorded, oldest first."""
+        self.flush()
+        return list(self.read_log())
+
+    def save_high_scores(self, high_scores=None):
+        """Save high scores to the file and wait until they are on disk."""
+        if high_scores is not None:
+            self.high_scores = high_scores
+        self.compact()
+        self.flush()
+
+    def compact(self):
+        """Queue a rewrite of the top-K snapshot covering everything logged so far."""
+        self.writer.submit('snapshot', self.high_scores)
+        self.pending = 0
+
+    def flush(self):
+        """Wait until every queued write has reached the disk."""
+        self.writer.flush()
+
+    def close(self):
+        """Fold the session into the snapshot and flush; call on shutdown."""
+        if self.pending:
+            self.compact()
+        self.flush()
+
+    def rebuild(self):
+        """Recompute the top scores from the full history, e.g. after changing keep.
+
+        Snapshot entries that were never logged (kept from before the log
+        existed) are part of the history too.
+        """
+        history = self.history()
+        unlogged = collections.Counter(self.read_stored_scores()[0]) - collections.Counter(history)
+        self.high_scores = list(unlogged.elements()) + history  # Older than anything logged
+        self.compact()
+        return self.high_scores
+
+    def add_high_score(self, score, timestamp=None):
+        """Append a result to the log and offer it to the top scores."""
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         score_with_timestamp = (score, timestamp)
 
         # Validate the score entry before adding
-        if isinstance(score_with_timestamp, tuple) and len(score_with_timestamp) == 2:
-            self.high_scores.append(score_with_timestamp)
-        else:
+        if not isinstance(score, int) or not isinstance(timestamp, str):
             logging.warning(f"Attempted to add invalid score entry: {score_with_timestamp}")
             score_with_timestamp = self.handle_invalid_entry(score_with_timestamp)
 
-        self.high_scores = sorted(self.high_scores, key=lambda x: x[0], reverse=True)[:5]  # Keep top 5 scores
-
-        self.save_high_scores(self.high_scores)
+        self.writer.submit('line', json.dumps(score_with_timestamp) + '\n')  # One line per result, never rewritten
+        self._push(*score_with_timestamp)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
         logging.info(f"New high score added: {score_with_timestamp}. Current scores: {self.high_scores}")
 
     def handle_invalid_entry(self, entry):
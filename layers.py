@@ -0,0 +1,24 @@
+class LayerCache:
+    """Pre-rendered static surfaces, rebuilt only when their geometry changes.
+
+    Each layer is stored under a name together with the key it was built
+    for (typically sizes and offsets). Asking for a layer with a different
+    key, e.g. after a resize or block-size change, rebuilds and replaces it.
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self.builds = 0  # Number of surfaces rendered so far
+
+    def get(self, name, key, build):
+        """Return the layer `name` built for `key`, calling build() if it is missing or stale."""
+        entry = self._layers.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, build())
+            self._layers[name] = entry
+            self.builds += 1
+        return entry[1]
+
+    def clear(self):
+        """Drop every cached layer."""
+        self._layers.clear()
@@ -1,15 +1,27 @@
+import argparse
 import pygame
 from tetris_game import TetrisGame
+from pieces import PIECE_POLICIES
+from tracing import enable_from_environment
 
 if __name__ == "__main__":
-    # Initialize Pygame
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument('--uncapped', action='store_true', help='render every loop iteration without sleeping (benchmarking)')
+    parser.add_argument('--seed', type=int, help='seed of the piece sequence (random if omitted)')
+    parser.add_argument('--pieces', choices=sorted(PIECE_POLICIES), default='uniform', help='piece sequence policy')
+    parser.add_argument('--record', metavar='FILE', help='record every key press to a replay file (see replay.py)')
+    parser.add_argument('--autoplay', action='store_true', help='let the built-in bot play (soak testing); it restarts after every game over')
+    parser.add_argument('--profile', metavar='FILE', help='time every frame phase and write the samples to a CSV file on exit (F3 shows them)')
+    args = parser.parse_args()
+
+    # TETRIS_TRACE=trace.json records a timeline (F9 dumps it mid-game, exit and crashes dump it too)
+    enable_from_environment()
 
-    # Initialize the mixer for sound
-    pygame.mixer.init()  # Add this line to initialize the mixer
+    # Initialize Pygame; the asset manager initializes the mixer on first use and runs silent without an audio device
+    pygame.init()
 
     # Create an instance of TetrisGame
-    game = TetrisGame()
+    game = TetrisGame(uncapped=args.uncapped, seed=args.seed, piece_policy=args.pieces, record_path=args.record, profile_path=args.profile, autoplay=args.autoplay)
 
     # Run the game
     game.run()
\ No newline at end of file
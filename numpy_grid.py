@@ -0,0 +1,120 @@
+import logging
+import numpy as np
+from grid import Grid, piece_cells
+from tetromino import Tetromino, ROTATIONS
+
+# Block offsets of every rotation as arrays: ROTATION_OFFSETS[shape] has shape (4, blocks, 2)
+ROTATION_OFFSETS = {name: np.array([state.cells for state in states], dtype=np.int64) for name, states in ROTATIONS.items()}
+# Border around the board in the padded occupancy plane; covers the largest piece extent
+PAD = 4
+
+
+class NumpyGrid(Grid):
+    """Grid backend backed by NumPy arrays with batch collision queries.
+
+    self.cells is a (height, width) uint8 occupancy plane and self.piece_ids
+    a plane of the same shape holding the id of the piece that filled each
+    cell (0 = empty), resolved to a color through self.palette. piece_ids
+    is an array view of the inherited cell_ids buffer, so drawing and
+    snapshots are shared with the other backends, and grid and color_grid
+    are the inherited views of it; writes through them update cells too.
+
+    self.cells is a view into a padded plane whose side and floor borders
+    are filled, so batch queries need no per-block bounds checks.
+    """
+
+    def __init__(self, width=10, height=20, block_size=30, load_sounds=True):
+        self._padded = np.ones((height + 2 * PAD, width + 2 * PAD), dtype=np.uint8)
+        self._padded[:PAD, PAD:PAD + width] = 0  # Above the top is open
+        self.cells = self._padded[PAD:PAD + height, PAD:PAD + width]
+        self.cells.fill(0)
+        padded_width = width + 2 * PAD
+        self._flat_offsets = {name: offsets[:, :, 0] * padded_width + offsets[:, :, 1] for name, offsets in ROTATION_OFFSETS.items()}
+        super().__init__(width, height, block_size, load_sounds)
+        self.piece_ids = np.frombuffer(self.cell_ids, dtype=np.uint8).reshape(height, width)  # Shares cell_ids
+
+    @Grid.grid.setter
+    def grid(self, cells):
+        self.cells[:] = np.asarray(cells) != 0
+        self.match_occupancy(self.cells.tolist())
+
+    def write_cell(self, index, value, color=False):
+        super().write_cell(index, value, color)
+        if not color:
+            self.cells[divmod(index, self.width)] = 1 if value else 0
+
+    def reset(self):
+        self.cells.fill(0)
+        self.piece_ids.fill(0)
+        self.heights = [0] * self.width
+        self.row_counts = [0] * self.height
+        self.board_hash = 0
+
+    def refresh_row_counts(self):
+        self.row_counts = self.cells.sum(axis=1, dtype=np.int64).tolist()
+
+    def refresh_heights(self):
+        filled = self.cells.any(axis=0)
+        first = self.cells.argmax(axis=0)  # First filled row of each column
+        self.heights = np.where(filled, self.height - first, 0).tolist()
+
+    def is_full(self):
+        return bool(self.cells[0].any())  # Check if the top row is filled
+
+    def is_valid_position(self, tetromino, position):
+        top, left = position
+        cells = self.cells
+        for y, x in piece_cells(tetromino):
+            new_x = left + x
+            new_y = top + y
+            if new_x < 0 or new_x >= self.width or new_y >= self.height:
+                return False  # Out of bounds
+            if new_y >= 0 and cells[new_y, new_x]:
+                return False  # Overlapping with another tetromino
+        return True
+
+    def valid_positions(self, tetromino, positions):
+        """Check many placements of a tetromino in one vectorized query.
+
+        positions is a sequence or (K, 3) array of (rotation, row, column)
+        triples. Returns a boolean array of length K that is True where
+        is_valid_position would accept that rotation at that position.
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 3)
+        if isinstance(tetromino, Tetromino):
+            offsets = self._flat_offsets[tetromino.shape][positions[:, 0] % 4]  # (K, blocks)
+        else:
+            # Shapes outside the rotation tables only have their current orientation
+            offsets = np.array([y * self._padded.shape[1] + x for y, x in piece_cells(tetromino)], dtype=np.int64)
+        # Clamping keeps every block inside the padding without changing the verdict:
+        # far above the top stays open, far left/right/below stays walled
+        rows = np.minimum(np.maximum(positions[:, 1], -PAD), self.height) + PAD
+        cols = np.minimum(np.maximum(positions[:, 2], -PAD), self.width) + PAD
+        index = (rows * self._padded.shape[1] + cols)[:, None] + offsets
+        return ~self._padded.ravel().take(index).any(axis=1)
+
+    def _lock_cells(self, tetromino, position):
+        top, left = position
+        blocks = [(top + y, left + x) for y, x in piece_cells(tetromino)]
+        for y, x in blocks:
+            if not (0 <= y < self.height and 0 <= x < self.width):
+                return False
+        rows, cols = zip(*blocks)
+        self.cells[rows, cols] = 1  # Mark the grid as filled
+        self.piece_ids[rows, cols] = self.piece_id(tetromino)  # Store the color
+        return True
+
+    def check_filled_rows(self):
+        filled_rows = np.flatnonzero(self.cells.all(axis=1)).tolist()  # Every full row in one pass
+        logging.debug("check_filled_rows: Filled rows detected: %s", filled_rows)  # Log for filled rows
+        return filled_rows
+
+    def _remove_rows(self, rows):
+        if not rows:
+            return
+        lowest = rows[-1]
+        keep = np.ones(lowest + 1, dtype=bool)  # Rows below the lowest cleared one stay in place
+        keep[rows] = False
+        for plane in (self.cells, self.piece_ids):
+            plane[len(rows):lowest + 1] = plane[:lowest + 1][keep]  # Fancy indexing copies, so the overlap is safe
+            plane[:len(rows)] = 0
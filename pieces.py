@@ -0,0 +1,80 @@
+import random
+from tetromino import Tetromino, SHAPE_NAMES
+
+PREVIEW_SIZE = 3  # Upcoming pieces shown in the side panel
+
+
+class UniformPolicy:
+    """Every piece is drawn independently and uniformly from the seven shapes."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def next_shape(self):
+        return SHAPE_NAMES[self.rng.randrange(len(SHAPE_NAMES))]
+
+
+class SevenBagPolicy:
+    """Deal the seven shapes in shuffled bags, so each appears once per seven pieces."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.bag = []
+
+    def next_shape(self):
+        if not self.bag:
+            self.bag = list(SHAPE_NAMES)
+            self.rng.shuffle(self.bag)
+        return self.bag.pop()
+
+
+# Piece sequence policies selectable through PieceQueue: name -> class
+PIECE_POLICIES = {
+    'uniform': UniformPolicy,
+    'bag': SevenBagPolicy,
+}
+
+
+class PieceQueue:
+    """Seeded piece sequence with a ring-buffer preview of the next pieces.
+
+    Calling the queue returns the next Tetromino, so it can be passed as the
+    tetromino_factory of a TetrisEngine. Each game draws from its own
+    random.Random(seed); reset() without a seed moves on to the next seed of
+    a sequence derived from the first one, so a whole session of games is
+    reproducible from a single number. self.seed is the current game's seed.
+    """
+
+    def __init__(self, seed=None, policy='uniform', preview=PREVIEW_SIZE, tetromino_class=Tetromino):
+        if policy not in PIECE_POLICIES:
+            raise ValueError(f"Unknown piece policy '{policy}'; choose from {sorted(PIECE_POLICIES)}")
+        self.policy_name = policy
+        self.preview_size = preview
+        self.tetromino_class = tetromino_class
+        self.seeds = random.Random(seed if seed is not None else random.randrange(2 ** 32))
+        self.reset()
+
+    def reset(self, seed=None):
+        """Start a new piece sequence from `seed`, or from the next seed of the session."""
+        self.seed = seed if seed is not None else self.seeds.randrange(2 ** 32)
+        self.policy = PIECE_POLICIES[self.policy_name](random.Random(self.seed))
+        self.ring = [self.policy.next_shape() for _ in range(max(1, self.preview_size))]
+        self.head = 0  # Slot of the next piece to deal
+        self.dealt = 0
+
+    def next_shape(self):
+        """Deal the next shape name and refill its slot at the back of the ring."""
+        shape = self.ring[self.head]
+        self.ring[self.head] = self.policy.next_shape()
+        self.head = (self.head + 1) % len(self.ring)
+        self.dealt += 1
+        return shape
+
+    def preview(self, count=None):
+        """Names of the upcoming shapes, next first (at most preview_size)."""
+        count = self.preview_size if count is None else min(count, self.preview_size)
+        ring = self.ring
+        return [ring[(self.head + index) % len(ring)] for index in range(count)]
+
+    def __call__(self):
+        return self.tetromino_class(self.next_shape())
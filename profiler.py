@@ -0,0 +1,120 @@
+import csv
+import logging
+import time
+from array import array
+
+# Frame phases in the order they run; each frame's time is split between them
+PHASES = ('events', 'gravity', 'drop_speed', 'board', 'piece', 'score', 'tables', 'banner', 'overlay', 'present', 'wait')
+DEFAULT_WINDOW = 240  # Frames the overlay percentiles are computed over (4 seconds at 60 fps)
+DEFAULT_PROFILE_PATH = 'tetris_profile.csv'  # Where per-frame samples go on exit
+OVERLAY_REFRESH_FRAMES = 15  # The overlay text is rebuilt a few times per second so it stays readable
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty sequence."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Per-frame phase timer behind the F3 overlay and the CSV export.
+
+    The game loop calls begin_frame(), then lap(phase) after each phase:
+    the time since the previous lap is added to that phase, so a phase that
+    runs several times in one frame accumulates. end_frame() keeps the
+    frame in a rolling window for the overlay percentiles and appends it to
+    a flat array of samples for write_csv().
+
+    Call sites guard laps with `if profiler.timing:`, which is only True
+    between begin_frame() and end_frame(), so a disabled profiler costs
+    one attribute check per phase.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, phases=PHASES):
+        self.phases = phases
+        self.slots = {phase: index for index, phase in enumerate(phases)}
+        self.enabled = False  # begin_frame() is called by the loop only while this is set
+        self.always_on = False  # Started with a profile path: keep timing when the overlay is hidden
+        self.overlay = False
+        self.timing = False
+        self.path = DEFAULT_PROFILE_PATH
+        self.window = window
+        self.recent = [array('q', [0]) * window for _ in range(len(phases) + 1)]  # Ring buffers; the last one is the frame total
+        self.next = 0  # Slot of the window the next frame goes to
+        self.frames = 0  # Frames recorded since the last clear
+        self.samples = array('q')  # len(phases) + 1 nanosecond values per recorded frame
+        self.current = [0] * len(phases)
+        self.frame_start = self.mark = 0
+
+    def enable(self, path=None):
+        """Time every frame from now on; samples are written to `path` on exit."""
+        if path:
+            self.path = path
+        self.always_on = self.enabled = True
+
+    def show_overlay(self, visible):
+        """Show or hide the overlay; timing follows it unless enable() was called."""
+        self.overlay = visible
+        self.enabled = visible or self.always_on
+        self.timing = self.timing and self.enabled  # A frame cut off by disabling is dropped
+
+    def clear(self):
+        self.recent = [array('q', [0]) * self.window for _ in range(len(self.phases) + 1)]
+        self.next = self.frames = 0
+        self.samples = array('q')
+
+    def begin_frame(self):
+        self.current = [0] * len(self.phases)
+        self.frame_start = self.mark = time.perf_counter_ns()
+        self.timing = True
+
+    def lap(self, phase):
+        """Charge the time since the previous lap (or the frame start) to `phase`."""
+        now = time.perf_counter_ns()
+        self.current[self.slots[phase]] += now - self.mark
+        self.mark = now
+
+    def end_frame(self):
+        """Close the frame: time since the last lap is dropped, the frame total keeps it."""
+        total = time.perf_counter_ns() - self.frame_start
+        self.timing = False
+        values = self.current
+        values.append(total)
+        slot = self.next
+        for ring, value in zip(self.recent, values):
+            ring[slot] = value
+        self.next = (slot + 1) % self.window
+        self.frames += 1
+        self.samples.extend(values)
+
+    def percentiles(self, fractions=(0.5, 0.99)):
+        """{phase: [milliseconds at each fraction]} over the rolling window, plus 'frame' for the total."""
+        count = min(self.frames, self.window)
+        if not count:
+            return {}
+        result = {}
+        for name, ring in zip(self.phases + ('frame',), self.recent):
+            values = sorted(ring[:count] if count < self.window else ring)
+            result[name] = [percentile(values, fraction) / 1e6 for fraction in fractions]
+        return result
+
+    def overlay_lines(self):
+        """Text lines of the overlay: one per phase with its rolling p50 and p99."""
+        lines = [f"{'phase':10s} {'p50':>6s} {'p99':>6s} ms"]
+        for name, (p50, p99) in self.percentiles().items():
+            lines.append(f"{name:10s} {p50:6.2f} {p99:6.2f}")
+        return lines
+
+    def write_csv(self, path=None):
+        """Write one row per recorded frame (microseconds per phase); returns the number of rows."""
+        path = path or self.path
+        columns = len(self.phases) + 1
+        samples = self.samples
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['frame'] + [f'{name}_us' for name in self.phases] + ['frame_us'])
+            for row, start in enumerate(range(0, len(samples), columns)):
+                writer.writerow([row] + [value // 1000 for value in samples[start:start + columns]])
+        rows = len(samples) // columns
+        logging.info("Wrote %d profiled frames to %s", rows, path)
+        return rows
@@ -0,0 +1,169 @@
+import pygame
+from grid import piece_cells
+
+
+class DirtyRectRenderer:
+    """Repaint only the parts of the game screen that changed since the last frame.
+
+    Each frame the board is diffed cell by cell against the previous frame,
+    the active piece and ghost footprints against their previous footprints, and the side
+    panel against the values it shows (score, next pieces and both high score lists).
+    Only changed regions are redrawn; render() returns their rects for
+    pygame.display.update and records the repainted area so idle frames can
+    be verified to cost (almost) nothing.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.full_redraw = True
+        self.board_snapshot = None  # Grid.snapshot() (piece id per cell) from the last frame
+        self.piece_snapshot = {}  # (x, y) -> color of the active piece last frame
+        self.ghost_snapshot = {}  # (x, y) -> color of the ghost piece last frame
+        self.panel_snapshot = None
+        self.banner_rect = None  # Level up banner rect while it is on screen
+        self.last_dirty_rects = []
+        self.last_repainted_area = 0
+        self.frames = 0
+        self.total_repainted_area = 0
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen."""
+        self.full_redraw = True
+
+    def panel_rect(self):
+        """Screen area to the right of the board holding the score and tables."""
+        game = self.game
+        board_width = game.grid.width * game.grid.block_size
+        return pygame.Rect(board_width, 0, game.screen_width - board_width, game.screen_height)
+
+    def current_piece_cells(self):
+        """Return {(x, y): color} for the visible blocks of the active piece."""
+        game = self.game
+        tetromino = game.current_tetromino
+        if not tetromino:
+            return {}
+        top, left = game.tetromino_position
+        color = tetromino.get_color()
+        return {(left + x, top + y): color for y, x in piece_cells(tetromino) if top + y >= 0}
+
+    def ghost_cells(self, piece):
+        """Return {(x, y): color} for the ghost piece: the active piece at its landing row.
+
+        The landing row comes from the grid's skyline, so this costs a few
+        steps per frame regardless of how full the board is.
+        """
+        game = self.game
+        tetromino = game.current_tetromino
+        if not tetromino:
+            return {}
+        top, left = game.ghost_position()
+        color = tetromino.get_color()
+        ghost = {(left + x, top + y): color for y, x in piece_cells(tetromino) if top + y >= 0}
+        return {cell: color for cell, color in ghost.items() if cell not in piece}
+
+    def draw_ghost_cell(self, rect, color):
+        pygame.draw.rect(self.game.screen, color, rect, 2)  # Outline only, so it reads as a preview
+
+    def render(self):
+        """Draw the current frame and return the list of rects that changed."""
+        game = self.game
+        grid = game.grid
+        board = grid.snapshot()  # One buffer copy covers occupancy and colors
+        piece = self.current_piece_cells()
+        ghost = self.ghost_cells(piece)
+        profiler = game.profiler
+        if profiler.timing:
+            profiler.lap('piece')
+        panel = (game.score, tuple(game.pieces.preview()), tuple(game.current_session_scores), tuple(game.all_time_high_scores))
+        banner_visible = bool(game.level_up_message)
+
+        self.full_redraw = self.full_redraw or (self.banner_rect is not None and not banner_visible)
+        if self.full_redraw:
+            dirty_rects = self.render_full(ghost)  # Also wipes a banner that just expired
+            repaint_banner = banner_visible
+        else:
+            dirty_rects = self.render_board_changes(board, piece, ghost)
+            if profiler.timing:
+                profiler.lap('board')  # Changed cells, with the piece and ghost blocks on them
+            if panel != self.panel_snapshot:
+                dirty_rects.append(self.render_panel())
+            # Keep the banner on top of anything repainted underneath it
+            repaint_banner = banner_visible and (self.banner_rect is None or self.banner_rect.collidelist(dirty_rects) != -1)
+        if repaint_banner:
+            self.banner_rect = game.draw_level_up()
+            if profiler.timing:
+                profiler.lap('banner')
+            if not self.full_redraw:
+                dirty_rects.append(self.banner_rect)
+        elif not banner_visible:
+            self.banner_rect = None
+
+        self.full_redraw = False
+        self.board_snapshot = board
+        self.piece_snapshot = piece
+        self.ghost_snapshot = ghost
+        self.panel_snapshot = panel
+        self.last_dirty_rects = dirty_rects
+        self.last_repainted_area = sum(rect.width * rect.height for rect in dirty_rects)
+        self.frames += 1
+        self.total_repainted_area += self.last_repainted_area
+        return dirty_rects
+
+    def render_full(self, ghost=None):
+        game = self.game
+        if ghost is None:
+            ghost = self.ghost_cells(self.current_piece_cells())
+        game.screen.fill((0, 0, 0))  # Fill with black background
+        game.grid.draw(game.screen)
+        profiler = game.profiler
+        if profiler.timing:
+            profiler.lap('board')
+        block_size = game.grid.block_size
+        for (x, y), color in ghost.items():
+            self.draw_ghost_cell(pygame.Rect(x * block_size, y * block_size, block_size, block_size), color)
+        game.draw_tetromino()
+        if profiler.timing:
+            profiler.lap('piece')
+        game.draw_panel()
+        return [game.screen.get_rect()]
+
+    def render_board_changes(self, board, piece, ghost):
+        """Repaint board cells whose contents or piece or ghost coverage changed."""
+        game = self.game
+        grid = game.grid
+        width = grid.width
+        changed = set()
+        old_board = self.board_snapshot
+        if board != old_board:  # Idle frames stop at one buffer compare
+            for start in range(0, len(board), width):
+                if board[start:start + width] != old_board[start:start + width]:
+                    y = start // width
+                    changed.update((x, y) for x in range(width) if board[start + x] != old_board[start + x])
+        old_piece = self.piece_snapshot
+        if piece != old_piece:
+            changed.update(cell for cell in old_piece.keys() ^ piece.keys())
+            changed.update(cell for cell, color in piece.items() if old_piece.get(cell, color) != color)
+        old_ghost = self.ghost_snapshot
+        if ghost != old_ghost:
+            changed.update(old_ghost.keys() ^ ghost.keys())
+            changed.update(cell for cell, color in ghost.items() if old_ghost.get(cell, color) != color)
+
+        dirty_rects = []
+        palette = grid.palette
+        for x, y in changed:
+            if not (0 <= x < width and 0 <= y < grid.height):
+                continue
+            piece_id = board[y * width + x]
+            rect = grid.draw_cell(game.screen, x, y, palette[piece_id] if piece_id else None)
+            if (x, y) in piece:
+                pygame.draw.rect(game.screen, piece[(x, y)], rect)
+            elif (x, y) in ghost:
+                self.draw_ghost_cell(rect, ghost[(x, y)])
+            dirty_rects.append(rect)
+        return dirty_rects
+
+    def render_panel(self):
+        rect = self.panel_rect()
+        self.game.screen.fill((0, 0, 0), rect)
+        self.game.draw_panel()
+        return rect
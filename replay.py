@@ -0,0 +1,175 @@
+"""Record the inputs of a session and replay them deterministically.
+
+A replay file is gzip-compressed JSON holding, for every game of the
+session, the piece seed and policy, the board size, the final logic tick
+and score, and every key press as (logic tick, key). Because gravity runs
+in fixed ticks and pieces come from the seed, feeding the same keys at the
+same ticks reproduces the game exactly.
+
+Usage: python replay.py REPLAY [--realtime] [--no-render]
+
+Headless (the default) replays as fast as the CPU allows, rendering only
+the frames the live game would have drawn unless --no-render is given.
+--realtime paces the replay with the wall clock like the live game.
+Both print per-phase timings, so a recorded session doubles as a
+repeatable benchmark.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import pygame
+
+REPLAY_VERSION = 1
+PHASES = ('update', 'input', 'render', 'present')
+
+
+class InputRecorder:
+    """Collect the key presses of every game in a session and write them as a replay file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.games = []
+        self.current = None
+
+    def start_game(self, seed, policy, width, height):
+        self.current = {'seed': seed, 'policy': policy, 'width': width, 'height': height, 'events': []}
+        self.last_tick = 0
+
+    def record(self, tick, key):
+        """Record a key press applied at logic tick `tick` (ticks are stored as deltas)."""
+        if self.current is None:
+            return
+        self.current['events'] += [tick - self.last_tick, key]
+        self.last_tick = tick
+
+    def finish_game(self, tick, score):
+        """Close the current game at logic tick `tick` with its final score."""
+        if self.current is None:
+            return
+        self.current['ticks'] = tick
+        self.current['score'] = score
+        self.games.append(self.current)
+        self.current = None
+
+    def save(self):
+        """Write every finished game to self.path; returns the number of games written."""
+        with gzip.open(self.path, 'wt') as file:
+            json.dump({'version': REPLAY_VERSION, 'games': self.games}, file, separators=(',', ':'))
+        return len(self.games)
+
+
+def load_replay(path):
+    """Return the games of a replay file, with events decoded to absolute (tick, key) pairs."""
+    with gzip.open(path, 'rt') as file:
+        data = json.load(file)
+    if data.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {data.get('version')} in {path}")
+    games = data['games']
+    for game in games:
+        events = []
+        tick = 0
+        deltas = game['events']
+        for index in range(0, len(deltas), 2):
+            tick += deltas[index]
+            events.append((tick, deltas[index + 1]))
+        game['events'] = events
+    return games
+
+
+class ReplayRunner:
+    """Re-execute one recorded game on a TetrisGame and time each phase.
+
+    Logic, input handling and rendering go through the same TetrisGame
+    methods as the live loop; only the source of time (recorded ticks) and
+    of input (recorded keys) differs.
+    """
+
+    def __init__(self, record, realtime=False, render=True):
+        from tetris_game import TetrisGame  # Imported late so main() can pick the SDL drivers first
+        self.record = record
+        self.realtime = realtime
+        self.render = render or realtime
+        self.game = TetrisGame(record['width'], record['height'], seed=record['seed'], piece_policy=record['policy'])
+        self.game.record_scores = False  # Replays never touch the high score tables
+        self.game.restart_game(seed=record['seed'])
+        self.timings = dict.fromkeys(PHASES, 0)  # Phase -> nanoseconds
+        self.frames = 0
+
+    def advance_to(self, tick):
+        """Run logic ticks until the game reaches `tick`, rendering along the way if enabled."""
+        game = self.game
+        while game.tick < tick and not game.game_over:
+            if self.realtime:
+                ticks = min(game.timestep.advance(), tick - game.tick)
+                if not ticks:
+                    pygame.event.pump()  # Keep the window responsive; live input is ignored
+                    game.clock.tick(game.fps)  # Wait for the next tick like the live loop
+                    continue
+            else:
+                ticks = tick - game.tick
+            start = time.perf_counter_ns()
+            game.update(ticks)
+            self.timings['update'] += time.perf_counter_ns() - start
+            self.present()
+
+    def present(self):
+        game = self.game
+        if not self.render or not (game.needs_redraw or game.renderer.full_redraw):
+            return
+        start = time.perf_counter_ns()
+        dirty_rects = game.renderer.render()
+        middle = time.perf_counter_ns()
+        pygame.display.update(dirty_rects)
+        self.timings['render'] += middle - start
+        self.timings['present'] += time.perf_counter_ns() - middle
+        game.needs_redraw = False
+        self.frames += 1
+
+    def run(self):
+        """Replay the game; returns a dict with the outcome and per-phase timings."""
+        game = self.game
+        wall_start = time.perf_counter()
+        for tick, key in self.record['events']:
+            self.advance_to(tick)
+            start = time.perf_counter_ns()
+            game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+            game.after_input()
+            self.timings['input'] += time.perf_counter_ns() - start
+        self.advance_to(self.record['ticks'])
+        self.present()
+        return {
+            'ticks': game.tick,
+            'events': len(self.record['events']),
+            'frames': self.frames,
+            'score': game.score,
+            'matches': game.score == self.record['score'] and game.tick == self.record['ticks'],
+            'seconds': time.perf_counter() - wall_start,
+            'timings': self.timings,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('replay')
+    parser.add_argument('--realtime', action='store_true', help='pace the replay with the wall clock and show it')
+    parser.add_argument('--no-render', action='store_true', help='headless: skip drawing entirely')
+    args = parser.parse_args(argv)
+
+    if not args.realtime:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    games = load_replay(args.replay)
+    for index, record in enumerate(games):
+        result = ReplayRunner(record, realtime=args.realtime, render=not args.no_render).run()
+        status = 'ok' if result['matches'] else f"MISMATCH (recorded score {record['score']}, tick {record['ticks']})"
+        print(f"game {index + 1}: seed {record['seed']}, {result['ticks']} ticks, {result['events']} inputs, "
+              f"{result['frames']} frames, score {result['score']} in {result['seconds']:.3f}s [{status}]")
+        for phase in PHASES:
+            print(f"  {phase:8s} {result['timings'][phase] / 1e6:9.2f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,131 @@
 import pygame
-import sys
-import os
-from tetromino import Tetromino
+from tetromino import Tetromino, ROTATIONS
 from grid import Grid
+from engine import TetrisEngine, LEFT, RIGHT, ROTATE, HARD_DROP
+from renderer import DirtyRectRenderer
+from layers import LayerCache
+from text_cache import TextCache
+from tracing import tracer
+from profiler import FrameProfiler, OVERLAY_REFRESH_FRAMES
+from timestep import FixedTimestep, LOGIC_HZ
+from pieces import PieceQueue
+from replay import InputRecorder
+from autoplayer import AutoPlayer
+from assets import get_asset_manager, PLACE_SOUND, ROW_CLEAR_SOUND, GAME_OVER_SOUND, SOUND_EFFECTS, BACKGROUND_MUSIC
 from datetime import datetime  # Add this import at the beginning of the file
 from high_score_manager import HighScoreManager  # Add this import at the top
 
+# Game states; only PLAYING animates, the others sleep until an event arrives
+PLAYING = 'playing'
+GAME_OVER = 'game_over'
+PAUSED = 'paused'
+PREVIEW_BLOCK_SIZE = 10  # Pixel size of the blocks in the next-piece preview
+IDLE_WAIT_MS = 500  # Longest a non-animating state blocks in pygame.event.wait
+LEVEL_UP_TICKS = 2 * LOGIC_HZ  # The level up banner stays up for 2 seconds
+# Key pressed for each autoplayer action, so its moves go through the same input path as a player's
+AUTOPLAY_KEYS = {LEFT: pygame.K_LEFT, RIGHT: pygame.K_RIGHT, ROTATE: pygame.K_UP, HARD_DROP: pygame.K_SPACE}
+
 class TetrisGame:
-    def __init__(self, width=10, height=20, block_size=30):
+    def __init__(self, width=10, height=20, block_size=30, uncapped=False, seed=None, piece_policy='uniform', record_path=None, profile_path=None, autoplay=False):
         pygame.init()
 
         self.screen_width = width * block_size + 350
         self.screen_height = height * block_size
-        self.fps = 60
+        self.fps = 60  # Frame rate cap while frames are being produced
+        self.uncapped = uncapped  # Benchmarking: render every loop iteration, never sleep
 
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Tetris")
 
-        self.grid = Grid(width, height, block_size)
+        # Seeded piece sequence with a preview of the next pieces; the same seed deals the same game
+        self.pieces = PieceQueue(seed, piece_policy, tetromino_class=Tetromino)
+        # The engine owns the rules; this class adds rendering, sound and input
+        self.engine = TetrisEngine(grid=Grid(width, height, block_size), tetromino_factory=self.pieces)
 
         self.clock = pygame.time.Clock()
 
-        self.current_tetromino = Tetromino()
-        self.tetromino_position = [0, width // 2 - 1]
-
-        self.score = 0
-
         self.drop_time = 0.75
-        self.last_drop_time = pygame.time.get_ticks() / 1000.0
-
-        self.game_over = False
+        self.timestep = FixedTimestep(LOGIC_HZ)  # Logic runs in fixed ticks, independent of the frame rate
+        self.ticks_since_drop = 0
+        self.tick = 0  # Logic ticks since the start of the current game
 
         self.high_score_manager = HighScoreManager()
-        self.all_time_high_scores = self.high_score_manager.load_high_scores()  # Load all-time high scores
-        if self.all_time_high_scores is None:
-            self.all_time_high_scores = []
+        self.all_time_high_scores = list(self.high_score_manager.high_scores)  # Loaded once by the manager
 
         self.current_session_scores = []  # Initialize an empty list for current session scores
 
         self.level_up_message = False
-        self.level_up_timer = 0
+        self.level_up_ticks_left = 0
 
         self.sound_effects_enabled = True
 
-        pygame.mixer.init()
-        self.tetromino_place_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'assets/solidify.mp3'))
-        self.row_clear_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'assets/row_clear.mp3'))
-        self.game_over_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'assets/game_over.mp3'))
-        print("Tetromino placement sound, row clear sound, and game over sound loaded successfully.")
+        # Sounds are shared with the grid and decoded once, in the background, so the first frame is not delayed
+        self.assets = get_asset_manager()
+        self.tetromino_place_sound = self.assets.sound_asset(PLACE_SOUND)
+        self.row_clear_sound = self.assets.sound_asset(ROW_CLEAR_SOUND)
+        self.game_over_sound = self.assets.sound_asset(GAME_OVER_SOUND)
+        self.assets.preload(SOUND_EFFECTS)
 
         self.play_background_music()
 
         self.music_enabled = True
+
+        self.layers = LayerCache()  # Pre-rendered score tables
+        self.text_cache = TextCache()  # Rendered strings, keyed by font size, text and color
+        self.renderer = DirtyRectRenderer(self)  # Repaints only what changed between frames
+        self.needs_redraw = True  # Set by input, gravity and banner changes; frames are only drawn when needed
+        self.frames_rendered = 0
+        self.record_scores = True  # Off for replays, which must not touch the high score tables
+        self.recorder = None
+        self.profiler = FrameProfiler()  # Per-phase frame timings; F3 shows them, on exit they go to CSV
+        if profile_path:
+            self.profiler.enable(profile_path)
+        self.profiler_surface = None  # Rendered overlay text, rebuilt every OVERLAY_REFRESH_FRAMES frames
+        if record_path:
+            self.recorder = InputRecorder(record_path)  # Key presses of every game, for replay.py
+            self.recorder.start_game(self.pieces.seed, piece_policy, width, height)
+        self.autoplayer = AutoPlayer() if autoplay else None  # Soak testing: a bot plays every piece and starts every game
+        self.autoplay_piece = None  # The piece the autoplayer last played
+        self.state = PLAYING
+        self.running = False
         print("Tetris game initialized. Falling delay set to 750ms.")
 
+    @property
+    def grid(self):
+        return self.engine.grid
+
+    @property
+    def current_tetromino(self):
+        return self.engine.current_tetromino
+
+    @current_tetromino.setter
+    def current_tetromino(self, tetromino):
+        self.engine.current_tetromino = tetromino
+
+    @property
+    def tetromino_position(self):
+        return self.engine.tetromino_position
+
+    @tetromino_position.setter
+    def tetromino_position(self, position):
+        self.engine.tetromino_position = position
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @score.setter
+    def score(self, score):
+        self.engine.score = score
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
+
+    @game_over.setter
+    def game_over(self, game_over):
+        self.engine.game_over = game_over
+
     def load_high_scores(self):
         """Load high scores from the HighScoreManager."""
         try:
@@ -63,14 +135,15 @@ class TetrisGame:
             print(f"Error loading high scores: {e}")  # Log error with loading high scores
 
     def play_background_music(self):
-        """Play background music continuously."""
-        pygame.mixer.music.load(os.path.join(os.path.dirname(__file__), 'assets/background_music.mp3'))
-        pygame.mixer.music.set_volume(0.5)  # Set volume (0.0 to 1.0)
-        pygame.mixer.music.play(-1)  # -1 means the music will loop indefinitely
+        """Play background music continuously (silently skipped if the file or audio device is missing)."""
+        if not self.assets.play_music(BACKGROUND_MUSIC, volume=0.5, loops=-1):  # -1 means the music will loop indefinitely
+            print("Background music unavailable; playing without music.")
 
     def toggle_music(self):
         """Toggle the background music on and off."""
-        if self.music_enabled:
+        if not self.assets.mixer_ready():
+            pass  # No audio device: only track the setting
+        elif self.music_enabled:
             pygame.mixer.music.pause()  # Pause the music
             print("Music paused.")
         else:
@@ -102,16 +175,14 @@ class TetrisGame:
         self.all_time_high_scores.sort(key=lambda x: x[0], reverse=True)
         self.all_time_high_scores = self.all_time_high_scores[:5]
 
-        # Save the updated all-time high scores
-        self.high_score_manager.save_high_scores(self.all_time_high_scores)
+        # Queued for the background writer: no disk I/O in the frame the game ends
+        self.high_score_manager.add_high_score(score, timestamp)
         print(f"Current session scores updated: {self.current_session_scores}")
         print(f"All-time high scores updated: {self.all_time_high_scores}")
 
 
     def adjust_drop_speed(self):
         """Adjust the drop speed based on the score."""
-        print(f"Current score: {self.score}, Type: {type(self.score)}")  # Debugging output
-
         if isinstance(self.score, tuple):
             self.score = self.score[0]  # Fix the score if it's a tuple
         if self.score >= 1400:
@@ -135,102 +206,77 @@ class TetrisGame:
         if new_drop_time != self.drop_time:
             self.drop_time = new_drop_time
             self.level_up_message = True  # Set flag to show level up message
-            self.level_up_timer = pygame.time.get_ticks() / 1000.0  # Reset the timer in seconds
+            self.level_up_ticks_left = LEVEL_UP_TICKS  # Restart the banner countdown
             print(f"Drop speed adjusted to: {self.drop_time} seconds, Level Up Message triggered.")  # Log the adjustment
 
-    def draw_high_score_table(self, y_offset):
-        font = pygame.font.Font(None, 24)
-        x_offset = self.grid.width * self.grid.block_size + 20
-
-        # Title for the high score table
-        title_surface = font.render('Current Session', True, (255, 255, 255))
-        self.screen.blit(title_surface, (x_offset, y_offset))
-
-        y_offset += 30  # Move Y position down for the header
-
-        # Draw the header background with increased width
-        header_background_rect = pygame.Rect(x_offset, y_offset, 320, 30)  # Increased width
-        pygame.draw.rect(self.screen, (128, 128, 128), header_background_rect)  # Grey background
-
-        # Draw the header text ("Score" and "Time") with adjusted position
-        header_surface = font.render('Score                           Time', True, (0, 0, 0))  # Black text
-        self.screen.blit(header_surface, (x_offset + 10, y_offset + 5))  # Adjust for padding
-
-        y_offset += 30  # Move Y position down for the actual scores
-
-        # Draw each high score entry
-        for index, (score, timestamp) in enumerate(self.current_session_scores[:5]):  # Limit to top 5 scores
-            score_surface = font.render(f'{score:04}', True, (255, 255, 255))  # White text for score
-            time_surface = font.render(timestamp, True, (255, 255, 255))  # White text for timestamp
-            self.screen.blit(score_surface, (x_offset + 10, y_offset + 5 + index * 30))  # Move text downwards slightly
-            self.screen.blit(time_surface, (x_offset + 160, y_offset + 5 + index * 30))  # Move text downwards and to the right
-
-        # Draw grid lines around the current session table
+    def table_chrome(self, title, x_offset, y_offset):
+        """Title, header and grid lines of a score table, rendered once per position."""
         table_width = 320  # Adjusted width of the table to match the header
         table_height = 150  # Adjusted height of the table
-        grid_color = (128, 128, 128)  # Grey color for gridlines
 
-        # Draw vertical lines
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset - 30), (x_offset, y_offset + table_height), 1)  # Left border
-        pygame.draw.line(self.screen, grid_color, (x_offset + table_width, y_offset - 30), (x_offset + table_width, y_offset + table_height), 1)  # Right border
-        pygame.draw.line(self.screen, grid_color, (x_offset + 150, y_offset - 30), (x_offset + 150, y_offset + table_height), 1)  # Vertical line slightly to the left
-
-        # Draw horizontal lines
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset - 30), (x_offset + table_width, y_offset - 30), 1)  # Top border
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset + table_height), (x_offset + table_width, y_offset + table_height), 1)  # Bottom border
-        for i in range(1, 6):  # Draw horizontal lines for each row in the table
-            pygame.draw.line(self.screen, grid_color, (x_offset, y_offset + i * 30), (x_offset + table_width, y_offset + i * 30), 1)
+        def build():
+            chrome = pygame.Surface((table_width + 1, 60 + table_height + 1))
+            chrome.fill((0, 0, 0))
+
+            # Title for the table
+            title_surface = self.text_cache.render(title, 24, (255, 255, 255))
+            chrome.blit(title_surface, (0, 0))
+
+            # Draw the header background with increased width
+            header_background_rect = pygame.Rect(0, 30, table_width, 30)  # Increased width
+            pygame.draw.rect(chrome, (128, 128, 128), header_background_rect)  # Grey background
+
+            # Draw the header text ("Score" and "Time") with adjusted position
+            header_surface = self.text_cache.render('Score                           Time', 24, (0, 0, 0))  # Black text
+            chrome.blit(header_surface, (10, 35))  # Adjust for padding
+
+            # Draw grid lines around the table
+            grid_color = (128, 128, 128)  # Grey color for gridlines
+            top, bottom = 30, 60 + table_height
+
+            # Draw vertical lines
+            pygame.draw.line(chrome, grid_color, (0, top), (0, bottom), 1)  # Left border
+            pygame.draw.line(chrome, grid_color, (table_width, top), (table_width, bottom), 1)  # Right border
+            pygame.draw.line(chrome, grid_color, (150, top), (150, bottom), 1)  # Vertical line slightly to the left
+
+            # Draw horizontal lines
+            pygame.draw.line(chrome, grid_color, (0, top), (table_width, top), 1)  # Top border
+            pygame.draw.line(chrome, grid_color, (0, bottom), (table_width, bottom), 1)  # Bottom border
+            for i in range(1, 6):  # Draw horizontal lines for each row in the table
+                pygame.draw.line(chrome, grid_color, (0, 60 + i * 30), (table_width, 60 + i * 30), 1)
+            return chrome
+
+        return self.layers.get(('table', title), (x_offset, y_offset), build)
+
+    def table_surface(self, title, x_offset, y_offset, rows):
+        """Complete score table (chrome plus entries), re-rendered only when its rows change."""
+        def build():
+            table = self.table_chrome(title, x_offset, y_offset).copy()
+            # Draw each high score entry
+            for index, (score_text, timestamp) in enumerate(rows):
+                score_surface = self.text_cache.render(score_text, 24, (255, 255, 255))  # White text for score
+                time_surface = self.text_cache.render(timestamp, 24, (255, 255, 255))  # White text for timestamp
+                table.blit(score_surface, (10, 65 + index * 30))  # Move text downwards slightly
+                table.blit(time_surface, (160, 65 + index * 30))  # Move text downwards and to the right
+            return table
+
+        return self.layers.get(('table rows', title), (x_offset, y_offset, tuple(rows)), build)
 
+    def draw_high_score_table(self, y_offset):
+        x_offset = self.grid.width * self.grid.block_size + 20
+        rows = [(f'{score:04}', timestamp) for score, timestamp in self.current_session_scores[:5]]  # Limit to top 5 scores
+        self.screen.blit(self.table_surface('Current Session', x_offset, y_offset, rows), (x_offset, y_offset))
 
     def draw_high_scores(self, y_offset):
-        font = pygame.font.Font(None, 24)  # Use default font and size 24
         x_offset = self.grid.width * self.grid.block_size + 20  # Position to the right of the grid
-
-        # Draw the title for high scores
-        title_surface = font.render('High Scores', True, (255, 255, 255))  # White color
-        self.screen.blit(title_surface, (x_offset, y_offset))
-
-        y_offset += 30  # Move Y position down for the header
-
-        # Draw the header background with increased width
-        header_background_rect = pygame.Rect(x_offset, y_offset, 320, 30)  # Increased width
-        pygame.draw.rect(self.screen, (128, 128, 128), header_background_rect)  # Grey background
-
-        # Draw the header text ("Score" and "Time") with adjusted position
-        header_surface = font.render('Score                           Time', True, (0, 0, 0))  # Black text
-        self.screen.blit(header_surface, (x_offset + 10, y_offset + 5))  # Adjust for padding
-
-        y_offset += 30  # Move Y position down for the actual scores
-
-        # Draw each high score entry
-        for index, (score, timestamp) in enumerate(self.all_time_high_scores[:5]):  # Limit to top 5 scores
-            score_surface = font.render(f'{index + 1}. {score:04}', True, (255, 255, 255))  # White text for score
-            time_surface = font.render(timestamp, True, (255, 255, 255))  # White text for timestamp
-            self.screen.blit(score_surface, (x_offset + 10, y_offset + 5 + index * 30))  # Move text downwards slightly
-            self.screen.blit(time_surface, (x_offset + 160, y_offset + 5 + index * 30))  # Move text downwards and to the right
-
-        # Draw grid lines around the all-time high score table
-        table_width = 320  # Adjusted width of the table to match the header
-        table_height = 150  # Adjusted height of the table
-        grid_color = (128, 128, 128)  # Grey color for gridlines
-
-        # Draw vertical lines
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset - 30), (x_offset, y_offset + table_height), 1)  # Left border
-        pygame.draw.line(self.screen, grid_color, (x_offset + table_width, y_offset - 30), (x_offset + table_width, y_offset + table_height), 1)  # Right border
-        pygame.draw.line(self.screen, grid_color, (x_offset + 150, y_offset - 30), (x_offset + 150, y_offset + table_height), 1)  # Vertical line slightly to the left
-
-        # Draw horizontal lines
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset - 30), (x_offset + table_width, y_offset - 30), 1)  # Top border
-        pygame.draw.line(self.screen, grid_color, (x_offset, y_offset + table_height), (x_offset + table_width, y_offset + table_height), 1)  # Bottom border
-        for i in range(1, 6):  # Draw horizontal lines for each row in the table
-            pygame.draw.line(self.screen, grid_color, (x_offset, y_offset + i * 30), (x_offset + table_width, y_offset + i * 30), 1)
-
+        rows = [(f'{index + 1}. {score:04}', timestamp) for index, (score, timestamp) in enumerate(self.all_time_high_scores[:5])]  # Limit to top 5 scores
+        self.screen.blit(self.table_surface('High Scores', x_offset, y_offset, rows), (x_offset, y_offset))
 
     def draw_game_over(self):
-        font = pygame.font.Font(None, 20)  # Adjusted font size for the game over message
-        game_over_surface = font.render('GAME OVER', True, (255, 0, 0))  # Red color
-        score_surface = font.render(f'Score: {self.score:04}', True, (255, 255, 255))  # Format final score to 4 digits
-        prompt_surface = font.render("Press 'N' for a new game", True, (255, 255, 255))  # New prompt for starting a new game
+        # Adjusted font size (20) for the game over message
+        game_over_surface = self.text_cache.render('GAME OVER', 20, (255, 0, 0))  # Red color
+        score_surface = self.text_cache.render(f'Score: {self.score:04}', 20, (255, 255, 255))  # Format final score to 4 digits
+        prompt_surface = self.text_cache.render("Press 'N' for a new game", 20, (255, 255, 255))  # New prompt for starting a new game
 
         # Adjust the rectangle width and height to ensure it fits all text neatly
         text_height = max(game_over_surface.get_height(), score_surface.get_height(), prompt_surface.get_height())
@@ -263,120 +309,335 @@ class TetrisGame:
         # Log the calculated rectangle dimensions before drawing
         print(f"Final Game Over Rectangle Dimensions - Width: {rect_width}, Height: {rect_height}")
 
-        # Allow for immediate input handling
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_n:  # Check for 'N' key press
-                        self.restart_game()  # Restart the game
-                        self.game_over = False  # Reset game over flag
-                        waiting = False  # Exit the waiting loop
-                    elif event.key == pygame.K_ESCAPE:  # Allow quitting the game
-                        pygame.quit()
-                        sys.exit()
-        print("Game restarted from game over screen.")  # Log for debugging
-
-    def restart_game(self):
-        """Reset the game state for a new game."""
-        self.grid.reset()  # Reset the grid
-        self.current_tetromino = Tetromino()  # Create a new tetromino
-        self.tetromino_position = [0, self.grid.width // 2 - 1]  # Reset tetromino position
-        self.score = 0  # Reset the score
-        self.last_drop_time = pygame.time.get_ticks() / 1000.0  # Reset drop time to current time
+    def restart_game(self, seed=None):
+        """Reset the game state for a new game (dealing the pieces of `seed`, if given)."""
+        self.engine.reset(seed)  # Reset the grid, score and tetromino
+        self.timestep.reset()  # Time spent on the game over screen does not count
+        self.drop_time = 0.75  # Back to the starting speed before the first tick of the new game
+        self.ticks_since_drop = 0
+        self.tick = 0
+        self.level_up_ticks_left = 0
+        if self.recorder:
+            self.recorder.start_game(self.pieces.seed, self.pieces.policy_name, self.grid.width, self.grid.height)
         self.game_over = False  # Ensure game_over is reset
         self.level_up_message = False  # Reset level up message flag
+        self.renderer.invalidate()  # The game over screen covered the board
+        self.state = PLAYING
         print("Game restarted.")
 
+    def end_game(self):
+        """Enter the game over state: record the score, play the sound and show the game over screen."""
+        if self.state == GAME_OVER:
+            return
+        self.game_over = True  # Set game over flag
+        self.state = GAME_OVER
+        if self.recorder:
+            self.recorder.finish_game(self.tick, self.score)
+        if self.record_scores:
+            self.add_high_score(self.score)  # Add the current score to high scores
+        if self.sound_effects_enabled:  # Check if sound effects are enabled before playing sound
+            self.grid.play_game_over_sound()  # Play sound effect for game over
+        self.draw_game_over()  # Call to display "Game Over"
+
+    def pause(self):
+        """Freeze the game and show the pause overlay."""
+        if self.state != PLAYING:
+            return
+        self.state = PAUSED
+        self.draw_paused()
+
+    def resume(self):
+        """Leave the pause state without counting the paused time towards gravity."""
+        if self.state != PAUSED:
+            return
+        self.state = PLAYING
+        self.timestep.reset()  # Paused time does not count towards gravity
+        self.renderer.invalidate()  # The pause overlay covered the board
+
+    def draw_paused(self):
+        paused_surface = self.text_cache.render('PAUSED', 48, (255, 255, 255))
+        prompt_surface = self.text_cache.render("Press 'P' to resume", 20, (255, 255, 255))
+        board_width = self.grid.width * self.grid.block_size
+        box = pygame.Rect(0, 0, max(paused_surface.get_width(), prompt_surface.get_width()) + 40,
+                          paused_surface.get_height() + prompt_surface.get_height() + 30)
+        box.center = (board_width // 2, self.screen_height // 2)
+        pygame.draw.rect(self.screen, (0, 0, 0), box)  # Black box over the board
+        pygame.draw.rect(self.screen, (255, 255, 255), box, 3)  # White border
+        self.screen.blit(paused_surface, paused_surface.get_rect(midtop=(box.centerx, box.top + 10)))
+        self.screen.blit(prompt_surface, prompt_surface.get_rect(midbottom=(box.centerx, box.bottom - 10)))
+        pygame.display.flip()
+
     def run(self):
-        running = True
-        while running:
+        self.running = True
+        while self.running:
             try:
-                if self.game_over:  # If game is over, skip the game logic
-                    continue
-
-                current_time = pygame.time.get_ticks() / 1000.0  # Get the current time in seconds
-                if current_time - self.last_drop_time >= self.drop_time:
-                    print("Tetromino is about to drop.")
-                    self.move_tetromino(0, 1)  # Move tetromino down
-                    self.last_drop_time = current_time  # Reset the last drop time
-
-                self.adjust_drop_speed()  # Call to adjust drop speed based on score
-
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_LEFT:
-                            self.move_tetromino(-1, 0)  # Move left
-                        elif event.key == pygame.K_RIGHT:
-                            self.move_tetromino(1, 0)  # Move right
-                        elif event.key == pygame.K_DOWN:
-                            self.move_tetromino(0, 1)  # Move down
-                        elif event.key == pygame.K_UP:
-                            self.rotate_tetromino()  # Rotate
-                        elif event.key == pygame.K_m:  # Check for 'M' key press
-                            self.toggle_music()  # Toggle music
-                        elif event.key == pygame.K_s:  # Check for 'S' key press
-                            self.toggle_sound_effects()  # Toggle sound effects
-
-                self.screen.fill((0, 0, 0))  # Fill with black background
-
-                self.grid.draw(self.screen)
-
-                self.draw_tetromino()
-
-                self.draw_score()  # Draw the current score
-                current_session_offset = 60  # Adjust as necessary to create space between sections
-                self.draw_high_score_table(current_session_offset)
-
-                all_time_high_scores_offset = current_session_offset + 240  # Adjust as necessary based on the height of the session table
-                self.draw_high_scores(all_time_high_scores_offset)
-
-                # Check for game over condition after placing the tetromino
-                if self.check_game_over():
-                    self.game_over = True  # Set game over flag
-                    self.add_high_score(self.score)  # Add the current score to high scores
-                    if self.sound_effects_enabled:  # Check if sound effects are enabled before playing sound
-                        self.grid.play_game_over_sound()  # Play sound effect for game over
-                    self.draw_game_over()  # Call to display "Game Over"
-                    continue  # Skip to next iteration to wait for user input
-
-                if self.level_up_message:
-                    if (current_time - self.level_up_timer) < 2:  # Display for 2 seconds
-                        # Create a white box behind the level up text
-                        level_up_surface = pygame.font.Font(None, 48).render('Level Up!', True, (0, 0, 0))  # Black text
-                        box_width = level_up_surface.get_width() + 20  # Add padding to the box width
-                        box_height = level_up_surface.get_height() + 10  # Add padding to the box height
-                        box_x = self.screen_width // 2 - box_width // 2  # Center the box horizontally
-                        box_y = self.screen_height // 2 - box_height // 2  # Center the box vertically
-
-                        # Draw the white box
-                        pygame.draw.rect(self.screen, (255, 255, 255), (box_x, box_y, box_width, box_height))  # White box
-                        self.screen.blit(level_up_surface, (self.screen_width // 2 - level_up_surface.get_width() // 2, self.screen_height // 2 - level_up_surface.get_height() // 2))  # Draw text
-                        print("Level Up message displayed with background box.")  # Log when the message is displayed
-                    else:
-                        self.level_up_message = False  # Reset the level up message flag after display time
-                        print("Level Up message cleared.")  # Log when the message is cleared
-
-                pygame.display.flip()
-                self.clock.tick(self.fps)
-
+                if self.state == PLAYING:
+                    self.play_frame()
+                elif self.state == GAME_OVER and self.autoplayer:
+                    self.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_n))  # The bot starts the next game
+                else:
+                    self.wait_for_events()  # Nothing animates: sleep until input instead of spinning
             except Exception as e:
                 print(f"An error occurred: {e}")
-
+                if tracer.enabled:
+                    tracer.instant('error', 'error', {'exception': repr(e)})
+
+        if self.recorder:
+            self.recorder.finish_game(self.tick, self.score)  # A game quit midway is kept too
+            print(f"Recorded {self.recorder.save()} game(s) to {self.recorder.path}")
+        if self.profiler.frames:
+            print(f"Wrote {self.profiler.write_csv()} profiled frames to {self.profiler.path}")
+        self.high_score_manager.close()  # Fold this session's scores into the snapshot and wait for the writer
         pygame.quit()
         print("Tetris game exited.")
 
+    def wait_for_events(self):
+        """Block until an event arrives (or IDLE_WAIT_MS passes), then handle every pending event."""
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        if event.type == pygame.NOEVENT:
+            return
+        for event in [event] + pygame.event.get():
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        """Apply one pygame event according to the current state."""
+        self.needs_redraw = True  # Input may have changed what is on screen
+        if event.type == pygame.QUIT:
+            self.running = False
+            return
+        if event.type == pygame.WINDOWEXPOSED and self.state != PLAYING:
+            if self.state == GAME_OVER:  # Window content was lost; redraw the overlay
+                self.draw_game_over()
+            else:
+                self.draw_paused()
+            return
+        if event.type != pygame.KEYDOWN:
+            return
+        if self.recorder:
+            self.recorder.record(self.tick, event.key)
+        if event.key == pygame.K_m:  # Check for 'M' key press
+            self.toggle_music()  # Toggle music
+        elif event.key == pygame.K_s:  # Check for 'S' key press
+            self.toggle_sound_effects()  # Toggle sound effects
+        elif event.key == pygame.K_F9 and tracer.enabled:  # Dump the trace buffer on demand
+            tracer.dump()
+        elif event.key == pygame.K_F3:  # Toggle the frame profiler overlay
+            self.toggle_profiler_overlay()
+        elif self.state == GAME_OVER:
+            if event.key == pygame.K_n:  # Check for 'N' key press
+                self.restart_game()  # Restart the game
+            elif event.key == pygame.K_ESCAPE:  # Allow quitting the game
+                self.running = False
+        elif self.state == PAUSED:
+            if event.key == pygame.K_p:
+                self.resume()
+            elif event.key == pygame.K_ESCAPE:
+                self.running = False
+        elif event.key == pygame.K_LEFT:
+            self.move_tetromino(-1, 0)  # Move left
+        elif event.key == pygame.K_RIGHT:
+            self.move_tetromino(1, 0)  # Move right
+        elif event.key == pygame.K_DOWN:
+            self.move_tetromino(0, 1)  # Move down
+        elif event.key == pygame.K_UP:
+            self.rotate_tetromino()  # Rotate
+        elif event.key == pygame.K_SPACE:
+            self.hard_drop()  # Drop to the ghost position and lock
+        elif event.key == pygame.K_p:
+            self.pause()
+
+    @property
+    def drop_ticks(self):
+        """Gravity interval in logic ticks."""
+        return max(1, round(self.drop_time * LOGIC_HZ))
+
+    def update(self, ticks):
+        """Advance the game logic by `ticks` fixed steps: gravity and the level up banner countdown."""
+        for _ in range(ticks):
+            self.tick += 1
+            self.ticks_since_drop += 1
+            if self.ticks_since_drop >= self.drop_ticks:
+                self.ticks_since_drop = 0
+                self.move_tetromino(0, 1)  # Move tetromino down
+                self.needs_redraw = True
+                if self.profiler.timing:
+                    self.profiler.lap('gravity')
+                if self.state != PLAYING:
+                    return  # Gravity locked the last piece
+                self.adjust_drop_speed()  # Call to adjust drop speed based on score
+                if self.profiler.timing:
+                    self.profiler.lap('drop_speed')
+            if self.level_up_ticks_left:
+                self.level_up_ticks_left -= 1
+                if not self.level_up_ticks_left and self.level_up_message:  # Display for 2 seconds
+                    self.level_up_message = False  # Reset the level up message flag after display time
+                    self.needs_redraw = True
+                    print("Level Up message cleared.")  # Log when the message is cleared
+
+    def play_frame(self):
+        """Run the logic ticks that are due, handle input and repaint if anything changed."""
+        tracing = tracer.enabled  # Sampled once so a frame is traced completely or not at all
+        if tracing:
+            frame_start = phase_start = tracer.now()
+        profiler = self.profiler
+        if profiler.enabled:
+            profiler.begin_frame()
+
+        ticks = self.timestep.advance()
+        self.update(ticks)
+        if profiler.timing:
+            profiler.lap('gravity')
+        if tracing:
+            phase_start = tracer.complete('update', phase_start, args={'ticks': ticks})
+        if self.state != PLAYING:
+            if profiler.timing:
+                profiler.end_frame()  # The frame that ended the game, with end_game's score writes, is kept
+            return  # Gravity locked the last piece; input is handled by the game over state
+
+        for event in pygame.event.get():
+            self.handle_event(event)
+            if self.state != PLAYING:
+                break  # The rest of the events belong to the new state
+        if self.autoplayer and self.state == PLAYING:
+            self.autoplay()
+        if profiler.timing:
+            profiler.lap('events')
+        if tracing:
+            phase_start = tracer.complete('input', phase_start)
+        self.after_input()
+        if self.state != PLAYING:
+            if profiler.timing:
+                profiler.end_frame()
+            return
+
+        if self.needs_redraw or self.renderer.full_redraw or self.uncapped:
+            # Repaint and push to the display only the regions that changed
+            dirty_rects = self.renderer.render()
+            if profiler.overlay:
+                dirty_rects.append(self.draw_profiler_overlay())
+                if profiler.timing:
+                    profiler.lap('overlay')
+            if tracing:
+                phase_start = tracer.complete('render', phase_start, args={'rects': len(dirty_rects)})
+            pygame.display.update(dirty_rects)
+            self.text_cache.end_frame()  # Close this frame's text cache hit/miss counters
+            self.needs_redraw = False
+            self.frames_rendered += 1
+            if profiler.timing:
+                profiler.lap('present')
+            if tracing:
+                phase_start = tracer.complete('present', phase_start)
+            if not self.uncapped:
+                self.clock.tick(self.fps)  # Cap the frame rate while things are changing
+        elif not self.uncapped:
+            self.sleep_until_due()
+        if profiler.timing:
+            profiler.lap('wait')
+            profiler.end_frame()
+        if tracing:
+            tracer.complete('sleep', phase_start)
+            tracer.complete('frame', frame_start)
+
+    def autoplay(self):
+        """Let the autoplayer play a newly spawned piece by pressing its keys."""
+        if self.current_tetromino is self.autoplay_piece:
+            return
+        self.autoplay_piece = self.current_tetromino
+        for action in self.autoplayer.plan_engine(self.engine):
+            self.handle_event(pygame.event.Event(pygame.KEYDOWN, key=AUTOPLAY_KEYS[action]))
+            if self.state != PLAYING:
+                break
+
+    def after_input(self):
+        """Apply the consequences of the events just handled: speed changes and game over."""
+        self.adjust_drop_speed()
+        if self.profiler.timing:
+            self.profiler.lap('drop_speed')
+        # A placement that ended the game switched the state already; this also catches external changes
+        if self.state == PLAYING and (self.game_over or self.check_game_over()):
+            self.end_game()
+
+    def sleep_until_due(self):
+        """Nothing to draw: block until input arrives or the next gravity step or banner change is due."""
+        ticks = self.drop_ticks - self.ticks_since_drop
+        if self.level_up_ticks_left:
+            ticks = min(ticks, self.level_up_ticks_left)
+        timeout_ms = max(1, self.timestep.ns_until_tick(ticks) // 1_000_000)
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self.handle_event(event)
+            self.after_input()
+
+    def draw_panel(self):
+        """Draw the score, the next pieces and both high score tables to the right of the grid."""
+        self.draw_score()  # Draw the current score
+        self.draw_preview()
+        if self.profiler.timing:
+            self.profiler.lap('score')
+        current_session_offset = 60  # Adjust as necessary to create space between sections
+        self.draw_high_score_table(current_session_offset)
+
+        all_time_high_scores_offset = current_session_offset + 240  # Adjust as necessary based on the height of the session table
+        self.draw_high_scores(all_time_high_scores_offset)
+        if self.profiler.timing:
+            self.profiler.lap('tables')
+
+    def toggle_profiler_overlay(self):
+        """Show or hide the frame profiler overlay (F3)."""
+        self.profiler.show_overlay(not self.profiler.overlay)
+        self.profiler_surface = None
+        if not self.profiler.overlay:
+            self.renderer.invalidate()  # Repaint what the overlay covered
+
+    def draw_profiler_overlay(self):
+        """Draw the rolling p50/p99 of each frame phase in the top left corner and return its rect."""
+        profiler = self.profiler
+        if self.profiler_surface is None or profiler.frames % OVERLAY_REFRESH_FRAMES == 0:
+            font = self.text_cache.font(18)  # Rendered directly: the numbers change too often to cache
+            lines = [font.render(line, True, (255, 255, 255)) for line in profiler.overlay_lines()]
+            previous = self.profiler_surface.get_size() if self.profiler_surface else (0, 0)
+            # The box only grows, so a shorter text never leaves part of the old box on screen
+            width = max(previous[0], max(line.get_width() for line in lines) + 10)
+            height = max(previous[1], sum(line.get_height() for line in lines) + 10)
+            self.profiler_surface = pygame.Surface((width, height))
+            y = 5
+            for line in lines:
+                self.profiler_surface.blit(line, (5, y))
+                y += line.get_height()
+        return self.screen.blit(self.profiler_surface, (5, 5))
+
+    def draw_level_up(self):
+        """Draw the Level Up banner centered on screen and return its rect."""
+        # Create a white box behind the level up text
+        level_up_surface = self.text_cache.render('Level Up!', 48, (0, 0, 0))  # Black text
+        box_width = level_up_surface.get_width() + 20  # Add padding to the box width
+        box_height = level_up_surface.get_height() + 10  # Add padding to the box height
+        box_x = self.screen_width // 2 - box_width // 2  # Center the box horizontally
+        box_y = self.screen_height // 2 - box_height // 2  # Center the box vertically
+
+        # Draw the white box
+        box_rect = pygame.draw.rect(self.screen, (255, 255, 255), (box_x, box_y, box_width, box_height))  # White box
+        self.screen.blit(level_up_surface, (self.screen_width // 2 - level_up_surface.get_width() // 2, self.screen_height // 2 - level_up_surface.get_height() // 2))  # Draw text
+        if tracer.enabled:
+            tracer.instant('level_up', 'render', {'ticks_left': self.level_up_ticks_left})
+        return box_rect
+
     def draw_score(self):
-        font = pygame.font.Font(None, 36)  # Use default font and size 36
         score = self.score if isinstance(self.score, int) else self.score[0]
-        score_surface = font.render(f'Score: {score:04}', True, (255, 255, 255))  # Ensure score is an integer
+        score_surface = self.text_cache.render(f'Score: {score:04}', 36, (255, 255, 255))  # Default font at size 36, re-rendered only when the text changes
         self.screen.blit(score_surface, (self.grid.width * self.grid.block_size + 20, 20))  # Position to the right of the grid
 
+    def draw_preview(self):
+        """Draw the upcoming pieces in a row to the right of the score."""
+        x = self.grid.width * self.grid.block_size + 180
+        for shape in self.pieces.preview():
+            state = ROTATIONS[shape][0]
+            color = Tetromino.colors[shape]
+            for dy, dx in state.cells:
+                pygame.draw.rect(self.screen, color, (x + dx * PREVIEW_BLOCK_SIZE, 20 + dy * PREVIEW_BLOCK_SIZE,
+                                                      PREVIEW_BLOCK_SIZE - 1, PREVIEW_BLOCK_SIZE - 1))
+            x += (state.width + 1) * PREVIEW_BLOCK_SIZE
+
     def draw_tetromino(self):
         if self.current_tetromino:  # Check if current tetromino is valid
             shape = self.current_tetromino.current_shape  # Use the current shape matrix
@@ -384,83 +645,56 @@ class TetrisGame:
 
             #print(f"Drawing Tetromino: shape: {shape}, color: {color}")
 
+            block_size = self.grid.block_size  # Same cell geometry as the incremental frames
             for y, row in enumerate(shape):
                 for x, block in enumerate(row):
                     if block:  # If the block is part of the tetromino
-                        rect = pygame.Rect((self.tetromino_position[1] + x) * 30,
-                                           (self.tetromino_position[0] + y) * 30,
-                                           30, 30)
+                        rect = pygame.Rect((self.tetromino_position[1] + x) * block_size,
+                                           (self.tetromino_position[0] + y) * block_size,
+                                           block_size, block_size)
                         pygame.draw.rect(self.screen, color, rect)
 
     def move_tetromino(self, dx, dy):
-        new_position = [self.tetromino_position[0] + dy, self.tetromino_position[1] + dx]
-        #print(f"Attempting to move tetromino to {new_position}")
-
-        if self.grid.is_valid_position(self.current_tetromino, new_position):
-            self.tetromino_position = new_position
-            #print(f"Moved tetromino to position: {self.tetromino_position}")
-        else:
+        if not self.engine.try_move(dx, dy):
             if dy == 1:  # If moving down and collision occurs, place the tetromino
-                print("Tetromino cannot move down further, placing tetromino")
                 self.place_current_tetromino()
 
+    def hard_drop(self):
+        """Move the active tetromino to its landing row and lock it there."""
+        self.engine.tetromino_position = self.engine.landing_position()
+        self.place_current_tetromino()
+
+    def ghost_position(self):
+        """Landing position of the active tetromino, drawn as the ghost piece."""
+        return self.engine.landing_position()
+
     def check_game_over(self):
         """Check if the game is over (i.e., if a new tetromino collides on spawn)."""
-        if not self.grid.is_valid_position(self.current_tetromino, self.tetromino_position):
+        if self.engine.check_game_over():
             print("Game Over: New tetromino cannot be placed.")
             return True
         return False
 
     def place_current_tetromino(self):
         try:
-            filled_rows = self.grid.place_tetromino(self.current_tetromino, self.tetromino_position, self.sound_effects_enabled)
-            print(f"place_current_tetromino: Filled rows: {filled_rows}")  # Debug print for filled rows
+            filled_rows = self.engine.place_current_tetromino(self.sound_effects_enabled)  # Lock, score and spawn the next tetromino
             if filled_rows > 0:
-                self.update_score(filled_rows)
                 if self.sound_effects_enabled:  # Check if sound effects are enabled before playing sound
                     self.grid.row_clear_sound.play()  # Play sound effect when rows are cleared
-            else:
-                print("No rows filled, update_score not called.")
 
             # Play the sound effect when a tetromino is placed
             if self.sound_effects_enabled:  # Check if sound effects are enabled before playing sound
                 self.tetromino_place_sound.play()  # Play the sound effect when a tetromino is placed
 
-            # Create a new tetromino
-            self.current_tetromino = Tetromino()  # Create a new tetromino
-            self.tetromino_position = [0, self.grid.width // 2 - 1]  # Reset position
-
-            # Check for game over condition immediately after placing the tetromino
-            if self.check_game_over():
+            # The engine checks for game over immediately after spawning the next tetromino
+            if self.game_over:
                 print("Game Over: New tetromino cannot be placed.")
-                self.add_high_score(self.score)  # Add the current score to high scores
-                if self.sound_effects_enabled:  # Check if sound effects are enabled before playing sound
-                    self.grid.play_game_over_sound()  # Play sound effect for game over
-                self.draw_game_over()  # Call the method to display "Game Over"
+                self.end_game()  # Switch to the game over state; run() then waits for input
         except (IndexError, ValueError) as e:  # Catch specific exceptions
             print(f"Error placing tetromino: {e}")  # Log the error message
 
     def update_score(self, filled_rows):
-        print(f"update_score: Filled rows cleared: {filled_rows}")  # Debug print cleared rows
-        self.score += filled_rows * 100  # Increment score by 100 for each row cleared
-        print(f"update_score: Score updated: {self.score}")  # Debug print the updated score
+        self.engine.update_score(filled_rows)  # Increment score by 100 for each row cleared
 
     def rotate_tetromino(self):
-        original_shape = self.current_tetromino.current_shape  # Backup the original shape
-
-        if self.current_tetromino.rotate(self.grid.get_state(), self.tetromino_position):
-            if not self.grid.is_valid_position(self.current_tetromino, self.tetromino_position):
-                self.current_tetromino.current_shape = original_shape
-                print(f"Collision detected, reverting rotation. Current position: {self.tetromino_position}, Original shape: {original_shape}")
-            else:
-                print("Tetromino rotated successfully.")
-        else:
-            print("Rotation failed, shape remains unchanged.")
-        print(f'High Scores List: {self.all_time_high_scores}')  # Log high scores for debugging
-        for index, entry in enumerate(self.all_time_high_scores[:5]):  # Log top 5 high scores
-            print(f'Entry at index {index}: {entry}, Type: {type(entry)}')  # Log entry and its type
-            if isinstance(entry, tuple) and len(entry) == 2:
-                score, timestamp = entry
-                print(f'Rendering Score: {score}, Timestamp: {timestamp}')  # Log score and timestamp before rendering
-            else:
-                print(f'Unexpected entry format at index {index}: {entry}')  # Log unexpected format
\ No newline at end of file
+        self.engine.rotate_tetromino()  # The engine traces the outcome
@@ -1,4 +1,30 @@
 import random
+from collections import namedtuple
+from tracing import tracer
+
+# One precomputed orientation of a shape: the matrix as a tuple of tuples, the
+# (dy, dx) offsets of its blocks, and its bounding box width and height.
+RotationState = namedtuple('RotationState', ['matrix', 'cells', 'width', 'height'])
+
+
+def rotate_matrix(matrix):
+    """Rotate a shape matrix 90 degrees clockwise."""
+    return tuple(zip(*matrix[::-1]))
+
+
+def matrix_cells(matrix):
+    """Return the (dy, dx) offsets of the blocks in a shape matrix."""
+    return tuple((y, x) for y, row in enumerate(matrix) for x, block in enumerate(row) if block)
+
+
+def build_rotations(matrix):
+    """Return the four RotationStates of a shape, starting from its spawn matrix."""
+    states = []
+    matrix = tuple(tuple(row) for row in matrix)
+    for _ in range(4):
+        states.append(RotationState(matrix, matrix_cells(matrix), len(matrix[0]), len(matrix)))
+        matrix = rotate_matrix(matrix)
+    return tuple(states)
 
 class Tetromino:
     shapes = {
@@ -27,16 +53,48 @@ class Tetromino:
         'Z': (255, 0, 0)     # Red
     }
 
-    def __init__(self):
-        self.shape = self.random_shape()
+    def __init__(self, shape=None, rotation=0):
+        self.shape = shape if shape is not None else self.random_shape()
         self.color = self.colors[self.shape]
-        self.current_shape = self.shapes[self.shape]  # Initialize current shape
-        print(f"Tetromino created with shape: {self.shape} and color: {self.color}")
+        self.rotation = rotation  # Index into ROTATIONS[self.shape]
+        if tracer.enabled:
+            tracer.instant('tetromino.create', 'piece', {'shape': self.shape})
+
+    @property
+    def current_shape(self):
+        """Shape matrix of the current rotation, as a list of lists."""
+        return [list(row) for row in ROTATIONS[self.shape][self.rotation].matrix]
+
+    @current_shape.setter
+    def current_shape(self, matrix):
+        self.rotation = self.rotation_index(matrix)
+
+    def rotation_index(self, matrix):
+        """Return the rotation index of this shape whose matrix equals `matrix`."""
+        matrix = tuple(tuple(row) for row in matrix)
+        for index, state in enumerate(ROTATIONS[self.shape]):
+            if state.matrix == matrix:
+                return index
+        raise ValueError(f"{matrix} is not a rotation of shape {self.shape}")
+
+    def copy(self):
+        """Return an independent tetromino with the same shape and rotation."""
+        clone = Tetromino.__new__(Tetromino)
+        clone.shape = self.shape
+        clone.color = self.color
+        clone.rotation = self.rotation
+        return clone
+
+    def get_rotation_state(self):
+        """Return the precomputed RotationState of the current rotation."""
+        return ROTATIONS[self.shape][self.rotation]
+
+    def get_cells(self):
+        """Return the (dy, dx) offsets of the blocks in the current rotation."""
+        return ROTATIONS[self.shape][self.rotation].cells
 
     def random_shape(self):
-        shape = random.choice(list(self.shapes.keys()))
-        print(f"Random shape selected: {shape}")
-        return shape
+        return random.choice(SHAPE_NAMES)  # Unseeded; PieceQueue deals reproducible sequences
 
     def get_shape(self):
         return self.current_shape  # Return the current shape matrix
@@ -45,38 +103,42 @@ class Tetromino:
         return self.color
 
     def rotate(self, grid_state, position):
-        print(f"Rotating Tetromino: current shape type before rotation: {self.shape}")
-
-        rotated_shape = [list(row) for row in zip(*self.current_shape[::-1])]
-        print(f"Tetromino rotated to shape: {rotated_shape}")
-
-        original_shape = self.current_shape  # Store the original shape matrix
+        rotation = (self.rotation + 1) % 4  # Next precomputed rotation, no matrix is rebuilt
 
         # Check for valid rotation
-        if self.is_valid_rotation(rotated_shape, grid_state, position):
-            print(f"Rotation valid for shape: {self.shape}, updating shape.")
-            self.current_shape = rotated_shape  # Update current shape
-            print(f"Tetromino rotated successfully to shape: {self.current_shape}")
+        if self.cells_fit(ROTATIONS[self.shape][rotation].cells, grid_state, position):
+            self.rotation = rotation
+            if tracer.enabled:
+                tracer.instant('tetromino.rotate', 'piece', {'shape': self.shape, 'rotation': rotation})
             return True  # Indicate successful rotation
         else:
-            print("Rotation invalid, reverting to original shape.")
-            self.current_shape = original_shape  # Restore original shape matrix
-            print(f"Tetromino remained as shape: {self.current_shape}")
+            if tracer.enabled:
+                tracer.instant('tetromino.rotate_blocked', 'piece', {'shape': self.shape, 'rotation': self.rotation})
             return False  # Indicate failed rotation
 
     def is_valid_rotation(self, rotated_shape, grid_state, position):
         # Check for collisions with the grid boundaries and other tetrominoes
-        for y, row in enumerate(rotated_shape):
-            for x, block in enumerate(row):
-                if block:  # If the block is part of the tetromino
-                    new_x = position[1] + x
-                    new_y = position[0] + y
-                    # Check if the position is out of bounds
-                    if new_x < 0 or new_x >= len(grid_state[0]) or new_y < 0 or new_y >= len(grid_state):
-                        print("Collision with grid boundary detected.")
-                        return False
-                    # Check for collisions with other tetrominoes
-                    if new_y >= 0 and grid_state[new_y][new_x] != 0:  # Assuming grid_state is a 2D list
-                        print("Collision with another tetromino detected.")
-                        return False
+        return self.cells_fit(matrix_cells(rotated_shape), grid_state, position)
+
+    @staticmethod
+    def cells_fit(cells, grid_state, position):
+        """Check that block offsets placed at `position` are inside the grid and free."""
+        height = len(grid_state)
+        width = len(grid_state[0])
+        for y, x in cells:
+            new_x = position[1] + x
+            new_y = position[0] + y
+            # Check if the position is out of bounds
+            if new_x < 0 or new_x >= width or new_y < 0 or new_y >= height:
+                return False  # Collision with grid boundary
+            # Check for collisions with other tetrominoes
+            if grid_state[new_y][new_x] != 0:  # Assuming grid_state is a 2D list
+                return False  # Collision with another tetromino
         return True
+
+
+# Shape names in a fixed order (for indexing and random draws)
+SHAPE_NAMES = tuple(Tetromino.shapes)
+
+# All four rotations of every shape, computed once at import
+ROTATIONS = {name: build_rotations(matrix) for name, matrix in Tetromino.shapes.items()}
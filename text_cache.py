@@ -0,0 +1,57 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font size, text, color).
+
+    Fonts are created once per size. hits and misses count lookups since the
+    last end_frame() call; last_frame_hits/last_frame_misses keep the
+    counts of the previous frame and total_hits/total_misses the lifetime.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.last_frame_hits = 0
+        self.last_frame_misses = 0
+        self.total_hits = 0
+        self.total_misses = 0
+
+    def font(self, size):
+        """Return the default font at `size`, creating it on first use."""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, size, color):
+        """Return an antialiased surface for `text`, rendering it only on a cache miss."""
+        key = (size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # Evict the least recently used text
+        return surface
+
+    def end_frame(self):
+        """Close the current frame's counters and return its (hits, misses)."""
+        self.last_frame_hits, self.last_frame_misses = self.hits, self.misses
+        self.total_hits += self.hits
+        self.total_misses += self.misses
+        self.hits = self.misses = 0
+        return self.last_frame_hits, self.last_frame_misses
+
+    def clear(self):
+        """Drop every cached surface and font."""
+        self.surfaces.clear()
+        self.fonts.clear()
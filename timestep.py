@@ -0,0 +1,40 @@
+import time
+
+LOGIC_HZ = 60  # Game logic ticks per second; every drop interval is a whole number of ticks
+NS_PER_SECOND = 1_000_000_000
+
+
+class FixedTimestep:
+    """Accumulator that turns elapsed wall-clock time into whole fixed-size logic ticks.
+
+    Time is read as integer nanoseconds from a high-resolution clock and
+    accumulated exactly (in units of ns * rate, so 1/rate needs no
+    rounding). The number of ticks produced depends only on the total
+    elapsed time, never on how it was split into frames, so gravity stays
+    deterministic when frames are dropped or late.
+    """
+
+    def __init__(self, rate=LOGIC_HZ, clock=time.perf_counter_ns):
+        self.rate = rate
+        self.clock = clock
+        self.ticks = 0  # Ticks produced since the last reset
+        self.reset()
+
+    def reset(self):
+        """Start counting from now, discarding any partial tick (e.g. after a pause)."""
+        self.last_time = self.clock()
+        self.accumulator = 0
+        self.ticks = 0
+
+    def advance(self):
+        """Return the number of whole ticks elapsed since the previous call."""
+        now = self.clock()
+        self.accumulator += (now - self.last_time) * self.rate
+        self.last_time = now
+        ticks, self.accumulator = divmod(self.accumulator, NS_PER_SECOND)
+        self.ticks += ticks
+        return ticks
+
+    def ns_until_tick(self, ticks=1):
+        """Nanoseconds from the last advance() until `ticks` more ticks will have elapsed."""
+        return -(-(ticks * NS_PER_SECOND - self.accumulator) // self.rate)  # Rounded up
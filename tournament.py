@@ -0,0 +1,197 @@
+"""Run large batches of seeded headless games across all cores and summarize them.
+
+Each game is independent: a bot game is an AutoPlayer playing a
+TetrisEngine dealt from its own seed (seed, seed + 1, ...), a replay game
+re-executes one recorded game through ReplayRunner without rendering.
+Games are spread over a ProcessPoolExecutor with executor.map and a
+chunksize, so each task carries a batch of games and the IPC cost is paid
+once per batch. Results come back in game order, so the per-game results
+and the summary are identical for any number of workers; only the timings
+differ.
+
+The summary (mean, stdev, min, median, max of score, lines, pieces per
+game and pieces/sec) is printed and written with every game's result to
+--output. --scaling runs the same batch with 1, 2, 4, ... workers up to
+--workers and reports the speedup of each, checking that every run
+produced the same results.
+
+Usage: python tournament.py [--games N] [--seed S] [--max-pieces P] [--no-lookahead] [--backend B] [--pieces POLICY]
+           [--replays FILE [FILE ...]] [--workers W] [--chunksize C] [--output FILE] [--scaling]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Replay games build a TetrisGame; workers never open a window or an audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Not once per worker
+
+from autoplayer import AutoPlayer
+from engine import TetrisEngine
+from grid import GRID_BACKENDS
+from pieces import PIECE_POLICIES
+
+DEFAULT_OUTPUT = 'tournament_results.json'
+DEFAULT_MAX_PIECES = 1000  # A good bot rarely tops out, so every bot game is capped
+TASKS_PER_WORKER = 4  # Default chunking: few enough tasks to amortize IPC, enough to balance uneven games
+SUMMARY_FIELDS = ('score', 'lines', 'pieces', 'pieces_per_sec')
+
+
+def quiet_worker():
+    """Pool initializer: games log asset loads and game overs at INFO, thousands of times."""
+    logging.disable(logging.INFO)
+
+
+def play_bot_game(seed, width=10, height=20, policy='bag', backend='list', lookahead=True, max_pieces=DEFAULT_MAX_PIECES):
+    """Let an AutoPlayer play one game dealt from `seed`; returns its result."""
+    engine = TetrisEngine(width, height, backend=backend, seed=seed, policy=policy)
+    start = time.perf_counter()
+    AutoPlayer(lookahead=lookahead).play_game(engine, max_pieces)
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'lines': engine.lines_cleared,
+        'pieces': engine.pieces_placed,
+        'topped_out': engine.game_over,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def play_replay_game(record):
+    """Replay one recorded game headless, without rendering; returns its result."""
+    from replay import ReplayRunner  # Pulls in TetrisGame, which bot-only workers never need
+    with contextlib.redirect_stdout(io.StringIO()):  # TetrisGame logs with print
+        runner = ReplayRunner(record, render=False)
+        result = runner.run()
+    engine = runner.game.engine
+    return {
+        'seed': record['seed'],
+        'score': result['score'],
+        'lines': engine.lines_cleared,
+        'pieces': engine.pieces_placed,
+        'ticks': result['ticks'],
+        'matches': result['matches'],
+        'seconds': result['seconds'],
+    }
+
+
+def run_games(play, jobs, workers=None, chunksize=None):
+    """Play every job on a pool of `workers` processes; returns (results in job order, wall seconds)."""
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, -(-len(jobs) // (workers * TASKS_PER_WORKER)))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=quiet_worker) as executor:
+        results = list(executor.map(play, jobs, chunksize=chunksize))
+    for result in results:
+        result['pieces_per_sec'] = result['pieces'] / result['seconds'] if result['seconds'] else 0.0
+    return results, time.perf_counter() - start
+
+
+def summarize(results, fields=SUMMARY_FIELDS):
+    """Return {field: {mean, stdev, min, median, max}} over the game results."""
+    summary = {}
+    for field in fields:
+        values = [result[field] for result in results]
+        summary[field] = {
+            'mean': statistics.fmean(values),
+            'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+            'min': min(values),
+            'median': statistics.median(values),
+            'max': max(values),
+        }
+    return summary
+
+
+def outcomes(results):
+    """The results without their timings: equal for any number of workers."""
+    return [{key: value for key, value in result.items() if key not in ('seconds', 'pieces_per_sec')} for result in results]
+
+
+def scaling_workers(workers):
+    """Worker counts of a scaling run: 1, 2, 4, ... and finally `workers`."""
+    counts = []
+    count = 1
+    while count < workers:
+        counts.append(count)
+        count *= 2
+    return counts + [workers]
+
+
+def load_jobs(args):
+    """Return (play function, jobs) for the games selected on the command line."""
+    if args.replays:
+        from replay import load_replay
+        return play_replay_game, [record for path in args.replays for record in load_replay(path)]
+    play = partial(play_bot_game, width=args.width, height=args.height, policy=args.pieces, backend=args.backend,
+                   lookahead=not args.no_lookahead, max_pieces=args.max_pieces)
+    return play, list(range(args.seed, args.seed + args.games))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000, help='bot games to play')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first bot game; game i uses seed + i')
+    parser.add_argument('--max-pieces', type=int, default=DEFAULT_MAX_PIECES, help='stop a bot game after this many pieces')
+    parser.add_argument('--no-lookahead', action='store_true', help='the bot ignores the preview piece')
+    parser.add_argument('--width', type=int, default=10)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--backend', choices=sorted(GRID_BACKENDS), default='list')
+    parser.add_argument('--pieces', choices=sorted(PIECE_POLICIES), default='bag', help='piece sequence policy of bot games')
+    parser.add_argument('--replays', nargs='+', metavar='FILE', help='replay the games of these files instead of playing the bot')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, help=f'games per task (default: about {TASKS_PER_WORKER} tasks per worker)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='results file (JSON)')
+    parser.add_argument('--scaling', action='store_true', help='also run with 1, 2, 4, ... workers and report the speedup')
+    args = parser.parse_args(argv)
+
+    play, jobs = load_jobs(args)
+    runs = {}
+    for workers in (scaling_workers(args.workers) if args.scaling else [args.workers]):
+        results, wall = run_games(play, jobs, workers, args.chunksize)
+        runs[workers] = (results, wall)
+        print(f"{workers:3d} worker(s): {len(results)} games in {wall:.2f}s, "
+              f"{sum(result['pieces'] for result in results) / wall:.0f} pieces/sec")
+
+    results, wall = runs[args.workers]
+    if args.scaling:
+        if args.workers > (os.cpu_count() or 1):
+            print(f"  Only {os.cpu_count()} core(s): the speedup stops growing past that many workers")
+        baseline = runs[1][1]
+        for workers, (other, seconds) in runs.items():
+            print(f"  {workers:3d} worker(s): speedup {baseline / seconds:5.2f}x, efficiency {baseline / seconds / workers:.0%}")
+        if any(outcomes(other) != outcomes(results) for other, _ in runs.values()):
+            print("Results differ between worker counts")
+            return 1
+
+    summary = summarize(results)
+    for field, stats in summary.items():
+        print(f"  {field:15s} mean {stats['mean']:10.1f}  stdev {stats['stdev']:9.1f}  min {stats['min']:9.1f}  "
+              f"median {stats['median']:9.1f}  max {stats['max']:9.1f}")
+    if args.replays:
+        mismatches = sum(not result['matches'] for result in results)
+        print(f"  {len(results) - mismatches} of {len(results)} replays reproduced their recorded outcome")
+    with open(args.output, 'w') as file:
+        json.dump({
+            'games': len(results),
+            'workers': args.workers,
+            'seconds': wall,
+            'summary': summary,
+            'scaling': {workers: seconds for workers, (_, seconds) in runs.items()},
+            'results': results,
+        }, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+DEFAULT_CAPACITY = 65536  # Events kept in the ring buffer; older events are overwritten
+TRACE_ENV = 'TETRIS_TRACE'  # Set to a file path to trace a run and dump it there
+DEFAULT_TRACE_PATH = 'tetris_trace.json'
+
+
+class Tracer:
+    """Fixed-size in-memory ring buffer of timeline events.
+
+    Call sites guard every event with `if tracer.enabled:` so a disabled
+    tracer costs one attribute check: no arguments are built and nothing
+    is formatted. Events are stored as raw tuples and only turned into
+    Chrome trace-event JSON (chrome://tracing, Perfetto) by dump().
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.enabled = False
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self.next = 0  # Slot the next event is written to
+        self.total = 0  # Events recorded since the last clear, including overwritten ones
+        self.path = DEFAULT_TRACE_PATH  # Where on-demand dumps go
+
+    def enable(self, capacity=None):
+        if capacity is not None and capacity != self.capacity:
+            self.capacity = capacity
+            self.buffer = [None] * capacity
+            self.next = self.total = 0
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.buffer = [None] * self.capacity
+        self.next = self.total = 0
+
+    @staticmethod
+    def now():
+        """Timestamp in nanoseconds for complete()."""
+        return time.perf_counter_ns()
+
+    def _record(self, event):
+        self.buffer[self.next] = event
+        self.next = (self.next + 1) % self.capacity
+        self.total += 1
+
+    def instant(self, name, cat='game', args=None):
+        """Record a point-in-time event (a lock, a clear, a spawn...)."""
+        self._record(('i', name, cat, time.perf_counter_ns(), 0, args, threading.get_ident()))
+
+    def complete(self, name, start, cat='frame', args=None):
+        """Record a span that began at `start` (from now()) and ends now; returns the end time."""
+        end = time.perf_counter_ns()
+        self._record(('X', name, cat, start, end - start, args, threading.get_ident()))
+        return end
+
+    def events(self):
+        """Buffered events, oldest first."""
+        if self.total < self.capacity:
+            return self.buffer[:self.next]
+        return self.buffer[self.next:] + self.buffer[:self.next]
+
+    def chrome_events(self):
+        """Buffered events as Chrome trace-event dicts (timestamps in microseconds)."""
+        pid = os.getpid()
+        trace_events = []
+        for phase, name, cat, start, duration, args, tid in self.events():
+            event = {'name': name, 'cat': cat, 'ph': phase, 'ts': start / 1000, 'pid': pid, 'tid': tid}
+            if phase == 'X':
+                event['dur'] = duration / 1000
+            else:
+                event['s'] = 't'  # Instant events are scoped to their thread
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return trace_events
+
+    def dump(self, path=None):
+        """Write the buffer to `path` as Chrome trace JSON; returns the number of events written."""
+        path = path or self.path
+        trace_events = self.chrome_events()
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+        logging.info("Wrote %d trace events to %s", len(trace_events), path)
+        return len(trace_events)
+
+    def install_crash_dump(self, path):
+        """Dump the buffer to `path` when an uncaught exception ends the program."""
+        previous_hook = sys.excepthook
+
+        def hook(exc_type, exc_value, exc_traceback):
+            try:
+                self.instant('crash', 'error', {'exception': repr(exc_value)})
+                self.dump(path)
+            finally:
+                previous_hook(exc_type, exc_value, exc_traceback)
+
+        sys.excepthook = hook
+
+
+def enable_from_environment():
+    """Enable tracing when TETRIS_TRACE names a file: dump there on exit or crash. Returns the path or None."""
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+    tracer.path = path
+    tracer.enable()
+    tracer.install_crash_dump(path)
+    atexit.register(lambda: tracer.enabled and tracer.dump(path))
+    return path
+
+
+# Process-wide tracer shared by the engine, the pieces and the game loop
+tracer = Tracer()